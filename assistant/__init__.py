@@ -0,0 +1 @@
+# AI асистент TravelAI: бекенди моделі, стрімінг та допоміжні сервіси
@@ -0,0 +1,232 @@
+"""Кеш відповідей AI асистента за нормалізованим текстом запиту
+
+"Що подивитись у Львові за 2 дні?" та "що подивитись у Lvovi за 2 дні"
+зводяться до одного ключа: регістр, пунктуація, пробіли та варіанти
+транслітерації кирилиці не впливають на результат. Діакритика
+відкидається ("Gdańsk" = "Gdansk"), а слова інших писемностей (китайська,
+грецька тощо) лишаються як є, тож "東京" і "北京" мають різні ключі. Якщо
+після нормалізації від запиту нічого або майже нічого не лишилося
+(емодзі, символи), його не кешуємо: різні запити дали б один ключ.
+"""
+import hashlib
+import re
+import time
+import unicodedata
+
+from assistant.storage import SQLiteStore
+
+# Змінюйте, якщо змінився формат нормалізації — старі ключі стануть недійсними
+NORMALIZATION_VERSION = 3
+
+# Частка значущих символів, що має пережити нормалізацію, інакше запит не кешується
+MIN_KEPT_SHARE = 0.5
+
+CYRILLIC_TO_LATIN = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'h', 'ґ': 'g', 'д': 'd', 'е': 'e', 'є': 'ie',
+    'ж': 'zh', 'з': 'z', 'и': 'y', 'і': 'i', 'ї': 'i', 'й': 'i', 'к': 'k', 'л': 'l',
+    'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
+    'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'shch', 'ь': '', 'ю': 'iu',
+    'я': 'ia', 'ы': 'y', 'э': 'e', 'ъ': '', 'ё': 'io',
+}
+
+# Літери з рискою, які NFKD не розкладає на основу та діакритику
+STROKE_LETTERS = {'ł': 'l', 'đ': 'd', 'ø': 'o', 'ħ': 'h', 'ŧ': 't'}
+
+# Усталені альтернативні назви міст
+PLACE_ALIASES = {
+    'kiev': 'kyiv', 'lvov': 'lviv', 'lwow': 'lviv', 'lemberg': 'lviv', 'odessa': 'odesa',
+    'kharkov': 'kharkiv', 'nikolaev': 'mykolaiv', 'zaporozhye': 'zaporizhzhia',
+    'krakow': 'krakiv', 'cracow': 'krakiv', 'warsaw': 'varshava', 'prague': 'praha',
+}
+
+# Варіанти транслітерації, що зводяться до одного написання (порядок важливий).
+# Застосовуються лише для впізнавання назв міст, а не до кожного слова:
+# інакше "ski" і "sky" чи "22" і "2" дали б один ключ
+TRANSLIT_FOLDS = (
+    ('shch', 'sh'), ('zh', 'z'), ('kh', 'h'), ('ts', 'c'), ('ch', 'c'),
+    ('yi', 'i'), ('ye', 'e'), ('ie', 'e'), ('yu', 'u'), ('iu', 'u'), ('ya', 'a'), ('ia', 'a'),
+    ('g', 'h'), ('y', 'i'), ('j', 'i'), ('w', 'v'),
+)
+
+# Запити, що можуть містити особисті дані, не кешуємо
+PERSONAL_PATTERNS = (
+    r'[\w.+-]+@[\w-]+\.[\w.]+',  # email
+    r'\+?\d[\d\s()-]{8,}\d',  # номер телефону
+    r'\b(?:мо[яюєї]|мій|моїх|наш[аіу]?|my|our)\b',  # "моя поїздка", "my trip"
+)
+
+
+def transliterate_cyrillic(text):
+    return ''.join(CYRILLIC_TO_LATIN.get(char, char) for char in text)
+
+
+def translit_skeleton(token):
+    """Написання без варіантів транслітерації та подвоєнь: Zaporizhzhia = Zaporizhia"""
+    for variant, canonical in TRANSLIT_FOLDS:
+        token = token.replace(variant, canonical)
+    return re.sub(r'(.)\1+', r'\1', token)
+
+
+# Скелет відомого написання міста -> канонічна назва
+PLACE_SPELLINGS = {
+    translit_skeleton(name): canonical
+    for alias, canonical in PLACE_ALIASES.items()
+    for name in (alias, canonical)
+}
+
+
+def fold_token(token):
+    """Відомі назви міст — до канонічного написання; інші слова й числа без змін"""
+    if token in PLACE_ALIASES:
+        return PLACE_ALIASES[token]
+    if token.isdigit():
+        return token
+    return PLACE_SPELLINGS.get(translit_skeleton(token), token)
+
+
+def strip_diacritics(text):
+    text = ''.join(STROKE_LETTERS.get(char, char) for char in text)
+    return ''.join(char for char in unicodedata.normalize('NFKD', text) if unicodedata.category(char) != 'Mn')
+
+
+def normalize_prompt(text):
+    """Канонічна форма запиту для ключа кешу; '' — запит не можна звести до ключа"""
+    text = unicodedata.normalize('NFKC', text or '').casefold()
+    text = re.sub(r"['’ʼ`]", '', text)
+    text = strip_diacritics(transliterate_cyrillic(text))
+
+    tokens = re.findall(r'[^\W_]+', text)
+    # Значущі символи — літери, цифри та символи (емодзі); пунктуація і пробіли не рахуються
+    significant = sum(1 for char in text if unicodedata.category(char)[0] in 'LNS')
+    if not tokens or sum(map(len, tokens)) < significant * MIN_KEPT_SHARE:
+        return ''
+
+    # Транслітераційні варіанти зводимо лише в латинських словах
+    return ' '.join(fold_token(token) if token.isascii() else token for token in tokens)
+
+
+class CachePolicy:
+    """Визначає, які запити можна віддавати з кешу"""
+
+    def __init__(self, enabled=True, max_prompt_chars=500, deny_patterns=()):
+        self.enabled = enabled
+        self.max_prompt_chars = max_prompt_chars
+        self._deny = [re.compile(pattern, re.IGNORECASE)
+                      for pattern in (*PERSONAL_PATTERNS, *deny_patterns)]
+
+    def is_cacheable(self, message, personal_context=False):
+        """personal_context — до запиту додано дані поїздки чи історію розмови"""
+        if not self.enabled or personal_context or not message:
+            return False
+
+        if len(message) > self.max_prompt_chars:
+            return False
+
+        if not normalize_prompt(message):
+            return False
+
+        return not any(pattern.search(message) for pattern in self._deny)
+
+
+class ResponseCache(SQLiteStore):
+    """Спільний для воркерів кеш відповідей з TTL та LRU-витісненням"""
+
+    schema = """
+    CREATE TABLE IF NOT EXISTS ai_response_cache (
+        key TEXT PRIMARY KEY,
+        prompt TEXT NOT NULL,
+        reply TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        last_access REAL NOT NULL,
+        hits INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS ix_ai_response_cache_last_access ON ai_response_cache (last_access);
+    CREATE TABLE IF NOT EXISTS ai_cache_stats (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL DEFAULT 0
+    );
+    """
+
+    def __init__(self, path, ttl=24 * 3600, max_entries=5000, namespace=''):
+        super().__init__(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Відповіді різних моделей / системних інструкцій не змішуються
+        self.namespace = namespace
+
+    def make_key(self, prompt):
+        """None — запит не зводиться до ключа (див. normalize_prompt)"""
+        normalized = normalize_prompt(prompt)
+        if not normalized:
+            return None
+        raw = f"{NORMALIZATION_VERSION}|{self.namespace}|{normalized}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, prompt):
+        """Повертає збережену відповідь або None"""
+        key = self.make_key(prompt)
+        if key is None:
+            return None
+        now = time.time()
+
+        with self.transaction() as conn:
+            row = conn.execute('SELECT reply, created_at FROM ai_response_cache WHERE key = ?',
+                               (key,)).fetchone()
+
+            if row is None or row[1] < now - self.ttl:
+                if row is not None:
+                    conn.execute('DELETE FROM ai_response_cache WHERE key = ?', (key,))
+                self._incr(conn, 'misses')
+                return None
+
+            conn.execute('UPDATE ai_response_cache SET last_access = ?, hits = hits + 1 WHERE key = ?',
+                         (now, key))
+            self._incr(conn, 'hits')
+            return row[0]
+
+    def set(self, prompt, reply):
+        key = self.make_key(prompt)
+        if not reply or key is None:
+            return
+
+        now = time.time()
+
+        with self.transaction() as conn:
+            conn.execute('INSERT OR REPLACE INTO ai_response_cache '
+                         '(key, prompt, reply, created_at, last_access, hits) VALUES (?, ?, ?, ?, ?, 0)',
+                         (key, prompt, reply, now, now))
+
+            # Спочатку прибираємо прострочені, далі — найдавніше використані
+            conn.execute('DELETE FROM ai_response_cache WHERE created_at < ?', (now - self.ttl,))
+            overflow = conn.execute('SELECT COUNT(*) FROM ai_response_cache').fetchone()[0] - self.max_entries
+            if overflow > 0:
+                conn.execute('DELETE FROM ai_response_cache WHERE key IN ('
+                             'SELECT key FROM ai_response_cache ORDER BY last_access LIMIT ?)', (overflow,))
+                self._incr(conn, 'evictions', overflow)
+
+    def record_bypass(self):
+        """Запит не підлягав кешуванню (політика)"""
+        with self.transaction() as conn:
+            self._incr(conn, 'bypass')
+
+    def stats(self):
+        conn = self.connection()
+        stats = dict(conn.execute('SELECT key, value FROM ai_cache_stats').fetchall())
+        entries = conn.execute('SELECT COUNT(*) FROM ai_response_cache').fetchone()[0]
+
+        hits = stats.get('hits', 0)
+        lookups = hits + stats.get('misses', 0)
+        return {
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl,
+            'hits': hits,
+            'misses': stats.get('misses', 0),
+            'bypass': stats.get('bypass', 0),
+            'evictions': stats.get('evictions', 0),
+            'hit_ratio': round(hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def _incr(self, conn, key, amount=1):
+        conn.execute('INSERT INTO ai_cache_stats (key, value) VALUES (?, ?) '
+                     'ON CONFLICT(key) DO UPDATE SET value = value + excluded.value', (key, amount))
@@ -0,0 +1,163 @@
+"""Стислий опис поїздки для AI асистента в межах бюджету токенів
+
+Розділи додаються за пріоритетом (основна інформація → бюджет → маршрут →
+житло → транспорт → активності по днях). Якщо бюджет вичерпано, нижчі
+розділи обрізаються рядок за рядком з позначкою, скільки пропущено.
+"""
+import math
+import threading
+from collections import OrderedDict
+
+# Груба оцінка для Gemini: ~3 символи кирилиці на токен
+CHARS_PER_TOKEN = 3
+
+DEFAULT_TOKEN_BUDGET = 800
+
+
+def estimate_tokens(text):
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _day(value):
+    return value.strftime('%d.%m') if value else '—'
+
+
+def _money(amount, currency):
+    return f"{amount:.0f} {currency}"
+
+
+def trip_sections(trip):
+    """Розділи контексту у порядку пріоритету: список (назва, [рядки])"""
+    start = trip.start_date.date() if hasattr(trip.start_date, 'date') else trip.start_date
+    end = trip.end_date.date() if hasattr(trip.end_date, 'date') else trip.end_date
+    currency = trip.currency or 'UAH'
+
+    sections = [('Поїздка', [
+        f"{trip.title} — {trip.destination}",
+        f"Дати: {start.strftime('%d.%m.%Y')} – {end.strftime('%d.%m.%Y')} ({(end - start).days + 1} дн.)",
+    ])]
+
+    activities = sorted(trip.activities, key=lambda a: (a.date, a.time or ''))
+    accommodations = sorted(trip.accommodations, key=lambda a: a.check_in)
+    transports = sorted(trip.transports, key=lambda t: t.departure_date)
+
+    activities_cost = sum(a.cost or 0 for a in activities)
+    accommodation_cost = sum(a.total_price or 0 for a in accommodations)
+    transport_cost = sum(t.cost or 0 for t in transports)
+    spent = activities_cost + accommodation_cost + transport_cost
+
+    sections.append(('Бюджет', [
+        f"{_money(trip.budget or 0, currency)}, витрачено {_money(spent, currency)} "
+        f"(активності {activities_cost:.0f}, житло {accommodation_cost:.0f}, транспорт {transport_cost:.0f}), "
+        f"залишок {_money((trip.budget or 0) - spent, currency)}"
+    ]))
+
+    destinations = sorted(trip.destinations, key=lambda d: d.order or 0)
+    if destinations:
+        sections.append(('Маршрут', [
+            ' → '.join(f"{d.city} ({d.country}, {_day(d.arrival_date)}–{_day(d.departure_date)})"
+                       for d in destinations)
+        ]))
+
+    if accommodations:
+        sections.append(('Житло', [
+            f"- {a.name}{', ' + a.address if a.address else ''}: "
+            f"{_day(a.check_in)}–{_day(a.check_out)}, {a.booking_status or 'pending'}"
+            for a in accommodations
+        ]))
+
+    if transports:
+        sections.append(('Транспорт', [
+            f"- {t.type}: {t.from_location} → {t.to_location}, "
+            f"{t.departure_date.strftime('%d.%m %H:%M')}{', ' + t.carrier if t.carrier else ''}"
+            for t in transports
+        ]))
+
+    if activities:
+        by_day = OrderedDict()
+        for activity in activities:
+            activity_date = activity.date.date() if hasattr(activity.date, 'date') else activity.date
+            by_day.setdefault(activity_date, []).append(activity)
+
+        lines = []
+        for day_date, day_activities in by_day.items():
+            items = '; '.join(
+                f"{a.time + ' ' if a.time else ''}{a.title}"
+                f"{' @ ' + a.location if a.location else ''}"
+                f"{' ✓' if a.completed else ''}"
+                for a in day_activities
+            )
+            lines.append(f"День {(day_date - start).days + 1} ({_day(day_date)}): {items}")
+        sections.append(('Активності', lines))
+
+    return sections
+
+
+def render_context(sections, token_budget=DEFAULT_TOKEN_BUDGET):
+    """Збирає текст контексту, не перевищуючи token_budget"""
+    remaining = token_budget
+    rendered = []
+
+    for title, lines in sections:
+        header = f"{title}:"
+        cost = estimate_tokens(header) + 1
+        if cost > remaining:
+            break
+
+        kept = []
+        for line in lines:
+            line_cost = estimate_tokens(line) + 1
+            if cost + line_cost > remaining:
+                break
+            kept.append(line)
+            cost += line_cost
+
+        if not kept:
+            continue
+
+        skipped = len(lines) - len(kept)
+        if skipped:
+            marker = f"… ще {skipped}"
+            marker_cost = estimate_tokens(marker) + 1
+            if cost + marker_cost <= remaining:
+                kept.append(marker)
+                cost += marker_cost
+
+        rendered.append((title, kept))
+        remaining -= cost
+
+    return '\n'.join(f"{title}:\n" + '\n'.join(lines) for title, lines in rendered)
+
+
+class TripContextBuilder:
+    """Мемоізує контекст за (id поїздки, версія поїздки, бюджет токенів)
+
+    Версія поїздки змінюється при будь-якій зміні поїздки або її дочірніх
+    записів, тому кеш не потребує явної інвалідації.
+    """
+
+    def __init__(self, token_budget=DEFAULT_TOKEN_BUDGET, maxsize=256):
+        self.token_budget = token_budget
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def build(self, trip, token_budget=None):
+        budget = token_budget or self.token_budget
+        key = (trip.id, trip.version, budget)
+
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        # Дочірні записи завантажуються лише при промаху кешу
+        context = render_context(trip_sections(trip), budget)
+
+        with self._lock:
+            self._cache[key] = context
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+        return context
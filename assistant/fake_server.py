@@ -0,0 +1,138 @@
+"""Локальний фейковий LLM сервер для офлайн-тестування AI асистента
+
+Імітує затримку до першого токена та між токенами, тож стрімінг можна
+перевірити без доступу до Gemini:
+
+    python -m assistant.fake_server --port 8765 --first-token-delay 0.5 --token-delay 0.05
+    AI_BACKEND=fake FAKE_LLM_URL=http://127.0.0.1:8765 python app.py
+"""
+import argparse
+import json
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def last_user_text(contents):
+    """Дістає текст останньої репліки користувача з contents"""
+    if isinstance(contents, str):
+        return contents
+
+    for turn in reversed(contents or []):
+        if isinstance(turn, dict) and turn.get('role', 'user') == 'user':
+            return ' '.join(str(part) for part in turn.get('parts', []))
+
+    return ''
+
+
+def fake_reply(contents):
+    """Детермінована markdown-відповідь у стилі TravelAI"""
+    question = last_user_text(contents).strip() or 'подорож'
+
+    return (
+        "**TravelAI (тестовий режим)**\n\n"
+        f"Ви запитали: *{question}*\n\n"
+        "- **Ранок:** прогулянка історичним центром\n"
+        "- **День:** місцевий музей та обід у кав'ярні\n"
+        "- **Вечір:** оглядовий майданчик на заході сонця\n\n"
+        "💡 Фішка: найкраща кава — у маленькому дворику за ратушею."
+    )
+
+
+def fake_plan(contents):
+    """JSON-план для днів, указаних у запиті ("Дні плану: 1-4")"""
+    match = re.search(r'Дні плану: (\d+)-(\d+)', last_user_text(contents))
+    first_day, last_day = (int(match.group(1)), int(match.group(2))) if match else (1, 1)
+
+    days = []
+    for day in range(first_day, last_day + 1):
+        days.append({'day': day, 'activities': [
+            {'title': f"Сніданок у кав'ярні (день {day})", 'time': '09:00',
+             'location': 'Старе місто', 'category': 'food', 'cost': 250, 'description': ''},
+            {'title': f"Пішохідна екскурсія (день {day})", 'time': '11:00',
+             'location': 'Центральна площа', 'category': 'activity', 'cost': 0,
+             'description': 'Історичний центр з гідом'},
+            {'title': f"Музей (день {day})", 'time': '15:30',
+             'location': 'Національний музей', 'category': 'activity', 'cost': 300, 'description': ''},
+        ]})
+
+    return json.dumps({'days': days}, ensure_ascii=False)
+
+
+def split_tokens(text):
+    """Розбиває текст на 'токени' — слова разом із пробілами після них"""
+    return re.findall(r'\S+\s*|\s+', text)
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    first_token_delay = 0.3
+    token_delay = 0.03
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/generate':
+            self.send_error(404)
+            return
+
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        if payload.get('schema'):
+            reply = fake_plan(payload.get('contents'))
+        else:
+            reply = fake_reply(payload.get('contents'))
+
+        time.sleep(self.first_token_delay)
+
+        if not payload.get('stream'):
+            body = json.dumps({'text': reply}, ensure_ascii=False).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+
+        for index, token in enumerate(split_tokens(reply)):
+            if index:
+                time.sleep(self.token_delay)
+            data = token.encode('utf-8')
+            self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b"\r\n")
+            self.wfile.flush()
+
+        self.wfile.write(b"0\r\n\r\n")
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Фейковий LLM сервер для TravelAI')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--first-token-delay', type=float, default=0.3)
+    parser.add_argument('--token-delay', type=float, default=0.03)
+    args = parser.parse_args()
+
+    FakeLLMHandler.first_token_delay = args.first_token_delay
+    FakeLLMHandler.token_delay = args.token_delay
+
+    server = ThreadingHTTPServer((args.host, args.port), FakeLLMHandler)
+    print(f"Фейковий LLM сервер: http://{args.host}:{args.port}/generate")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
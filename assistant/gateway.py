@@ -0,0 +1,242 @@
+"""Шлюз до моделі: глобальний ліміт одночасних викликів, обмежена черга
+очікування та token bucket на кожного користувача
+
+Стан зберігається у спільному SQLite, тому обмеження діють на всі воркери
+gunicorn разом, а не на кожен окремо.
+"""
+import math
+import os
+import time
+
+from assistant.storage import SQLiteStore
+
+# Межі гістограми часу очікування в черзі (мс)
+WAIT_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ai_inflight (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pid INTEGER NOT NULL,
+    user_id INTEGER,
+    acquired_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ai_waiting (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pid INTEGER NOT NULL,
+    since REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ai_rate_bucket (
+    user_id INTEGER PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ai_gateway_stats (
+    key TEXT PRIMARY KEY,
+    value REAL NOT NULL DEFAULT 0
+);
+"""
+
+
+class GatewayRejected(Exception):
+    """Запит відхилено (ліміт користувача або переповнена черга)"""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class Lease:
+    """Зайнятий слот моделі; звільняється через release() або with-блок"""
+
+    def __init__(self, gateway, lease_id, waited_ms):
+        self.gateway = gateway
+        self.lease_id = lease_id
+        self.waited_ms = waited_ms
+        self._released = False
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self.gateway._release(self.lease_id)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+
+class AIGateway(SQLiteStore):
+    schema = SCHEMA
+
+    def __init__(self, path, max_in_flight=4, max_queue=8, queue_timeout=5.0,
+                 rate_per_minute=6.0, burst=10, lease_ttl=180.0):
+        super().__init__(path)
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.rate_per_minute = rate_per_minute
+        self.burst = burst
+        # Слот "загиблого" воркера звільняється автоматично через lease_ttl секунд
+        self.lease_ttl = lease_ttl
+
+    # ---------- публічний API ----------
+
+    def acquire(self, user_id):
+        """Займає слот моделі для користувача або кидає GatewayRejected"""
+        self._take_token(user_id)
+
+        try:
+            return self._acquire_slot(user_id)
+        except GatewayRejected:
+            # Запит не дійшов до моделі — повертаємо токен користувачу
+            self._refund_token(user_id)
+            raise
+
+    def metrics(self):
+        """Поточна глибина черги, зайняті слоти та статистика очікування"""
+        conn = self.connection()
+        now = time.time()
+
+        in_flight = conn.execute('SELECT COUNT(*) FROM ai_inflight WHERE acquired_at >= ?',
+                                 (now - self.lease_ttl,)).fetchone()[0]
+        queue_depth = conn.execute('SELECT COUNT(*) FROM ai_waiting WHERE since >= ?',
+                                   (now - self.queue_timeout * 2,)).fetchone()[0]
+        stats = dict(conn.execute('SELECT key, value FROM ai_gateway_stats').fetchall())
+
+        wait_count = stats.get('wait_count', 0)
+        return {
+            'in_flight': in_flight,
+            'max_in_flight': self.max_in_flight,
+            'queue_depth': queue_depth,
+            'max_queue': self.max_queue,
+            'admitted': int(stats.get('admitted', 0)),
+            'rejected': {
+                'rate_limited': int(stats.get('rejected_rate_limited', 0)),
+                'queue_full': int(stats.get('rejected_queue_full', 0)),
+                'queue_timeout': int(stats.get('rejected_queue_timeout', 0)),
+            },
+            'wait_ms': {
+                'count': int(wait_count),
+                'sum': round(stats.get('wait_ms_sum', 0), 1),
+                'avg': round(stats.get('wait_ms_sum', 0) / wait_count, 1) if wait_count else 0,
+                'max': round(stats.get('wait_ms_max', 0), 1),
+                'buckets': {
+                    str(le): int(stats.get(f'wait_le_{le}', 0)) for le in WAIT_BUCKETS_MS
+                },
+            },
+        }
+
+    # ---------- token bucket ----------
+
+    def _take_token(self, user_id):
+        if not self.rate_per_minute or user_id is None:
+            return
+
+        refill_per_sec = self.rate_per_minute / 60.0
+        now = time.time()
+
+        with self.transaction() as conn:
+            row = conn.execute('SELECT tokens, updated_at FROM ai_rate_bucket WHERE user_id = ?',
+                               (user_id,)).fetchone()
+            tokens = self.burst if row is None else min(
+                self.burst, row[0] + (now - row[1]) * refill_per_sec)
+
+            if tokens < 1:
+                self._incr(conn, 'rejected_rate_limited')
+            else:
+                conn.execute('INSERT OR REPLACE INTO ai_rate_bucket (user_id, tokens, updated_at) '
+                             'VALUES (?, ?, ?)', (user_id, tokens - 1, now))
+
+        if tokens < 1:
+            raise GatewayRejected('rate_limited', (1 - tokens) / refill_per_sec)
+
+    def _refund_token(self, user_id):
+        if not self.rate_per_minute or user_id is None:
+            return
+
+        with self.transaction() as conn:
+            conn.execute('UPDATE ai_rate_bucket SET tokens = MIN(tokens + 1, ?) WHERE user_id = ?',
+                         (self.burst, user_id))
+
+    # ---------- слоти та черга ----------
+
+    def _acquire_slot(self, user_id):
+        started = time.monotonic()
+        waiting_id = None
+
+        with self.transaction() as conn:
+            self._cleanup(conn)
+            lease_id = self._try_lease(conn, user_id)
+
+            if lease_id is None:
+                queue_depth = conn.execute('SELECT COUNT(*) FROM ai_waiting').fetchone()[0]
+                if queue_depth >= self.max_queue:
+                    self._incr(conn, 'rejected_queue_full')
+                else:
+                    waiting_id = conn.execute('INSERT INTO ai_waiting (pid, since) VALUES (?, ?)',
+                                              (os.getpid(), time.time())).lastrowid
+
+        if lease_id is None and waiting_id is None:
+            # Черга переповнена — відмовляємо одразу, не займаючи воркер
+            raise GatewayRejected('queue_full', self.queue_timeout)
+
+        try:
+            delay = 0.02
+            while lease_id is None:
+                if time.monotonic() - started >= self.queue_timeout:
+                    with self.transaction() as conn:
+                        self._incr(conn, 'rejected_queue_timeout')
+                    raise GatewayRejected('queue_timeout', self.queue_timeout)
+
+                time.sleep(delay)
+                delay = min(delay * 2, 0.25)
+
+                with self.transaction() as conn:
+                    lease_id = self._try_lease(conn, user_id)
+        finally:
+            if waiting_id is not None:
+                with self.transaction() as conn:
+                    conn.execute('DELETE FROM ai_waiting WHERE id = ?', (waiting_id,))
+
+        waited_ms = (time.monotonic() - started) * 1000
+        with self.transaction() as conn:
+            self._record_wait(conn, waited_ms)
+
+        return Lease(self, lease_id, waited_ms)
+
+    def _try_lease(self, conn, user_id):
+        in_flight = conn.execute('SELECT COUNT(*) FROM ai_inflight').fetchone()[0]
+        if in_flight >= self.max_in_flight:
+            return None
+
+        return conn.execute('INSERT INTO ai_inflight (pid, user_id, acquired_at) VALUES (?, ?, ?)',
+                            (os.getpid(), user_id, time.time())).lastrowid
+
+    def _release(self, lease_id):
+        with self.transaction() as conn:
+            conn.execute('DELETE FROM ai_inflight WHERE id = ?', (lease_id,))
+
+    def _cleanup(self, conn):
+        now = time.time()
+        conn.execute('DELETE FROM ai_inflight WHERE acquired_at < ?', (now - self.lease_ttl,))
+        conn.execute('DELETE FROM ai_waiting WHERE since < ?', (now - self.queue_timeout * 2,))
+
+    # ---------- статистика ----------
+
+    def _incr(self, conn, key, amount=1):
+        conn.execute('INSERT INTO ai_gateway_stats (key, value) VALUES (?, ?) '
+                     'ON CONFLICT(key) DO UPDATE SET value = value + excluded.value', (key, amount))
+
+    def _record_wait(self, conn, waited_ms):
+        self._incr(conn, 'admitted')
+        self._incr(conn, 'wait_count')
+        self._incr(conn, 'wait_ms_sum', waited_ms)
+        conn.execute('INSERT INTO ai_gateway_stats (key, value) VALUES (?, ?) '
+                     'ON CONFLICT(key) DO UPDATE SET value = MAX(value, excluded.value)',
+                     ('wait_ms_max', waited_ms))
+        for le in WAIT_BUCKETS_MS:
+            if waited_ms <= le:
+                self._incr(conn, f'wait_le_{le}')
@@ -0,0 +1,163 @@
+"""Структурований план поїздки від AI асистента
+
+Модель повертає JSON за схемою PLAN_SCHEMA порціями по CHUNK_DAYS днів
+(так можна показувати прогрес довгої генерації). Кожна порція
+перевіряється і перетворюється на рядки для масової вставки в activity.
+"""
+import json
+import math
+import re
+from datetime import datetime, timedelta
+
+CATEGORIES = ('general', 'transport', 'food', 'activity', 'accommodation', 'shopping')
+
+# Днів плану на одне звернення до моделі
+CHUNK_DAYS = 4
+MAX_DAYS = 30
+MAX_ACTIVITIES_PER_DAY = 8
+
+TIME_RE = re.compile(r'^([01]?\d|2[0-3]):([0-5]\d)$')
+
+PLAN_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'days': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {
+                    'day': {'type': 'integer'},
+                    'activities': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'title': {'type': 'string'},
+                                'time': {'type': 'string'},
+                                'location': {'type': 'string'},
+                                'category': {'type': 'string', 'enum': list(CATEGORIES)},
+                                'cost': {'type': 'number'},
+                                'description': {'type': 'string'},
+                            },
+                            'required': ['title', 'time', 'category'],
+                        },
+                    },
+                },
+                'required': ['day', 'activities'],
+            },
+        },
+    },
+    'required': ['days'],
+}
+
+
+class PlanError(ValueError):
+    """Відповідь моделі не містить придатного плану"""
+
+
+def day_chunks(total_days, size=CHUNK_DAYS):
+    """Діапазони днів (перший, останній), нумерація з 1"""
+    return [(first, min(first + size - 1, total_days)) for first in range(1, total_days + 1, size)]
+
+
+def plan_prompt(context, start_date, first_day, last_day, preferences=''):
+    """Запит на план днів first_day..last_day поїздки"""
+    first_date = start_date + timedelta(days=first_day - 1)
+    last_date = start_date + timedelta(days=last_day - 1)
+
+    return (
+        "Склади детальний план поїздки по днях у форматі JSON за заданою схемою.\n"
+        f"Дні плану: {first_day}-{last_day} ({first_date.strftime('%d.%m.%Y')} – {last_date.strftime('%d.%m.%Y')}).\n"
+        f"Для кожного дня 3–{MAX_ACTIVITIES_PER_DAY} активностей з часом у форматі HH:MM, "
+        "конкретним місцем, категорією та орієнтовною вартістю у валюті поїздки "
+        "(0, якщо безкоштовно). Не повторюй активності, що вже є у плані.\n"
+        f"{'Побажання: ' + preferences.strip() + chr(10) if preferences and preferences.strip() else ''}"
+        f"\nДані поїздки:\n{context}"
+    )
+
+
+def _load_json(text):
+    text = (text or '').strip()
+    # Модель інколи загортає JSON у блок коду markdown
+    fenced = re.match(r'^```(?:json)?\s*(.*?)\s*```$', text, re.DOTALL)
+    if fenced:
+        text = fenced.group(1)
+
+    try:
+        return json.loads(text)
+    except ValueError as e:
+        raise PlanError(f"Некоректний JSON: {e}") from e
+
+
+def _clean_text(value, limit):
+    return str(value or '').strip()[:limit]
+
+
+def parse_plan(text, start_date, first_day, last_day):
+    """Перевіряє відповідь моделі та повертає рядки активностей
+
+    Дні поза first_day..last_day, активності без назви та понад
+    MAX_ACTIVITIES_PER_DAY відкидаються; невідома категорія стає general.
+    """
+    data = _load_json(text)
+    days = data.get('days') if isinstance(data, dict) else None
+    if not isinstance(days, list):
+        raise PlanError("У відповіді немає списку днів")
+
+    rows = []
+    for day in days:
+        if not isinstance(day, dict):
+            continue
+
+        try:
+            day_number = int(day.get('day'))
+        except (TypeError, ValueError):
+            continue
+        if not first_day <= day_number <= last_day:
+            continue
+
+        date = datetime.combine(start_date + timedelta(days=day_number - 1), datetime.min.time())
+        activities = day.get('activities') if isinstance(day.get('activities'), list) else []
+
+        kept = 0
+        for activity in activities:
+            if kept >= MAX_ACTIVITIES_PER_DAY:
+                break
+            if not isinstance(activity, dict):
+                continue
+
+            title = _clean_text(activity.get('title'), 200)
+            if not title:
+                continue
+
+            time = _clean_text(activity.get('time'), 10)
+            match = TIME_RE.match(time)
+            time = f"{int(match.group(1)):02d}:{match.group(2)}" if match else ''
+
+            category = activity.get('category')
+            if category not in CATEGORIES:
+                category = 'general'
+
+            try:
+                cost = float(activity.get('cost') or 0)
+            except (TypeError, ValueError):
+                cost = 0.0
+            # "nan" / "inf" від моделі не мають потрапити в бюджет
+            if not math.isfinite(cost) or cost < 0:
+                cost = 0.0
+
+            rows.append({
+                'title': title,
+                'description': _clean_text(activity.get('description'), 2000),
+                'date': date,
+                'time': time,
+                'location': _clean_text(activity.get('location'), 200),
+                'cost': round(cost, 2),
+                'category': category,
+            })
+            kept += 1
+
+    if not rows:
+        raise PlanError("План не містить жодної активності")
+
+    return sorted(rows, key=lambda row: (row['date'], row['time']))
@@ -0,0 +1,131 @@
+"""Бекенди мовної моделі для TravelAI
+
+Підтримуються два бекенди (змінна середовища AI_BACKEND):
+- gemini — Google Gemini (за замовчуванням, потрібен GEMINI_API_KEY)
+- fake   — локальний фейковий сервер (assistant/fake_server.py) для офлайн-тестування
+"""
+import hashlib
+import os
+
+# google.generativeai та requests імпортуються при першому зверненні до моделі:
+# лише імпорт google.generativeai займає ~0.7 с на кожен воркер
+
+# Lite версія значно швидша
+GEMINI_MODEL_NAME = "gemini-2.5-flash-lite"
+
+SYSTEM_INSTRUCTION = (
+    "Ти — 'TravelAI', персональний інтелектуальний travel-асистент. "
+    "Твій стиль: привітний, натхненний, але лаконічний. "
+    "Твої правила:\n"
+    "1. Відповідай українською мовою.\n"
+    "2. Форматуй відповіді: використовуй жирний текст для назв локацій та марковані списки для маршрутів.\n"
+    "3. Якщо користувач питає про подорож з України, враховуй сучасні логістичні реалії (автобуси, поїзди до Перемишля/Варшави, вильоти з найближчих аеропортів сусідніх країн).\n"
+    "4. Завжди додавай одну цікаву 'фішку' про місце (наприклад, секретний дворик або найкращу каву).\n"
+)
+
+# Таймаути для фейкового сервера: (з'єднання, читання між частинами)
+FAKE_LLM_TIMEOUT = (5, 60)
+
+_gemini_model = None
+
+
+def get_backend():
+    """Повертає назву активного бекенду моделі"""
+    return os.getenv('AI_BACKEND', 'gemini').strip().lower()
+
+
+def is_configured():
+    """Чи можна звертатися до моделі (є ключ або увімкнено фейковий бекенд)"""
+    if get_backend() == 'fake':
+        return True
+    return bool(os.getenv('GEMINI_API_KEY'))
+
+
+def model_fingerprint():
+    """Ідентифікатор бекенду, моделі та системної інструкції (для ключів кешу)"""
+    digest = hashlib.sha1(SYSTEM_INSTRUCTION.encode('utf-8')).hexdigest()[:8]
+    return f"{get_backend()}:{GEMINI_MODEL_NAME}:{digest}"
+
+
+def get_gemini_model():
+    """Створює модель Gemini при першому зверненні"""
+    global _gemini_model
+
+    if _gemini_model is None:
+        import google.generativeai as genai
+
+        genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
+        _gemini_model = genai.GenerativeModel(
+            model_name=GEMINI_MODEL_NAME,
+            system_instruction=SYSTEM_INSTRUCTION
+        )
+
+    return _gemini_model
+
+
+def _fake_llm_url():
+    return os.getenv('FAKE_LLM_URL', 'http://127.0.0.1:8765').rstrip('/')
+
+
+def generate(contents):
+    """Повертає повну відповідь моделі одним рядком
+
+    contents — рядок або список реплік у форматі Gemini ({'role', 'parts'}).
+    """
+    if get_backend() == 'fake':
+        import requests
+
+        response = requests.post(f"{_fake_llm_url()}/generate",
+                                 json={'contents': contents, 'stream': False},
+                                 timeout=FAKE_LLM_TIMEOUT)
+        response.raise_for_status()
+        return response.json()['text']
+
+    response = get_gemini_model().generate_content(contents)
+
+    # Gemini повертає відповідь у полі .text
+    return response.text
+
+
+def generate_json(contents, schema):
+    """Повертає відповідь моделі у форматі JSON за схемою (рядком)"""
+    if get_backend() == 'fake':
+        import requests
+
+        response = requests.post(f"{_fake_llm_url()}/generate",
+                                 json={'contents': contents, 'stream': False, 'schema': schema},
+                                 timeout=FAKE_LLM_TIMEOUT)
+        response.raise_for_status()
+        return response.json()['text']
+
+    response = get_gemini_model().generate_content(contents, generation_config={
+        'response_mime_type': 'application/json',
+        'response_schema': schema,
+    })
+    return response.text
+
+
+def stream(contents):
+    """Повертає відповідь моделі частинами в міру надходження токенів"""
+    if get_backend() == 'fake':
+        import requests
+
+        with requests.post(f"{_fake_llm_url()}/generate",
+                           json={'contents': contents, 'stream': True},
+                           stream=True,
+                           timeout=FAKE_LLM_TIMEOUT) as response:
+            response.raise_for_status()
+            response.encoding = response.encoding or 'utf-8'
+            for chunk in response.iter_content(chunk_size=None, decode_unicode=True):
+                if chunk:
+                    yield chunk
+        return
+
+    for chunk in get_gemini_model().generate_content(contents, stream=True):
+        try:
+            text = chunk.text
+        except ValueError:
+            # Частина без тексту (наприклад, лише метадані безпеки)
+            continue
+        if text:
+            yield text
@@ -0,0 +1,98 @@
+"""Пам'ять розмов AI асистента: вікно останніх реплік + накопичувальний зміст
+
+До моделі щоразу потрапляє не більше WINDOW_MESSAGES + SUMMARY_BATCH
+реплік (кожна обрізана до MESSAGE_MAX_CHARS) і зміст не довший за
+SUMMARY_MAX_CHARS, тому розмір запиту не залежить від довжини розмови.
+Старші репліки порціями згортаються в зміст.
+"""
+
+# Останні репліки, що завжди передаються дослівно
+WINDOW_MESSAGES = 8
+# Скільки реплік понад вікно накопичується перед згортанням у зміст
+SUMMARY_BATCH = 6
+SUMMARY_MAX_CHARS = 1500
+MESSAGE_MAX_CHARS = 2000
+# Довжина однієї репліки у витяговому змісті
+EXTRACT_CHARS = 160
+
+ROLE_NAMES = {'user': 'Користувач', 'model': 'TravelAI'}
+
+
+def clip(text, limit):
+    text = (text or '').strip()
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + '…'
+
+
+def needs_compaction(unsummarized_count):
+    return unsummarized_count > WINDOW_MESSAGES + SUMMARY_BATCH
+
+
+def compaction_size(unsummarized_count):
+    """Скільки найстаріших незгорнутих реплік згорнути в зміст"""
+    return max(0, unsummarized_count - WINDOW_MESSAGES)
+
+
+def build_contents(user_message, recent_messages, summary='', context=''):
+    """Список реплік для моделі у форматі Gemini
+
+    recent_messages — незгорнуті репліки у хронологічному порядку,
+    елементи з атрибутами role ('user'/'model') та content.
+    """
+    preface = []
+    if context:
+        preface.append(f"Дані моєї поїздки (враховуй їх у відповідях):\n{context}")
+    if summary:
+        preface.append(f"Короткий зміст нашої попередньої розмови:\n{summary}")
+
+    contents = []
+    if preface:
+        contents.append({'role': 'user', 'parts': ['\n\n'.join(preface)]})
+        contents.append({'role': 'model', 'parts': ["Дякую, я врахую це у відповідях."]})
+
+    for message in recent_messages:
+        contents.append({'role': message.role, 'parts': [clip(message.content, MESSAGE_MAX_CHARS)]})
+
+    contents.append({'role': 'user', 'parts': [user_message]})
+    return contents
+
+
+def extractive_summary(previous_summary, messages):
+    """Зміст без звернення до моделі: перші речення кожної репліки"""
+    lines = [previous_summary] if previous_summary else []
+
+    for message in messages:
+        first_sentence = (message.content or '').strip().split('\n')[0]
+        lines.append(f"{ROLE_NAMES.get(message.role, message.role)}: {clip(first_sentence, EXTRACT_CHARS)}")
+
+    summary = '\n'.join(lines)
+    # Зберігаємо найсвіжіше, відкидаючи початок
+    if len(summary) > SUMMARY_MAX_CHARS:
+        summary = '…' + summary[-(SUMMARY_MAX_CHARS - 1):]
+    return summary
+
+
+def summary_prompt(previous_summary, messages):
+    """Запит до моделі на оновлення змісту розмови"""
+    transcript = '\n'.join(
+        f"{ROLE_NAMES.get(m.role, m.role)}: {clip(m.content, MESSAGE_MAX_CHARS)}" for m in messages
+    )
+    return (
+        "Онови короткий зміст розмови користувача з travel-асистентом. "
+        "Збережи факти про плани, дати, бюджет, вподобання та домовленості; "
+        f"без вступів, не довше {SUMMARY_MAX_CHARS} символів.\n\n"
+        f"Попередній зміст:\n{previous_summary or '—'}\n\n"
+        f"Нові репліки:\n{transcript}"
+    )
+
+
+def rolling_summary(previous_summary, messages, summarizer=None):
+    """Новий зміст: через модель (summarizer(prompt) -> str) або витяговий"""
+    if summarizer is not None:
+        try:
+            summary = summarizer(summary_prompt(previous_summary, messages))
+            if summary and summary.strip():
+                return clip(summary, SUMMARY_MAX_CHARS)
+        except Exception as e:
+            print("AI SUMMARY ERROR:", e)
+
+    return extractive_summary(previous_summary, messages)
@@ -0,0 +1,54 @@
+"""Спільні SQLite-сховища AI асистента (видимі всім воркерам gunicorn)"""
+import os
+import sqlite3
+import threading
+
+
+class SQLiteStore:
+    """Окремий файл SQLite з власним з'єднанням для кожного потоку
+
+    Схема створюється ліниво при першому з'єднанні, тому імпорт модуля
+    нічого не відкриває і не пише на диск.
+    """
+
+    schema = ''
+
+    def __init__(self, path, timeout=5.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+
+        if conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # isolation_level=None — транзакціями керуємо явно (BEGIN IMMEDIATE)
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            if self.schema:
+                conn.executescript(self.schema)
+            self._local.conn = conn
+
+        return conn
+
+    def transaction(self):
+        """Транзакція з блокуванням на запис одразу (атомарно між процесами)"""
+        return _Transaction(self.connection())
+
+
+class _Transaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.execute('COMMIT')
+        else:
+            self.conn.execute('ROLLBACK')
+        return False
@@ -0,0 +1,49 @@
+"""Server-Sent Events для потокових відповідей AI асистента"""
+import json
+import time
+
+
+def sse_event(data, event=None):
+    """Форматує одну подію SSE"""
+    lines = []
+    if event:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
+    return '\n'.join(lines) + '\n\n'
+
+
+def sse_stream(chunks, on_complete=None, meta=None):
+    """Перетворює потік частин відповіді моделі на події SSE
+
+    Кожна частина надсилається подією {"delta": ...}, наприкінці — подія
+    done з часом до першого токена (ttft_ms) та загальним часом генерації.
+    on_complete(reply) викликається з повною відповіддю після успішного завершення,
+    meta — додаткові поля події done (наприклад, cached).
+    """
+    started = time.monotonic()
+    first_token_ms = None
+    parts = []
+
+    # Коментар одразу відкриває потік у браузері та проксі
+    yield ': stream\n\n'
+
+    try:
+        for chunk in chunks:
+            if first_token_ms is None:
+                first_token_ms = round((time.monotonic() - started) * 1000)
+            parts.append(chunk)
+            yield sse_event({'delta': chunk})
+    except Exception as e:
+        print("GEMINI STREAM ERROR:", e)
+        yield sse_event({'error': f"⚠️ Помилка сервера: {str(e)}"}, event='error')
+        return
+
+    reply = ''.join(parts)
+    if on_complete:
+        on_complete(reply)
+
+    yield sse_event({
+        'ttft_ms': first_token_ms,
+        'total_ms': round((time.monotonic() - started) * 1000),
+        **(meta or {})
+    }, event='done')
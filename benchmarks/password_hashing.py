@@ -0,0 +1,114 @@
+"""Бенчмарк хешування паролів: входів за секунду на ядро для кожної політики
+
+    python benchmarks/password_hashing.py
+    python benchmarks/password_hashing.py --methods pbkdf2:sha256:600000 scrypt:16384:8:1 --runs 20 --json
+
+Для кожного методу — медіана однієї перевірки (check_password_hash) в
+одному потоці, звідки входів/с на ядро, та пропускна здатність пулу
+planner.passwords.PasswordPool з --workers потоками під навантаженням
+--concurrency одночасних входів (скільки входів відхилено через переповнену
+чергу).
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from werkzeug.security import check_password_hash  # noqa: E402
+
+from planner.passwords import PasswordPool, VerificationRejected, canonical_method, hash_password  # noqa: E402
+
+DEFAULT_METHODS = (
+    'pbkdf2:sha256:260000',
+    'pbkdf2:sha256:600000',
+    'pbkdf2:sha256:1000000',
+    'scrypt:16384:8:1',
+    'scrypt:32768:8:1',
+    'scrypt:65536:8:1',
+)
+
+PASSWORD = 'correct horse battery staple'
+
+
+def measure_single(pwhash, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        assert check_password_hash(pwhash, PASSWORD)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def measure_pool(pwhash, workers, queue, concurrency, logins):
+    """Входи з concurrency потоків запитів через пул; повертає (входів/с, відхилено)"""
+    pool = PasswordPool(workers=workers, max_queue=queue, timeout=60)
+    per_thread = max(1, logins // concurrency)
+    rejected = [0]
+    lock = threading.Lock()
+
+    def client():
+        for _ in range(per_thread):
+            try:
+                pool.run(check_password_hash, pwhash, PASSWORD)
+            except VerificationRejected:
+                with lock:
+                    rejected[0] += 1
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    done = per_thread * concurrency - rejected[0]
+    return round(done / elapsed, 1), rejected[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Вартість перевірки пароля для різних політик хешування')
+    parser.add_argument('--methods', nargs='+', default=DEFAULT_METHODS)
+    parser.add_argument('--runs', type=int, default=10, help='перевірок для медіани в одному потоці')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='потоків пулу')
+    parser.add_argument('--queue', type=int, default=16, help='місць у черзі пулу')
+    parser.add_argument('--concurrency', type=int, default=32, help='одночасних входів')
+    parser.add_argument('--logins', type=int, default=64, help='входів у тесті пулу')
+    parser.add_argument('--json', action='store_true', help='вивести результат у JSON')
+    args = parser.parse_args()
+
+    report = {'cpu_count': os.cpu_count(), 'workers': args.workers, 'queue': args.queue,
+              'concurrency': args.concurrency, 'methods': []}
+
+    for method in args.methods:
+        pwhash = hash_password(PASSWORD, method)
+        ms = measure_single(pwhash, args.runs)
+        pool_rate, rejected = measure_pool(pwhash, args.workers, args.queue, args.concurrency, args.logins)
+        report['methods'].append({
+            'method': canonical_method(method),
+            'verify_ms': round(ms, 2),
+            'logins_per_sec_per_core': round(1000 / ms, 1),
+            'pool_logins_per_sec': pool_rate,
+            'pool_rejected': rejected,
+        })
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+
+    print(f"Ядер: {report['cpu_count']}; пул: {args.workers} потоків, черга {args.queue}, "
+          f"одночасних входів: {args.concurrency}")
+    print(f"  {'метод':<24} {'перевірка, мс':>14} {'входів/с/ядро':>14} {'пул, входів/с':>14} {'відхилено':>10}")
+    for result in report['methods']:
+        print(f"  {result['method']:<24} {result['verify_ms']:>14.2f} {result['logins_per_sec_per_core']:>14.1f} "
+              f"{result['pool_logins_per_sec']:>14.1f} {result['pool_rejected']:>10}")
+
+
+if __name__ == '__main__':
+    main()
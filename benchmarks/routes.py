@@ -0,0 +1,306 @@
+"""Бенчмарк маршрутів на синтетичних наборах даних з порівнянням з базовою лінією
+
+    python benchmarks/routes.py
+    python benchmarks/routes.py --profiles small heavy-user large --runs 30
+    python benchmarks/routes.py --update-baseline
+    python benchmarks/routes.py --only dashboard view_trip --json
+
+Для кожного профілю planner.dataset (файл будується при першому запуску і
+кешується в instance/datasets/) застосунок працює з тимчасовою копією бази
+через Flask test client від імені користувача з найбільшою кількістю
+поїздок (у профілях з важким користувачем — від нього). Погода та курси
+валют відповідають локальними заглушками замість requests.get, модель —
+AI_BACKEND=fake, тож мережа не потрібна.
+
+Для кожного маршруту — p50/p95/p99 часу відповіді, кількість SQL-запитів
+(із заголовка Server-Timing, planner.instrumentation) та пік виділеної
+пам'яті за окремий прогін під tracemalloc. Результат порівнюється з
+benchmarks/baselines/routes.json: регресія — якщо p50 або пік пам'яті
+зросли більше ніж на --threshold (і на --min-ms / --min-kb в абсолютних
+числах, щоб не ловити шум), або SQL-запитів стало більше. Тоді код виходу 1.
+
+Кількість SQL-запитів детермінована і порівнюється точно. Час залежить
+від машини і на спільних віртуалках коливається між запусками в рази,
+тому поріг за замовчуванням — удвічі повільніше; на виділеній машині
+його варто зменшити, а базову лінію оновлювати (--update-baseline) там
+само, де запускається порівняння.
+"""
+import argparse
+import gc
+import json
+import os
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+os.environ.setdefault('AI_BACKEND', 'fake')
+# Ключ потрібен, щоб погода взагалі запитувалася (відповідає заглушка нижче)
+os.environ.setdefault('OPENWEATHER_API_KEY', 'benchmark')
+
+import requests  # noqa: E402
+
+from planner import create_app  # noqa: E402
+from planner.dataset import BASE_DATE, PROFILES, SYNTHETIC_PASSWORD, dataset_path, heavy_user_id  # noqa: E402
+from planner.extensions import db  # noqa: E402
+from planner.models import Activity, PackingItem, Trip, TripChecklist, TripTemplate, User  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(PROJECT_ROOT, 'benchmarks', 'baselines', 'routes.json')
+DEFAULT_PROFILES = ('small', 'heavy-user')
+
+SQL_TIMING = re.compile(r'desc="SQL: (\d+)"')
+
+
+# ============= ЗАГЛУШКИ ЗОВНІШНІХ API =============
+
+class StubResponse:
+    def __init__(self, data):
+        self.status_code = 200
+        self.ok = True
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+def _weather_point(timestamp):
+    return {'dt': timestamp, 'main': {'temp': 18.4, 'feels_like': 17.9, 'temp_min': 14.0, 'temp_max': 21.0,
+                                      'humidity': 60, 'pressure': 1015},
+            'weather': [{'description': 'хмарно', 'icon': '03d'}], 'wind': {'speed': 3.2}}
+
+
+def stub_get(url, params=None, **kwargs):
+    """Відповіді OpenWeatherMap і ПриватБанку у форматі, який розбирає застосунок"""
+    if 'openweathermap' in url and url.endswith('/forecast'):
+        start = int(BASE_DATE.timestamp())
+        return StubResponse({'list': [_weather_point(start + hour * 3600) for hour in range(0, 120, 3)]})
+    if 'openweathermap' in url:
+        return StubResponse(_weather_point(int(BASE_DATE.timestamp())))
+    if 'privatbank' in url:
+        return StubResponse([{'ccy': 'USD', 'base_ccy': 'UAH', 'buy': '41.2', 'sale': '41.8'},
+                             {'ccy': 'EUR', 'base_ccy': 'UAH', 'buy': '44.9', 'sale': '45.6'}])
+    raise AssertionError(f'Неочікуваний зовнішній запит: {url}')
+
+
+# ============= МАРШРУТИ =============
+
+def pick_targets(profile):
+    """id користувача, поїздки, її записів і шаблону, з якими працюють маршрути"""
+    user_id = heavy_user_id(profile)
+    if user_id is None:
+        user_id = db.session.query(Trip.user_id).group_by(Trip.user_id) \
+            .order_by(db.func.count(Trip.id).desc(), Trip.user_id).limit(1).scalar()
+
+    # Найбільша поїздка користувача, у якої є всі записи для перемикачів
+    trip = db.session.query(Trip).filter(
+        Trip.user_id == user_id,
+        Trip.id.in_(db.select(PackingItem.trip_id)),
+        Trip.id.in_(db.select(TripChecklist.trip_id)),
+    ).order_by(
+        db.select(db.func.count(Activity.id)).where(Activity.trip_id == Trip.id).scalar_subquery().desc(), Trip.id
+    ).first()
+    if trip is None:
+        raise SystemExit(f'У профілі {profile} немає поїздки з речами та чеклістом')
+
+    template = db.session.query(TripTemplate) \
+        .filter(db.or_(TripTemplate.is_public, TripTemplate.user_id == user_id)) \
+        .order_by(TripTemplate.popularity.desc(), TripTemplate.id).first()
+
+    return {
+        'email': db.session.get(User, user_id).email,
+        'trip': trip.id,
+        'year': trip.start_date.year,
+        'month': trip.start_date.month,
+        'search': trip.destination.split(',')[0],
+        'activity': db.session.query(Activity.id).filter_by(trip_id=trip.id).order_by(Activity.id).limit(1).scalar(),
+        'packing': db.session.query(PackingItem.id).filter_by(trip_id=trip.id).order_by(PackingItem.id).limit(1).scalar(),
+        'checklist': db.session.query(TripChecklist.id).filter_by(trip_id=trip.id)
+        .order_by(TripChecklist.id).limit(1).scalar(),
+        'template': template.id if template else None,
+    }
+
+
+def route_cases(t):
+    """(назва, метод, URL, дані форми, очікуваний статус); записуючі — наприкінці"""
+    trip = t['trip']
+    cases = [
+        ('dashboard', 'GET', '/dashboard', None, 200),
+        ('my_trips', 'GET', '/my-trips', None, 200),
+        ('trip_calendar', 'GET', f"/calendar?year={t['year']}&month={t['month']}", None, 200),
+        ('world_map', 'GET', '/world-map', None, 200),
+        ('view_trip', 'GET', f'/trip/{trip}', None, 200),
+        ('trip_statistics', 'GET', f'/trip/{trip}/statistics', None, 200),
+        ('global_search', 'GET', f"/search?q={t['search']}", None, 200),
+        ('quick_search', 'GET', f"/api/quick-search?q={t['search'][:3]}", None, 200),
+        ('export_trip_pdf', 'GET', f'/trip/{trip}/export/pdf', None, 200),
+        ('toggle_activity', 'POST', f"/api/trip/{trip}/activity/{t['activity']}/toggle", None, 200),
+        ('toggle_packing_item', 'POST', f"/api/trip/{trip}/packing/{t['packing']}/toggle", None, 200),
+        ('toggle_checklist_item', 'POST', f"/api/trip/{trip}/checklist/{t['checklist']}/toggle", None, 200),
+    ]
+    if t['template'] is not None:
+        cases.append(('use_template', 'POST', f"/templates/{t['template']}/use",
+                      {'title': 'Бенчмарк', 'destination': 'Київ, Україна', 'start_date': '2026-06-01',
+                       'budget': '1000'}, 302))
+    return cases
+
+
+def request_once(client, method, url, data, expected):
+    started = time.perf_counter()
+    response = client.open(url, method=method, data=data)
+    response.get_data()
+    ms = (time.perf_counter() - started) * 1000
+
+    if response.status_code != expected:
+        raise AssertionError(f'{method} {url}: статус {response.status_code}, очікувався {expected}')
+    match = SQL_TIMING.search(response.headers.get('Server-Timing', ''))
+    return ms, int(match.group(1)) if match else None
+
+
+def measure_route(client, case, runs, warmup):
+    name, method, url, data, expected = case
+    for _ in range(warmup):
+        request_once(client, method, url, data, expected)
+
+    timings = []
+    queries = []
+    gc.collect()
+    for _ in range(runs):
+        ms, count = request_once(client, method, url, data, expected)
+        timings.append(ms)
+        queries.append(count)
+
+    # Пам'ять — окремим прогоном: tracemalloc сповільнює сам запит
+    gc.collect()
+    tracemalloc.start()
+    request_once(client, method, url, data, expected)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    cuts = statistics.quantiles(timings, n=100, method='inclusive') if len(timings) > 1 else timings * 99
+    return {
+        'p50_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(cuts[94], 2),
+        'p99_ms': round(cuts[98], 2),
+        # Медіана: поодинокий запит на перезавантаження користувача (USER_CACHE_TTL) — не регресія
+        'queries': round(statistics.median(queries)) if None not in queries else None,
+        'peak_kb': round(peak / 1024),
+    }
+
+
+def bench_profile(profile, runs, warmup, only, tmp):
+    # Копія: перемикачі та use_template пишуть у базу, а файл фікстури має лишитися незмінним
+    source = dataset_path(profile)
+    path = os.path.join(tmp, f'{profile}.db')
+    shutil.copyfile(source, path)
+
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + path,
+        'FRAGMENT_CACHE': 'none',
+        'METRICS_ENABLED': False,
+        'SLOW_REQUEST_LOG': os.path.join(tmp, 'slow_requests.log'),
+    })
+
+    with app.app_context():
+        targets = pick_targets(profile)
+        db.session.remove()
+
+    client = app.test_client()
+    response = client.post('/login', data={'email': targets['email'], 'password': SYNTHETIC_PASSWORD})
+    if response.status_code != 302:
+        raise SystemExit(f'Не вдалося увійти як {targets["email"]}: статус {response.status_code}')
+
+    results = {}
+    for case in route_cases(targets):
+        if only and case[0] not in only:
+            continue
+        results[case[0]] = measure_route(client, case, runs, warmup)
+
+    with app.app_context():
+        db.engine.dispose()
+    return results
+
+
+# ============= БАЗОВА ЛІНІЯ =============
+
+def compare(report, baseline, threshold, min_ms, min_kb):
+    """[(профіль, маршрут, повідомлення)] — регресії відносно baseline"""
+    regressions = []
+    for profile, routes in report['profiles'].items():
+        for name, result in routes.items():
+            base = baseline.get('profiles', {}).get(profile, {}).get(name)
+            if base is None:
+                continue
+
+            def worse(key, slack):
+                return result[key] > base[key] * (1 + threshold) and result[key] - base[key] > slack
+
+            if worse('p50_ms', min_ms):
+                regressions.append((profile, name, f"p50 {base['p50_ms']} → {result['p50_ms']} мс"))
+            if worse('peak_kb', min_kb):
+                regressions.append((profile, name, f"пам'ять {base['peak_kb']} → {result['peak_kb']} КБ"))
+            if None not in (result['queries'], base['queries']) and result['queries'] > base['queries']:
+                regressions.append((profile, name, f"SQL-запитів {base['queries']} → {result['queries']}"))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Час, SQL-запити та пам\'ять маршрутів на синтетичних даних')
+    parser.add_argument('--profiles', nargs='+', choices=list(PROFILES), default=DEFAULT_PROFILES)
+    parser.add_argument('--only', nargs='+', help='лише ці маршрути')
+    parser.add_argument('--runs', type=int, default=20, help='замірів на маршрут')
+    parser.add_argument('--warmup', type=int, default=3, help='запитів до заміру')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--update-baseline', action='store_true', help='записати результат як базову лінію')
+    parser.add_argument('--threshold', type=float, default=1.0, help='допустиме відносне погіршення')
+    parser.add_argument('--min-ms', type=float, default=5.0, help='менше погіршення p50 не вважається регресією')
+    parser.add_argument('--min-kb', type=float, default=256, help="менше зростання пам'яті не вважається регресією")
+    parser.add_argument('--json', action='store_true', help='вивести результат у JSON')
+    args = parser.parse_args()
+
+    requests.get = stub_get
+
+    report = {'runs': args.runs, 'profiles': {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in args.profiles:
+            report['profiles'][profile] = bench_profile(profile, args.runs, args.warmup, args.only, tmp)
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        regressions = []
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.threshold, args.min_ms, args.min_kb)
+    else:
+        print(f"⚠️ Базової лінії {args.baseline} немає (--update-baseline, щоб створити)", file=sys.stderr)
+        regressions = []
+
+    if args.json:
+        report['regressions'] = [{'profile': p, 'route': r, 'message': m} for p, r, m in regressions]
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        for profile, routes in report['profiles'].items():
+            print(f"Профіль {profile}; замірів: {args.runs}")
+            print(f"  {'маршрут':<22} {'p50, мс':>9} {'p95, мс':>9} {'p99, мс':>9} {'SQL':>6} {'пік, КБ':>9}")
+            for name, result in routes.items():
+                queries = '—' if result['queries'] is None else result['queries']
+                print(f"  {name:<22} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+                      f"{queries:>6} {result['peak_kb']:>9}")
+        if args.update_baseline:
+            print(f"Базову лінію записано: {args.baseline}")
+        for profile, name, message in regressions:
+            print(f"❌ {profile}/{name}: {message}")
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
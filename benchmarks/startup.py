@@ -0,0 +1,123 @@
+"""Бенчмарк холодного старту: час імпорту застосунку та RSS воркера
+
+    python benchmarks/startup.py --runs 10
+    python benchmarks/startup.py --json > startup.json
+
+Кожен запуск — окремий процес інтерпретатора, що виконує `import app`
+(те саме, що робить воркер gunicorn). Окремий запуск з `-X importtime`
+показує, які модулі імпортуються найдовше.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Модулі, що не повинні завантажуватися при старті воркера
+HEAVY_MODULES = ('reportlab', 'google.generativeai', 'requests')
+
+BOOT_SCRIPT = """
+import json, resource, sys, time
+started = time.perf_counter()
+import app
+boot_ms = (time.perf_counter() - started) * 1000
+
+rss_kb = None
+try:
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                rss_kb = int(line.split()[1])
+except OSError:
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+heavy = [name for name in %r if name in sys.modules]
+print(json.dumps({'boot_ms': boot_ms, 'rss_kb': rss_kb, 'heavy': heavy, 'modules': len(sys.modules)}))
+""" % (HEAVY_MODULES,)
+
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)$')
+
+
+def child_env():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = PROJECT_ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    env.setdefault('AI_BACKEND', 'fake')
+    return env
+
+
+def boot_once():
+    """Один холодний старт; повертає метрики процесу"""
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', BOOT_SCRIPT], cwd=PROJECT_ROOT, env=child_env(),
+                            capture_output=True, text=True, check=True)
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    metrics = json.loads(result.stdout.strip().splitlines()[-1])
+    metrics['wall_ms'] = wall_ms
+    return metrics
+
+
+def import_profile(top=15):
+    """Найдовші імпорти верхнього рівня з `python -X importtime`"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=PROJECT_ROOT,
+                            env=child_env(), capture_output=True, text=True, check=True)
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        # Відступ у виводі importtime відповідає глибині вкладеності імпорту
+        depth = (len(indent) - 1) // 2
+        if depth <= 2:
+            entries.append({'module': module, 'depth': depth,
+                            'self_ms': int(self_us) / 1000, 'cumulative_ms': int(cumulative_us) / 1000})
+
+    entries.sort(key=lambda entry: entry['cumulative_ms'], reverse=True)
+    return entries[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Час холодного старту та RSS воркера Travel Planner')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15, help='скільки найдовших імпортів показати')
+    parser.add_argument('--json', action='store_true', help='вивести результат у JSON')
+    args = parser.parse_args()
+
+    runs = [boot_once() for _ in range(args.runs)]
+    report = {
+        'runs': args.runs,
+        'boot_ms_median': round(statistics.median(run['boot_ms'] for run in runs), 1),
+        'boot_ms_min': round(min(run['boot_ms'] for run in runs), 1),
+        'wall_ms_median': round(statistics.median(run['wall_ms'] for run in runs), 1),
+        'rss_mb_median': round(statistics.median(run['rss_kb'] for run in runs) / 1024, 1),
+        'modules': runs[-1]['modules'],
+        'heavy_loaded': runs[-1]['heavy'],
+        'imports': import_profile(args.top),
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+
+    print(f"Запусків: {report['runs']}")
+    print(f"import app: медіана {report['boot_ms_median']} мс, мінімум {report['boot_ms_min']} мс")
+    print(f"Процес повністю (з інтерпретатором): {report['wall_ms_median']} мс")
+    print(f"RSS воркера: {report['rss_mb_median']} МБ, модулів: {report['modules']}")
+    print(f"Важкі модулі при старті: {', '.join(report['heavy_loaded']) or 'немає'}")
+    print("\nНайдовші імпорти (мс, накопичено / власний):")
+    for entry in report['imports']:
+        print(f"  {entry['cumulative_ms']:8.1f} {entry['self_ms']:8.1f}  {'  ' * entry['depth']}{entry['module']}")
+
+    if report['heavy_loaded']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""Бенчмарк створення поїздки з шаблону: масова вставка проти ORM по одному об'єкту
+
+    python benchmarks/template_instantiation.py
+    python benchmarks/template_instantiation.py --activities 200 --items 100 --runs 20 --json
+
+Обидва варіанти працюють з однаковим шаблоном у тимчасовій SQLite-базі.
+"orm" відтворює попередню реалізацію use_template (db.session.add на
+кожну активність і річ, записи шаблону — через relationship); "bulk" —
+planner.trip_templates.instantiate_template.
+Для кожного варіанта — медіана часу та кількість SQL-запитів.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+os.environ.setdefault('AI_BACKEND', 'fake')
+
+from sqlalchemy import event  # noqa: E402
+
+from planner import create_app  # noqa: E402
+from planner.database import init_db  # noqa: E402
+from planner.extensions import db  # noqa: E402
+from planner.models import Activity, PackingItem, Trip, TripTemplate, User  # noqa: E402
+from planner.trip_templates import instantiate_template, store_template_items  # noqa: E402
+
+CATEGORIES = ('general', 'food', 'activity', 'transport', 'shopping')
+PACKING_CATEGORIES = ('clothes', 'toiletries', 'electronics', 'documents', 'other')
+
+
+def make_template(user_id, activities, items, days):
+    template = TripTemplate(name='Бенчмарк', duration_days=days, currency='UAH', user_id=user_id)
+    db.session.add(template)
+    store_template_items(
+        template,
+        [{'title': f'Активність {i}', 'category': CATEGORIES[i % len(CATEGORIES)],
+          'location': f'Місце {i}', 'time': f'{8 + i % 12:02d}:00', 'cost': i % 50}
+         for i in range(activities)],
+        [{'name': f'Річ {i}', 'category': PACKING_CATEGORIES[i % len(PACKING_CATEGORIES)], 'quantity': 1 + i % 3}
+         for i in range(items)],
+    )
+    db.session.commit()
+    return template
+
+
+def instantiate_orm(template, user_id, start):
+    """Попередня реалізація: кожен рядок окремим об'єктом сесії"""
+    days = template.duration_days
+    trip = Trip(title='ORM', destination='Київ', start_date=start, end_date=start + timedelta(days=days - 1),
+                budget=0, currency=template.currency, user_id=user_id)
+    db.session.add(trip)
+    db.session.flush()
+
+    activities = template.activities
+    for index, data in enumerate(activities):
+        db.session.add(Activity(title=data.title, date=start + timedelta(days=index * days // len(activities)),
+                                time=data.time, location=data.location,
+                                category=data.category, cost=data.cost, trip_id=trip.id))
+
+    for data in template.packing_items:
+        db.session.add(PackingItem(name=data.name, category=data.category, quantity=data.quantity, trip_id=trip.id))
+
+    db.session.commit()
+    return trip
+
+
+def instantiate_bulk(template, user_id, start):
+    return instantiate_template(template, user_id, 'Bulk', 'Київ', start, 0)
+
+
+def measure(variant, template_id, user_id, runs):
+    counter = {'queries': 0}
+
+    def count(*args):
+        counter['queries'] += 1
+
+    timings = []
+    queries = []
+    start = datetime(2030, 6, 1)
+
+    for _ in range(runs):
+        # Шаблон завантажено до заміру: рахуємо лише створення поїздки
+        db.session.expunge_all()
+        template = db.session.get(TripTemplate, template_id)
+        expected = template.activity_count
+
+        counter['queries'] = 0
+        event.listen(db.engine, 'before_cursor_execute', count)
+        started = time.perf_counter()
+        trip = variant(template, user_id, start)
+        timings.append((time.perf_counter() - started) * 1000)
+        event.remove(db.engine, 'before_cursor_execute', count)
+        queries.append(counter['queries'])
+
+        assert Activity.query.filter_by(trip_id=trip.id).count() == expected
+
+    return {'ms_median': round(statistics.median(timings), 2), 'ms_min': round(min(timings), 2),
+            'queries': max(queries)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Створення поїздки з шаблону: bulk проти ORM')
+    parser.add_argument('--activities', type=int, default=200)
+    parser.add_argument('--items', type=int, default=100)
+    parser.add_argument('--days', type=int, default=14)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--json', action='store_true', help='вивести результат у JSON')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(tmp, 'bench.db'),
+            'FRAGMENT_CACHE': 'none',
+        })
+        with app.app_context():
+            init_db()
+            user = User(username='bench', email='bench@example.com', password='-')
+            db.session.add(user)
+            db.session.commit()
+
+            template = make_template(user.id, args.activities, args.items, args.days)
+
+            report = {
+                'activities': args.activities,
+                'items': args.items,
+                'days': args.days,
+                'runs': args.runs,
+                'orm': measure(instantiate_orm, template.id, user.id, args.runs),
+                'bulk': measure(instantiate_bulk, template.id, user.id, args.runs),
+            }
+            db.session.remove()
+
+    report['speedup'] = round(report['orm']['ms_median'] / report['bulk']['ms_median'], 1)
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+
+    print(f"Шаблон: {report['activities']} активностей, {report['items']} речей, {report['days']} днів; "
+          f"запусків: {report['runs']}")
+    for name in ('orm', 'bulk'):
+        result = report[name]
+        print(f"  {name:5} медіана {result['ms_median']:8.2f} мс, мінімум {result['ms_min']:8.2f} мс, "
+              f"SQL-запитів: {result['queries']}")
+    print(f"Прискорення: {report['speedup']}x")
+
+
+if __name__ == '__main__':
+    main()
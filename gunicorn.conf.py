@@ -0,0 +1,57 @@
+"""Налаштування gunicorn: gunicorn app:app (конфіг підхоплюється автоматично)
+
+GUNICORN_PRELOAD=True (за замовчуванням) — застосунок завантажується та
+прогрівається в master-процесі, воркери отримують його через fork.
+"""
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5001')
+workers = int(os.getenv('GUNICORN_WORKERS', '2'))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True') == 'True'
+
+
+def on_starting(server):
+    # Схема БД оновлюється один раз у master, до запуску воркерів
+    from planner.database import init_db
+    from planner.extensions import db
+
+    if preload_app:
+        app = server.app.wsgi()
+    else:
+        # Без preload застосунок master не завантажує — воркери створять власний
+        from planner import create_app
+
+        app = create_app()
+
+    with app.app_context():
+        init_db()
+        db.engine.dispose()
+
+
+def when_ready(server):
+    # Виконується в master після preload і до запуску воркерів
+    if not preload_app:
+        return
+
+    from planner.warmup import freeze_for_fork, warmup
+
+    report = warmup(server.app.wsgi())
+    freeze_for_fork()
+    server.log.info("Прогрів: %s", ', '.join(f"{name} {ms} мс" for name, (ms, _) in report.items()))
+
+
+def post_fork(server, worker):
+    if preload_app:
+        from planner.warmup import after_fork
+
+        after_fork(server.app.wsgi())
+
+
+def post_worker_init(worker):
+    # Без preload кожен воркер прогрівається сам, до першого запиту
+    if not preload_app:
+        from planner.warmup import warmup
+
+        warmup(worker.wsgi)
@@ -0,0 +1,134 @@
+"""Travel Planner — фабрика застосунку
+
+Важкі бібліотеки (ReportLab, google.generativeai, requests) імпортуються
+лише при першому використанні, тому старт воркера їх не завантажує.
+"""
+import os
+
+import click
+from flask import Flask
+
+from planner.assets import build_assets, init_assets, vendor_assets
+from planner.config import Config
+from planner.database import init_db
+from planner.dataset import DEFAULT_SEED, PROFILES as DATASET_PROFILES, SYNTHETIC_PASSWORD
+from planner.extensions import db, login_manager
+from planner.fragments import init_fragment_cache
+from planner.instrumentation import init_instrumentation
+from planner.metrics import init_metrics
+from planner.templating import clear_bytecode_cache, compile_templates, init_bytecode_cache
+from planner.users import init_user_cache
+from planner.utils import plural_filter
+
+# Корінь проєкту: templates/, static/ та instance/ лежать поруч із пакетом
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def create_app(config=None):
+    """Створює застосунок; config — словник, що перекриває Config"""
+    app = Flask(__name__, root_path=PROJECT_ROOT, instance_path=os.path.join(PROJECT_ROOT, 'instance'))
+    app.config.from_object(Config)
+    if config:
+        app.config.update(config)
+
+    db.init_app(app)
+    login_manager.init_app(app)
+
+    init_assets(app)
+    init_bytecode_cache(app)
+    init_fragment_cache(app)
+    init_user_cache(app)
+    init_instrumentation(app)
+    init_metrics(app)
+    app.jinja_env.filters['plural'] = plural_filter
+
+    from planner.views import BLUEPRINTS
+    for blueprint in BLUEPRINTS:
+        app.register_blueprint(blueprint)
+
+    @app.cli.command('init-db')
+    def init_db_command():
+        """flask --app app init-db"""
+        init_db()
+        print("База даних створена успішно!")
+
+    @app.cli.command('compile-templates')
+    @click.option('--clear', is_flag=True, help='Спершу очистити кеш байткоду')
+    def compile_templates_command(clear):
+        """Компілює всі шаблони в кеш байткоду; помилка шаблону — ненульовий код виходу"""
+        if clear:
+            clear_bytecode_cache(app)
+
+        count, errors = compile_templates(app)
+        for location, error in errors:
+            click.echo(f"❌ {location}: {error}", err=True)
+
+        if errors:
+            raise click.ClickException(f"Не скомпільовано шаблонів: {len(errors)} з {count}")
+        click.echo(f"Скомпільовано шаблонів: {count}")
+
+    @app.cli.command('vendor-assets')
+    @click.option('--force', is_flag=True, help='Завантажити заново навіть наявні файли')
+    def vendor_assets_command(force):
+        """Завантажує CSS/JS бібліотеки та шрифти в static/vendor"""
+        downloaded, errors = vendor_assets(app.static_folder, force=force)
+        for path, error in errors:
+            click.echo(f"❌ {path}: {error}", err=True)
+
+        if errors:
+            raise click.ClickException(f"Не завантажено файлів: {len(errors)}")
+        click.echo(f"Завантажено файлів: {downloaded}")
+
+    @app.cli.command('build-assets')
+    def build_assets_command():
+        """Мініфікує, додає відбитки та стискає static/ у static/dist"""
+        manifest, stats = build_assets(app.static_folder)
+
+        click.echo(f"Зібрано файлів: {stats['files']}")
+        click.echo(f"Розмір: {stats['source_bytes'] / 1024:.1f} КБ → {stats['minified_bytes'] / 1024:.1f} КБ, "
+                   f"gzip {stats['gzip_bytes'] / 1024:.1f} КБ, brotli {stats['brotli_bytes'] / 1024:.1f} КБ")
+
+        if not any(path.startswith('vendor/') for path in manifest):
+            click.echo("⚠️ Бібліотеки не завантажено (flask vendor-assets) — сторінки братимуть їх з CDN")
+
+    @app.cli.command('warmup')
+    def warmup_command():
+        """Прогріває застосунок і показує час кожного кроку"""
+        from planner.warmup import warmup
+
+        for name, (ms, result) in warmup(app).items():
+            print(f"{name:<10} {ms:>8} мс  {result}")
+
+    @app.cli.command('generate-data')
+    @click.option('--output', required=True, type=click.Path(dir_okay=False), help='Новий файл SQLite')
+    @click.option('--profile', type=click.Choice(list(DATASET_PROFILES)), default='small', show_default=True)
+    @click.option('--users', type=int, help='Звичайних користувачів (замість значення профілю)')
+    @click.option('--heavy-trips', type=int, help='Поїздок у важкого користувача, 0 — без нього')
+    @click.option('--seed', type=int, default=DEFAULT_SEED, show_default=True)
+    @click.option('--force', is_flag=True, help='Перезаписати наявний файл')
+    def generate_data_command(output, profile, users, heavy_trips, seed, force):
+        """Генерує детермінований синтетичний набір даних для тестів продуктивності"""
+        import time
+
+        from planner.dataset import describe, generate_dataset
+
+        settings = DATASET_PROFILES[profile]
+        if os.path.exists(output):
+            if not force:
+                raise click.ClickException(f"Файл {output} вже існує (--force, щоб перезаписати)")
+            os.remove(output)
+
+        started = time.perf_counter()
+        counts = generate_dataset(
+            output,
+            users=settings['users'] if users is None else users,
+            heavy_trips=settings['heavy_trips'] if heavy_trips is None else heavy_trips,
+            seed=seed,
+            progress=lambda done: click.echo(f"  користувачів: {done}", err=True),
+        )
+        click.echo(describe(counts, time.perf_counter() - started))
+        click.echo(f"Пароль усіх користувачів: {SYNTHETIC_PASSWORD}")
+
+    # Схему тут не оновлюємо: імпорт застосунку (flask, бенчмарки) не має писати в БД.
+    # Її створюють init-db, python app.py та gunicorn (on_starting у gunicorn.conf.py)
+    return app
@@ -0,0 +1,143 @@
+"""Система досягнень та рівні користувачів"""
+from planner.extensions import db
+from planner.models import Activity, Trip, UserAchievement
+
+
+# Система досягнень
+ACHIEVEMENTS = {
+    'first_trip': {
+        'name': 'Перша подорож',
+        'description': 'Створіть свою першу поїздку',
+        'icon': '🎉',
+        'color': '#48bb78'
+    },
+    'trips_5': {
+        'name': 'Мандрівник',
+        'description': 'Створіть 5 поїздок',
+        'icon': '🎒',
+        'color': '#4299e1'
+    },
+    'trips_10': {
+        'name': 'Досвідчений',
+        'description': 'Створіть 10 поїздок',
+        'icon': '✈️',
+        'color': '#9f7aea'
+    },
+    'trips_25': {
+        'name': 'Майстер подорожей',
+        'description': 'Створіть 25 поїздок',
+        'icon': '🌍',
+        'color': '#ed8936'
+    },
+    'countries_5': {
+        'name': 'Дослідник',
+        'description': 'Відвідайте 5 країн',
+        'icon': '🗺️',
+        'color': '#38b2ac'
+    },
+    'countries_10': {
+        'name': 'Глобус-троттер',
+        'description': 'Відвідайте 10 країн',
+        'icon': '🌎',
+        'color': '#f56565'
+    },
+    'budget_master': {
+        'name': 'Економний',
+        'description': 'Завершіть поїздку в межах бюджету',
+        'icon': '💰',
+        'color': '#48bb78'
+    },
+    'planner': {
+        'name': 'Планувальник',
+        'description': 'Додайте 50+ активностей',
+        'icon': '📋',
+        'color': '#667eea'
+    },
+    'year_summary': {
+        'name': 'Рік подорожей',
+        'description': 'Подорожуйте протягом року',
+        'icon': '🎊',
+        'color': '#f687b3'
+    }
+}
+
+
+def check_achievements(user_id):
+    """Перевіряє та розблоковує досягнення"""
+    trips = Trip.query.filter_by(user_id=user_id).all()
+
+    new_achievements = []
+
+    # Кількість поїздок
+    trips_count = len(trips)
+
+    achievements_to_check = [
+        ('first_trip', 1),
+        ('trips_5', 5),
+        ('trips_10', 10),
+        ('trips_25', 25)
+    ]
+
+    for achievement_key, required_count in achievements_to_check:
+        if trips_count >= required_count:
+            # Перевірка чи вже є це досягнення
+            existing = UserAchievement.query.filter_by(
+                user_id=user_id,
+                achievement_type=achievement_key
+            ).first()
+
+            if not existing:
+                new_achievement = UserAchievement(
+                    user_id=user_id,
+                    achievement_type=achievement_key
+                )
+                db.session.add(new_achievement)
+                new_achievements.append(ACHIEVEMENTS[achievement_key])
+
+    # Кількість країн
+    destinations = set([trip.destination for trip in trips])
+    countries_count = len(destinations)
+
+    if countries_count >= 5:
+        existing = UserAchievement.query.filter_by(user_id=user_id, achievement_type='countries_5').first()
+        if not existing:
+            new_achievement = UserAchievement(user_id=user_id, achievement_type='countries_5')
+            db.session.add(new_achievement)
+            new_achievements.append(ACHIEVEMENTS['countries_5'])
+
+    if countries_count >= 10:
+        existing = UserAchievement.query.filter_by(user_id=user_id, achievement_type='countries_10').first()
+        if not existing:
+            new_achievement = UserAchievement(user_id=user_id, achievement_type='countries_10')
+            db.session.add(new_achievement)
+            new_achievements.append(ACHIEVEMENTS['countries_10'])
+
+    # Кількість активностей
+    total_activities = Activity.query.join(Trip).filter(Trip.user_id == user_id).count()
+
+    if total_activities >= 50:
+        existing = UserAchievement.query.filter_by(user_id=user_id, achievement_type='planner').first()
+        if not existing:
+            new_achievement = UserAchievement(user_id=user_id, achievement_type='planner')
+            db.session.add(new_achievement)
+            new_achievements.append(ACHIEVEMENTS['planner'])
+
+    db.session.commit()
+
+    return new_achievements
+
+
+def get_user_level(user_id):
+    """Визначає рівень користувача"""
+    trips_count = Trip.query.filter_by(user_id=user_id).count()
+
+    if trips_count >= 25:
+        return {'level': 'Легенда', 'icon': '👑', 'color': '#f6ad55', 'next': None}
+    elif trips_count >= 10:
+        return {'level': 'Майстер', 'icon': '🌟', 'color': '#9f7aea', 'next': 25}
+    elif trips_count >= 5:
+        return {'level': 'Досвідчений', 'icon': '✨', 'color': '#4299e1', 'next': 10}
+    elif trips_count >= 1:
+        return {'level': 'Мандрівник', 'icon': '🎒', 'color': '#48bb78', 'next': 5}
+    else:
+        return {'level': 'Новачок', 'icon': '🌱', 'color': '#a0aec0', 'next': 1}
@@ -0,0 +1,290 @@
+"""Статичні ресурси: локальні копії бібліотек, мініфікація, відбитки, стиснення
+
+    flask --app app vendor-assets   # завантажити бібліотеки в static/vendor
+    flask --app app build-assets    # зібрати static/dist та маніфест
+
+Збірка мініфікує CSS/JS, додає до імені файлу хеш вмісту
+(css/style.3f2a9c1d.css), поруч кладе .gz та .br версії і записує маніфест
+static/dist/assets.json. Шаблони звертаються до ресурсів через
+asset_url('css/style.css'): із маніфестом це URL /assets/... з
+`Cache-Control: immutable`, без збірки — звичайний /static/..., а для ще не
+завантажених бібліотек — CDN, як і раніше.
+
+Brotli, rcssmin і rjsmin потрібні лише для збірки: без них відповідний
+крок пропускається.
+"""
+import gzip
+import hashlib
+import json
+import os
+import posixpath
+import re
+
+from flask import current_app, url_for
+
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'assets.json'
+
+# Пінені версії бібліотек: шлях у static/ → джерело
+VENDOR_FILES = {
+    'vendor/bootstrap-5.3.0/bootstrap.min.css':
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+    'vendor/bootstrap-5.3.0/bootstrap.bundle.min.js':
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js',
+    'vendor/bootstrap-icons-1.11.1/bootstrap-icons.css':
+        'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.1/font/bootstrap-icons.css',
+    'vendor/bootstrap-icons-1.11.1/fonts/bootstrap-icons.woff2':
+        'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.1/font/fonts/bootstrap-icons.woff2',
+    'vendor/bootstrap-icons-1.11.1/fonts/bootstrap-icons.woff':
+        'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.1/font/fonts/bootstrap-icons.woff',
+    'vendor/leaflet-1.9.4/leaflet.js': 'https://unpkg.com/leaflet@1.9.4/dist/leaflet.js',
+    'vendor/leaflet-1.9.4/leaflet.css': 'https://unpkg.com/leaflet@1.9.4/dist/leaflet.css',
+    'vendor/leaflet-1.9.4/images/layers.png': 'https://unpkg.com/leaflet@1.9.4/dist/images/layers.png',
+    'vendor/leaflet-1.9.4/images/layers-2x.png': 'https://unpkg.com/leaflet@1.9.4/dist/images/layers-2x.png',
+    'vendor/leaflet-1.9.4/images/marker-icon.png': 'https://unpkg.com/leaflet@1.9.4/dist/images/marker-icon.png',
+    'vendor/leaflet-1.9.4/images/marker-icon-2x.png':
+        'https://unpkg.com/leaflet@1.9.4/dist/images/marker-icon-2x.png',
+    'vendor/leaflet-1.9.4/images/marker-shadow.png':
+        'https://unpkg.com/leaflet@1.9.4/dist/images/marker-shadow.png',
+    'vendor/chart.js-3.9.1/chart.min.js': 'https://cdn.jsdelivr.net/npm/chart.js@3.9.1/dist/chart.min.js',
+    'vendor/sortablejs-1.15.0/Sortable.min.js': 'https://cdn.jsdelivr.net/npm/sortablejs@1.15.0/Sortable.min.js',
+    'vendor/marked-12.0.2/marked.min.js': 'https://cdn.jsdelivr.net/npm/marked@12.0.2/marked.min.js',
+}
+
+# Poppins з @fontsource (Google Fonts віддає різний CSS залежно від браузера)
+POPPINS_WEIGHTS = (300, 400, 500, 600, 700)
+POPPINS_SUBSETS = {
+    'latin': 'U+0000-00FF, U+0131, U+0152-0153, U+02BB-02BC, U+02C6, U+02DA, U+02DC, U+0304, U+0308, '
+             'U+0329, U+2000-206F, U+2074, U+20AC, U+2122, U+2191, U+2193, U+2212, U+2215, U+FEFF, U+FFFD',
+    'latin-ext': 'U+0100-02AF, U+0304, U+0308, U+0329, U+1E00-1E9F, U+1EF2-1EFF, U+2020, U+20A0-20AB, '
+                 'U+20AD-20C0, U+2113, U+2C60-2C7F, U+A720-A7FF',
+}
+POPPINS_DIR = 'vendor/poppins-5.0.8'
+POPPINS_CSS = POPPINS_DIR + '/poppins.css'
+
+for _subset in POPPINS_SUBSETS:
+    for _weight in POPPINS_WEIGHTS:
+        VENDOR_FILES[f'{POPPINS_DIR}/poppins-{_subset}-{_weight}-normal.woff2'] = (
+            f'https://cdn.jsdelivr.net/npm/@fontsource/poppins@5.0.8/files/poppins-{_subset}-{_weight}-normal.woff2'
+        )
+
+# Точки входу, на які посилаються шаблони, поки бібліотеки не завантажено
+CDN_FALLBACKS = {path: url for path, url in VENDOR_FILES.items() if path.endswith(('.css', '.js'))}
+CDN_FALLBACKS[POPPINS_CSS] = 'https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;500;600;700&display=swap'
+
+# Що не потрапляє у збірку: sw.js має фіксовану адресу, fonts/ — шрифти для PDF
+EXCLUDED_DIRS = (DIST_DIR, 'fonts')
+EXCLUDED_FILES = ('manifest.json', 'js/sw.js')
+
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json', '.txt', '.woff')
+# Файли, менші за цей розмір, не стискаємо: заголовки з'їдять виграш
+COMPRESS_MIN_BYTES = 512
+
+CSS_URL_RE = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+
+# ============= ЗАВАНТАЖЕННЯ БІБЛІОТЕК =============
+
+def poppins_css():
+    faces = []
+    for subset, unicode_range in POPPINS_SUBSETS.items():
+        for weight in POPPINS_WEIGHTS:
+            faces.append(
+                "@font-face{font-family:'Poppins';font-style:normal;font-display:swap;"
+                f"font-weight:{weight};src:url(poppins-{subset}-{weight}-normal.woff2) format('woff2');"
+                f"unicode-range:{unicode_range}}}"
+            )
+    return '\n'.join(faces) + '\n'
+
+
+def vendor_assets(static_folder, force=False):
+    """Завантажує бібліотеки в static/vendor; повертає (завантажено, [(файл, помилка)])"""
+    import requests
+
+    downloaded = 0
+    errors = []
+
+    for path, url in VENDOR_FILES.items():
+        target = os.path.join(static_folder, path)
+        if os.path.exists(target) and not force:
+            continue
+
+        try:
+            response = requests.get(url, timeout=30)
+            response.raise_for_status()
+        except Exception as e:
+            errors.append((path, str(e)))
+            continue
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(response.content)
+        downloaded += 1
+
+    # Без усіх шрифтів локальний poppins.css не пишемо: шаблони візьмуть Google Fonts
+    fonts = [path for path in VENDOR_FILES if path.startswith(POPPINS_DIR + '/')]
+    if all(os.path.exists(os.path.join(static_folder, path)) for path in fonts):
+        with open(os.path.join(static_folder, POPPINS_CSS), 'w', encoding='utf-8') as f:
+            f.write(poppins_css())
+
+    return downloaded, errors
+
+
+# ============= ЗБІРКА =============
+
+def minify_css(text):
+    try:
+        import rcssmin
+    except ImportError:
+        return text
+    return rcssmin.cssmin(text)
+
+
+def minify_js(text):
+    try:
+        import rjsmin
+    except ImportError:
+        return text
+    return rjsmin.jsmin(text)
+
+
+def fingerprinted(path, content):
+    root, ext = posixpath.splitext(path)
+    return f"{root}.{hashlib.md5(content).hexdigest()[:10]}{ext}"
+
+
+def rewrite_css_urls(path, text, manifest):
+    """Відносні url() у CSS замінює на зібрані імена файлів"""
+    base = posixpath.dirname(path)
+
+    def replace(match):
+        quote, url = match.groups()
+        if url.startswith(('data:', 'http:', 'https:', '//', '/', '#')):
+            return match.group(0)
+
+        target, hash_sep, fragment = url.partition('#')
+        target = target.partition('?')[0]
+        resolved = posixpath.normpath(posixpath.join(base, target))
+        if resolved not in manifest:
+            return match.group(0)
+
+        relative = posixpath.relpath(manifest[resolved], base)
+        # Хеш у назві файлу замінює ?v=... з оригінального CSS
+        return f"url({quote}{relative}{hash_sep}{fragment}{quote})"
+
+    return CSS_URL_RE.sub(replace, text)
+
+
+def compress(target, content):
+    """Пише .gz і .br поруч із файлом, якщо стиснення дає виграш"""
+    written = []
+
+    gz = gzip.compress(content, compresslevel=9, mtime=0)
+    if len(gz) < len(content):
+        with open(target + '.gz', 'wb') as f:
+            f.write(gz)
+        written.append('gz')
+
+    try:
+        import brotli
+    except ImportError:
+        return written
+
+    br = brotli.compress(content, quality=11)
+    if len(br) < len(content):
+        with open(target + '.br', 'wb') as f:
+            f.write(br)
+        written.append('br')
+
+    return written
+
+
+def source_files(static_folder):
+    """Файли static/ для збірки: спершу ресурси без посилань, потім CSS"""
+    paths = []
+    for root, dirs, files in os.walk(static_folder):
+        relative_root = os.path.relpath(root, static_folder).replace(os.sep, '/')
+        if relative_root == '.':
+            relative_root = ''
+            dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
+
+        for name in files:
+            path = posixpath.join(relative_root, name)
+            if path in EXCLUDED_FILES or name.endswith(('.py', '.pyc', '.gz', '.br')):
+                continue
+            paths.append(path)
+
+    # CSS посилається на шрифти й зображення, тому обробляється останнім
+    return sorted(paths, key=lambda path: (path.endswith('.css'), path))
+
+
+def build_assets(static_folder):
+    """Збирає static/dist; повертає (маніфест, статистика)
+
+    Старі зібрані файли не видаляються: сторінки, закешовані браузером чи
+    service worker-ом, ще можуть на них посилатися.
+    """
+    dist = os.path.join(static_folder, DIST_DIR)
+    manifest = {}
+    stats = {'files': 0, 'source_bytes': 0, 'minified_bytes': 0, 'gzip_bytes': 0, 'brotli_bytes': 0}
+
+    for path in source_files(static_folder):
+        with open(os.path.join(static_folder, path), 'rb') as f:
+            content = f.read()
+        stats['source_bytes'] += len(content)
+
+        if path.endswith('.css'):
+            text = content.decode('utf-8')
+            text = rewrite_css_urls(path, text if path.endswith('.min.css') else minify_css(text), manifest)
+            content = text.encode('utf-8')
+        elif path.endswith('.js') and not path.endswith('.min.js'):
+            content = minify_js(content.decode('utf-8')).encode('utf-8')
+
+        built = fingerprinted(path, content)
+        target = os.path.join(dist, built)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(content)
+
+        manifest[path] = built
+        stats['files'] += 1
+        stats['minified_bytes'] += len(content)
+
+        if path.endswith(COMPRESSIBLE) and len(content) >= COMPRESS_MIN_BYTES:
+            for encoding in compress(target, content):
+                key = 'gzip_bytes' if encoding == 'gz' else 'brotli_bytes'
+                stats[key] += os.path.getsize(f"{target}.{encoding}")
+
+    version = hashlib.md5(json.dumps(manifest, sort_keys=True).encode('utf-8')).hexdigest()[:10]
+    with open(os.path.join(dist, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump({'version': version, 'files': manifest}, f, indent=1, sort_keys=True)
+
+    return manifest, stats
+
+
+# ============= ВИКОРИСТАННЯ В ЗАСТОСУНКУ =============
+
+def load_manifest(static_folder):
+    try:
+        with open(os.path.join(static_folder, DIST_DIR, MANIFEST_NAME), encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {'version': '', 'files': {}}
+    return data
+
+
+def asset_url(path):
+    """URL ресурсу: зібраний файл з відбитком, локальний static або CDN"""
+    built = current_app.extensions['assets']['files'].get(path)
+    if built:
+        return url_for('assets.asset', filename=built)
+
+    if path in CDN_FALLBACKS and not os.path.exists(os.path.join(current_app.static_folder, path)):
+        return CDN_FALLBACKS[path]
+
+    return url_for('static', filename=path)
+
+
+def init_assets(app):
+    app.extensions['assets'] = load_manifest(app.static_folder)
+    app.jinja_env.globals['asset_url'] = asset_url
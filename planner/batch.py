@@ -0,0 +1,166 @@
+"""Пакетні зміни дочірніх записів однієї поїздки
+
+Клієнт надсилає список операцій:
+
+    {"op": "create", "entity": "packing_item", "data": {"name": "Паспорт"}}
+    {"op": "update", "entity": "activity", "id": 12, "data": {"completed": true}}
+    {"op": "delete", "entity": "trip_note", "id": 7}
+
+Спершу перевіряються всі операції разом: типи полів, належність записів
+поїздці, дати активностей. Якщо хоч одна некоректна, не застосовується жодна.
+Потім усе виконується в одній транзакції: на кожен тип запису один
+INSERT ... RETURNING, один executemany UPDATE та один DELETE.
+"""
+from collections import defaultdict
+
+from planner.extensions import db
+from planner.models import Activity, assign_activity_positions, touch_trip
+from planner.sync import READONLY_COLUMNS, SyncError, check_values, column_values, sync_models
+
+# Найбільше операцій в одному запиті
+BATCH_LIMIT = 500
+
+OPERATIONS = ('create', 'update', 'delete')
+
+
+def batch_models():
+    models = sync_models()
+    models.pop('trip')
+    return models
+
+
+def required_columns(model):
+    """Колонки, без яких запис не створити"""
+    return [
+        column.name for column in model.__table__.columns
+        if not column.nullable and not column.primary_key and column.name not in READONLY_COLUMNS
+        and column.default is None and column.server_default is None
+    ]
+
+
+def _parse(trip, index, operation, models, seen):
+    if not isinstance(operation, dict):
+        raise SyncError('Некоректна операція')
+
+    op = operation.get('op')
+    entity = operation.get('entity')
+    if op not in OPERATIONS:
+        raise SyncError('Невідома операція')
+    if entity not in models:
+        raise SyncError('Невідомий тип запису')
+
+    model = models[entity]
+    parsed = {'index': index, 'op': op, 'entity': entity, 'model': model, 'values': {}}
+
+    if op != 'create':
+        try:
+            parsed['id'] = int(operation.get('id'))
+        except (TypeError, ValueError):
+            raise SyncError('Не вказано id запису') from None
+        if (entity, parsed['id']) in seen:
+            raise SyncError('Запис змінюється кілька разів в одному пакеті')
+        seen.add((entity, parsed['id']))
+
+    if op != 'delete':
+        try:
+            values = column_values(model, operation.get('data') or {})
+        except (TypeError, ValueError) as e:
+            raise SyncError(str(e) if isinstance(e, SyncError) else 'Некоректні дані') from None
+
+        empty = [name for name in required_columns(model)
+                 if name in values and (values[name] is None or values[name] == '')]
+        if op == 'create':
+            empty += [name for name in required_columns(model) if name not in values]
+        if empty:
+            raise SyncError(f"Поле {empty[0]} обов'язкове")
+
+        check_values(trip, entity, values)
+        parsed['values'] = values
+
+    return parsed
+
+
+def validate_batch(trip, operations):
+    """Розбирає операції; повертає (parsed, errors) — errors містить index кожної помилки"""
+    models = batch_models()
+    parsed = []
+    errors = []
+    seen = set()
+
+    for index, operation in enumerate(operations):
+        try:
+            parsed.append(_parse(trip, index, operation, models, seen))
+        except SyncError as e:
+            errors.append({'index': index, 'error': str(e)})
+
+    # Записи для update/delete мають належати цій поїздці — один SELECT на тип
+    wanted = defaultdict(set)
+    for item in parsed:
+        if item['op'] != 'create':
+            wanted[item['model']].add(item['id'])
+
+    for model, ids in wanted.items():
+        found = set(db.session.scalars(
+            db.select(model.id).where(model.trip_id == trip.id, model.id.in_(ids))
+        ))
+        errors += [
+            {'index': item['index'], 'error': 'Запис не знайдено'}
+            for item in parsed if item['model'] is model and item['op'] != 'create' and item['id'] not in found
+        ]
+
+    return parsed, sorted(errors, key=lambda error: error['index'])
+
+
+def _insert_rows(trip, model, items):
+    rows = [dict(item['values'], trip_id=trip.id) for item in items]
+
+    if model is Activity:
+        assign_activity_positions(db.session.connection(), trip.id, rows)
+
+    # Один багаторядковий INSERT; sort_by_parameter_order — id у порядку рядків,
+    # незалежно від того, як база роздає ключі
+    return list(db.session.scalars(db.insert(model).returning(model.id, sort_by_parameter_order=True), rows))
+
+
+def _reposition_moved(trip, rows):
+    """Активність, перенесена на інший день, стає в кінець нового дня (як у формі редагування)"""
+    moved = [row for row in rows if 'date' in row and 'position' not in row]
+    if not moved:
+        return
+
+    days = dict(db.session.execute(
+        db.select(Activity.id, Activity.date).where(Activity.id.in_([row['id'] for row in moved]))
+    ).all())
+    assign_activity_positions(db.session.connection(), trip.id,
+                              [row for row in moved if row['date'].date() != days[row['id']].date()])
+
+
+def apply_batch(trip, parsed):
+    """Виконує перевірені операції однією транзакцією; повертає результати по операціях"""
+    groups = defaultdict(lambda: defaultdict(list))
+    for item in parsed:
+        groups[item['model']][item['op']].append(item)
+
+    for model, ops in groups.items():
+        if ops['delete']:
+            db.session.execute(
+                db.delete(model).where(model.id.in_([item['id'] for item in ops['delete']])),
+                execution_options={'synchronize_session': False},
+            )
+
+        if ops['update']:
+            rows = [dict(item['values'], id=item['id']) for item in ops['update'] if item['values']]
+            if model is Activity:
+                _reposition_moved(trip, rows)
+            if rows:
+                # UPDATE за первинним ключем; рядки з однаковим набором полів ідуть одним executemany
+                db.session.execute(db.update(model), rows)
+
+        if ops['create']:
+            for item, new_id in zip(ops['create'], _insert_rows(trip, model, ops['create'])):
+                item['id'] = new_id
+
+    touch_trip(trip.id)
+    db.session.commit()
+
+    return [{'index': item['index'], 'op': item['op'], 'entity': item['entity'], 'id': item['id']} for item in parsed]
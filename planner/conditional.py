@@ -0,0 +1,92 @@
+"""Умовні GET-запити (ETag / Last-Modified) для сторінок поїздки
+
+Версія поїздки (Trip.version) змінюється при будь-якій зміні поїздки або її
+дочірніх записів, тому порівняння ETag з If-None-Match потребує лише одного
+запиту за (власник, версія, час зміни) — без завантаження активностей і без
+рендерингу шаблону. Якщо нічого не змінилось, відповідь — 304.
+"""
+import hashlib
+import os
+from datetime import date
+from functools import wraps
+
+from flask import current_app, make_response, request, session
+from flask_login import current_user
+from werkzeug.http import is_resource_modified
+
+from planner.extensions import db
+from planner.metrics import count_cache
+from planner.models import Trip
+
+
+def build_fingerprint(app):
+    """Відбиток коду та шаблонів: після деплою старі ETag стають недійсними"""
+    fingerprint = app.extensions.get('etag_build')
+
+    if fingerprint is None:
+        latest = 0.0
+        for directory in (app.template_folder and os.path.join(app.root_path, app.template_folder),
+                          os.path.dirname(os.path.abspath(__file__))):
+            for root, _, files in os.walk(directory or ''):
+                for name in files:
+                    if name.endswith(('.html', '.py')):
+                        latest = max(latest, os.path.getmtime(os.path.join(root, name)))
+
+        # Нова збірка ресурсів змінює URL стилів і скриптів у сторінках
+        assets_version = app.extensions.get('assets', {}).get('version', '')
+        fingerprint = app.extensions['etag_build'] = f"{int(latest):x}{assets_version}"
+
+    return fingerprint
+
+
+def trip_etag(endpoint, trip_id, version, extra=''):
+    # Сторінки показують "днів до поїздки" тощо — тому день теж входить у ключ
+    raw = '|'.join(str(part) for part in (
+        build_fingerprint(current_app), endpoint, trip_id, version,
+        current_user.id, current_user.username, date.today().isoformat(), extra
+    ))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:20]
+
+
+def conditional_trip_page(view=None, extra=None):
+    """Відповідає 304, якщо сторінка поїздки не змінилась з попереднього запиту
+
+    extra — функція без аргументів, що повертає додаткову частину ключа
+    (наприклад, година для сторінки з прогнозом погоди).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(trip_id, *args, **kwargs):
+            # Непоказані flash-повідомлення мають потрапити на сторінку
+            if request.method != 'GET' or session.get('_flashes'):
+                return view(trip_id, *args, **kwargs)
+
+            row = db.session.query(Trip.user_id, Trip.version, Trip.updated_at, Trip.created_at) \
+                .filter(Trip.id == trip_id).first()
+
+            # Відсутню чи чужу поїздку обробляє сам view (404 / редірект)
+            if row is None or row.user_id != current_user.id:
+                return view(trip_id, *args, **kwargs)
+
+            etag = trip_etag(request.endpoint, trip_id, row.version, extra() if extra else '')
+            last_modified = (row.updated_at or row.created_at).replace(microsecond=0)
+
+            if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+                count_cache(f'page_{view.__name__}', 'hit')
+                response = current_app.response_class(status=304)
+            else:
+                count_cache(f'page_{view.__name__}', 'miss')
+                response = make_response(view(trip_id, *args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            response.last_modified = last_modified
+            # Кожен перехід перевіряє актуальність, але без повного рендерингу
+            response.headers['Cache-Control'] = 'private, no-cache'
+            response.vary.add('Cookie')
+            return response
+
+        return wrapper
+
+    return decorator(view) if view is not None else decorator
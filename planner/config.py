@@ -0,0 +1,84 @@
+"""Налаштування додатку та ліміти підсистем (зі змінних середовища)"""
+import os
+from datetime import timedelta
+
+from dotenv import load_dotenv
+
+# Завантажуємо змінні середовища
+load_dotenv()
+
+# API ключі
+OPENWEATHER_API_KEY = os.getenv('OPENWEATHER_API_KEY', '')
+WEATHER_ENABLED = os.getenv('WEATHER_ENABLED', 'True') == 'True'
+
+# Ліміти AI асистента (спільні для всіх воркерів gunicorn)
+AI_MAX_IN_FLIGHT = int(os.getenv('AI_MAX_IN_FLIGHT', '4'))  # одночасних викликів моделі
+AI_MAX_QUEUE = int(os.getenv('AI_MAX_QUEUE', '8'))  # запитів, що чекають на вільний слот
+AI_QUEUE_TIMEOUT = float(os.getenv('AI_QUEUE_TIMEOUT', '5'))  # секунд очікування в черзі
+AI_RATE_PER_MINUTE = float(os.getenv('AI_RATE_PER_MINUTE', '6'))  # запитів на користувача
+AI_RATE_BURST = int(os.getenv('AI_RATE_BURST', '10'))
+
+# Кеш відповідей AI асистента
+AI_CACHE_ENABLED = os.getenv('AI_CACHE_ENABLED', 'True') == 'True'
+AI_CACHE_TTL = int(os.getenv('AI_CACHE_TTL', str(24 * 3600)))  # секунд
+AI_CACHE_MAX_ENTRIES = int(os.getenv('AI_CACHE_MAX_ENTRIES', '5000'))
+# Додаткові регулярні вирази (через ';;'): збіг — запит не кешується
+AI_CACHE_DENY = [p for p in os.getenv('AI_CACHE_DENY', '').split(';;') if p.strip()]
+
+# Максимальний розмір контексту поїздки, що додається до запиту (токенів)
+AI_CONTEXT_TOKENS = int(os.getenv('AI_CONTEXT_TOKENS', '800'))
+
+# Пам'ять розмов з асистентом
+AI_MEMORY_MAX_CONVERSATIONS = int(os.getenv('AI_MEMORY_MAX_CONVERSATIONS', '50'))  # на користувача
+AI_MEMORY_MAX_MESSAGES = int(os.getenv('AI_MEMORY_MAX_MESSAGES', '200'))  # на розмову
+AI_MEMORY_MAX_AGE_DAYS = int(os.getenv('AI_MEMORY_MAX_AGE_DAYS', '90'))
+AI_MEMORY_SUMMARY = os.getenv('AI_MEMORY_SUMMARY', 'llm')  # llm або extractive
+
+# Фонові завдання AI (генерація плану поїздки)
+AI_JOB_WORKERS = int(os.getenv('AI_JOB_WORKERS', '2'))  # потоків на процес
+AI_JOB_TIMEOUT = int(os.getenv('AI_JOB_TIMEOUT', '600'))  # секунд без оновлення до позначки failed
+AI_JOB_RETRIES = max(1, int(os.getenv('AI_JOB_RETRIES', '5')))  # спроб отримати слот шлюзу (щонайменше одна)
+
+# Хешування паролів (формат werkzeug: pbkdf2:sha256:600000, scrypt:32768:8:1)
+PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'pbkdf2:sha256')
+PASSWORD_VERIFY_WORKERS = int(os.getenv('PASSWORD_VERIFY_WORKERS', '2'))  # потоків хешування на процес
+PASSWORD_VERIFY_QUEUE = int(os.getenv('PASSWORD_VERIFY_QUEUE', '16'))  # перевірок, що чекають на потік
+PASSWORD_VERIFY_TIMEOUT = float(os.getenv('PASSWORD_VERIFY_TIMEOUT', '10'))  # секунд
+
+
+class Config:
+    SECRET_KEY = 'dev-secret-key-travel-planner-2026'
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///travel_planner.db'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SESSION_COOKIE_SECURE = False
+    SESSION_COOKIE_HTTPONLY = True
+    SESSION_COOKIE_SAMESITE = 'Lax'
+    PERMANENT_SESSION_LIFETIME = timedelta(days=7)
+    REMEMBER_COOKIE_DURATION = timedelta(days=30)
+
+    # Кеш байткоду шаблонів (за замовчуванням instance/jinja_cache)
+    JINJA_BYTECODE_CACHE = os.getenv('JINJA_BYTECODE_CACHE', 'True') == 'True'
+    JINJA_BYTECODE_CACHE_DIR = os.getenv('JINJA_BYTECODE_CACHE_DIR')
+
+    # Кеш фрагментів шаблонів ({% cache %}): memory | sqlite | none
+    FRAGMENT_CACHE = os.getenv('FRAGMENT_CACHE', 'memory')
+    FRAGMENT_CACHE_TTL = int(os.getenv('FRAGMENT_CACHE_TTL', '3600'))
+    FRAGMENT_CACHE_SIZE = int(os.getenv('FRAGMENT_CACHE_SIZE', '512'))
+
+    # Кеш знімків користувача для Flask-Login (секунд; 0 — вимкнено)
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', '60'))
+    USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', '1024'))
+
+    # Вимірювання запитів: Server-Timing і журнал повільних запитів (instance/slow_requests.log)
+    PERF_INSTRUMENTATION = os.getenv('PERF_INSTRUMENTATION', 'True') == 'True'
+    SERVER_TIMING = os.getenv('SERVER_TIMING', 'True') == 'True'
+    SLOW_REQUEST_MS = float(os.getenv('SLOW_REQUEST_MS', '500'))
+    SLOW_REQUEST_LOG = os.getenv('SLOW_REQUEST_LOG')
+    SLOW_REQUEST_LOG_BYTES = int(os.getenv('SLOW_REQUEST_LOG_BYTES', str(1024 * 1024)))
+    PERF_N_PLUS_ONE = int(os.getenv('PERF_N_PLUS_ONE', '5'))  # однакових SQL за запит — підозра на N+1
+
+    # Метрики Prometheus (/metrics), спільні для всіх воркерів через instance/metrics.db
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True') == 'True'
+    METRICS_DB = os.getenv('METRICS_DB')
+    METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', '2'))  # секунд
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')  # без токена /metrics доступний лише з localhost
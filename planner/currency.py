@@ -0,0 +1,113 @@
+"""Курси та конвертація валют"""
+import time
+
+from planner.instrumentation import external_call
+from planner.metrics import count_cache
+
+# Курси валют (статичні для MVP, можна підключити API)
+CURRENCY_RATES = {
+    'UAH': 1.0,
+    'USD': 42.5,
+    'EUR': 50.0,
+    'PLN': 10.5,
+    'GBP': 52.0,
+    'CHF': 48.0,
+    'CZK': 1.8,
+}
+
+CURRENCY_SYMBOLS = {
+    'UAH': '₴',
+    'USD': '$',
+    'EUR': '€',
+    'PLN': 'zł',
+    'GBP': '£',
+    'CHF': '₣',
+    'CZK': 'Kč',
+}
+
+
+# Кеш актуальних курсів (секунд)
+RATES_TTL = 3600
+RATES_RETRY_AFTER = 60
+
+_rates_cache = {'rates': None, 'fetched_at': 0.0, 'failed_at': float('-inf')}
+
+
+def convert_to_uah(amount, from_currency):
+    """Конвертує суму з вказаної валюти в гривні"""
+    if from_currency not in CURRENCY_RATES:
+        return amount
+    return amount * CURRENCY_RATES[from_currency]
+
+
+def convert_from_uah(amount, to_currency):
+    """Конвертує суму з гривень у вказану валюту"""
+    if to_currency not in CURRENCY_RATES:
+        return amount
+    return amount / CURRENCY_RATES[to_currency]
+
+
+def format_currency(amount, currency):
+    """Форматує суму з символом валюти"""
+    symbol = CURRENCY_SYMBOLS.get(currency, currency)
+    return f"{amount:.2f} {symbol}"
+
+
+def fetch_exchange_rates():
+    """Отримує актуальні курси валют з ПриватБанку"""
+    import requests
+
+    try:
+        url = "https://api.privatbank.ua/p24api/pubinfo?exchange&coursid=5"
+        with external_call('privatbank') as call:
+            response = requests.get(url, timeout=5)
+            call.ok = response.ok
+
+        if response.status_code == 200:
+            data = response.json()
+
+            rates = {'UAH': 1.0}
+
+            for item in data:
+                if item['ccy'] in ['USD', 'EUR']:
+                    # Беремо курс продажу
+                    rates[item['ccy']] = float(item['sale'])
+
+            # Додаємо інші валюти через USD
+            if 'USD' in rates:
+                rates['PLN'] = rates['USD'] / 4.0  # Приблизно
+                rates['GBP'] = rates['USD'] * 1.27
+                rates['CHF'] = rates['USD'] * 1.1
+                rates['CZK'] = rates['USD'] / 23
+
+            return rates
+
+        return None
+
+    except Exception as e:
+        print(f"Помилка отримання курсів: {e}")
+        return None
+
+
+def get_live_exchange_rates():
+    """Курси з кешем у пам'яті процесу: не частіше одного запиту на RATES_TTL"""
+    now = time.monotonic()
+    cached = _rates_cache['rates']
+
+    if cached is not None and now - _rates_cache['fetched_at'] < RATES_TTL:
+        count_cache('rates', 'hit')
+        return cached
+
+    # Після невдалої спроби не блокуємо кожен запит таймаутом API
+    if now - _rates_cache['failed_at'] < RATES_RETRY_AFTER:
+        count_cache('rates', 'stale')
+        return cached
+
+    count_cache('rates', 'miss')
+    rates = fetch_exchange_rates()
+    if rates:
+        _rates_cache.update(rates=rates, fetched_at=now)
+        return rates
+
+    _rates_cache['failed_at'] = now
+    return cached
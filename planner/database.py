@@ -0,0 +1,89 @@
+"""Створення та оновлення схеми бази даних"""
+from planner.extensions import db
+
+
+# Нові колонки для вже існуючої бази (db.create_all не змінює наявні таблиці)
+SCHEMA_UPGRADES = [
+    ('trip', 'version', "INTEGER NOT NULL DEFAULT 1"),
+    ('trip', 'updated_at', "DATETIME"),
+    ('user', 'data_version', "INTEGER NOT NULL DEFAULT 1"),
+    ('activity', 'position', "INTEGER NOT NULL DEFAULT 0"),
+    ('trip_template', 'activity_count', "INTEGER NOT NULL DEFAULT 0"),
+    ('trip_template', 'item_count', "INTEGER NOT NULL DEFAULT 0"),
+    ('trip_template', 'use_count', "INTEGER NOT NULL DEFAULT 0"),
+    ('trip_template', 'rating_sum', "INTEGER NOT NULL DEFAULT 0"),
+    ('trip_template', 'rating_count', "INTEGER NOT NULL DEFAULT 0"),
+    ('trip_template', 'popularity', "FLOAT NOT NULL DEFAULT 0"),
+]
+
+
+def upgrade_schema():
+    """Додає відсутні колонки та індекси в існуючі таблиці"""
+    inspector = db.inspect(db.engine)
+    tables = set(inspector.get_table_names())
+
+    with db.engine.begin() as conn:
+        for table, column, ddl in SCHEMA_UPGRADES:
+            if table not in tables:
+                continue
+            columns = {c['name'] for c in inspector.get_columns(table)}
+            if column not in columns:
+                conn.execute(db.text(f'ALTER TABLE "{table}" ADD COLUMN "{column}" {ddl}'))
+
+        # Індекси з __table_args__, яких ще немає в існуючих таблицях
+        for table in db.metadata.sorted_tables:
+            if table.name in tables:
+                for index in table.indexes:
+                    index.create(conn, checkfirst=True)
+
+
+def migrate_template_items():
+    """Переносить JSON-поля шаблонів у дочірні таблиці (для кожного шаблону один раз)"""
+    from planner.models import TripTemplate
+    from planner.trip_templates import load_items, store_template_items
+
+    legacy = TripTemplate.query.filter(db.or_(
+        TripTemplate.activities_template.isnot(None), TripTemplate.packing_template.isnot(None)
+    )).all()
+
+    for template in legacy:
+        store_template_items(template, load_items(template.activities_template),
+                             load_items(template.packing_template))
+        template.activities_template = None
+        template.packing_template = None
+
+    if legacy:
+        db.session.commit()
+
+
+def shift_activity_positions(conn):
+    """Ручний порядок активностей тепер нумерується з 1, а не з 0
+
+    Раніше 0 означало і "перша після ручного впорядкування", і "день не
+    впорядковували". Впорядковані дні (є ненульова позиція) зсуваємо на 1.
+    """
+    conn.execute(db.text(
+        'UPDATE activity SET position = position + 1 WHERE (trip_id, date(date)) IN ('
+        'SELECT trip_id, date(date) FROM activity GROUP BY trip_id, date(date) HAVING MAX(position) > 0)'
+    ))
+
+
+# Разові перетворення даних; кількість виконаних зберігається в PRAGMA user_version
+DATA_MIGRATIONS = (shift_activity_positions,)
+
+
+def migrate_data():
+    with db.engine.begin() as conn:
+        done = conn.exec_driver_sql('PRAGMA user_version').scalar()
+        for migration in DATA_MIGRATIONS[done:]:
+            migration(conn)
+        if done < len(DATA_MIGRATIONS):
+            conn.exec_driver_sql(f'PRAGMA user_version = {len(DATA_MIGRATIONS)}')
+
+
+def init_db():
+    """Створює таблиці та доповнює схему існуючої бази"""
+    db.create_all()
+    upgrade_schema()
+    migrate_template_items()
+    migrate_data()
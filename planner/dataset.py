@@ -0,0 +1,409 @@
+"""Синтетичні дані для тестів продуктивності
+
+    flask --app app generate-data --output instance/datasets/large.db --profile large
+    flask --app app generate-data --output /tmp/heavy.db --users 0 --heavy-trips 1000
+
+Той самий seed і ті самі параметри дають ті самі рядки (відрізняється
+лише сіль хешу пароля): усі дати відраховуються від фіксованої BASE_DATE,
+а не від поточного часу.
+Розподіли наближені до реальних: кількість поїздок на користувача має
+довгий хвіст (Парето), тривалість і кількість активностей — зсунуті до
+коротких поїздок, валюти — переважно UAH/EUR/USD, назви українською та
+англійською. Окремий "важкий" користувач (--heavy-trips) має задану
+кількість поїздок по HEAVY_ACTIVITIES активностей.
+
+Рядки пишуться в новий файл SQLite напряму через executemany з кортежами
+і явними id (без ORM, слухачів сесії та RETURNING), тож ~10 млн рядків
+(профіль large) будуються за кілька хвилин. Слухачі версій і change_log
+при цьому не спрацьовують — це знімок "як після міграції".
+
+dataset_path(profile) — фікстура для бенчмарків: будує файл при першому
+виклику і далі повертає готовий з instance/datasets/.
+"""
+import os
+import random
+import sqlite3
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+
+from planner.database import DATA_MIGRATIONS
+from planner.extensions import db
+from planner.passwords import hash_password
+
+# Змінюється разом з генератором: старі файли фікстур перебудовуються
+DATASET_VERSION = 2
+
+DEFAULT_SEED = 42
+BASE_DATE = datetime(2026, 1, 1)
+# Пароль усіх згенерованих користувачів (хеш рахується один раз)
+SYNTHETIC_PASSWORD = 'travel-planner'
+HEAVY_ACTIVITIES = 50
+
+# Профілі: users — звичайні користувачі, heavy_trips — поїздок у важкого користувача (0 — без нього)
+PROFILES = {
+    'small': {'users': 50, 'heavy_trips': 0},
+    'heavy-user': {'users': 20, 'heavy_trips': 1000},
+    'medium': {'users': 2000, 'heavy_trips': 1000},
+    'large': {'users': 70000, 'heavy_trips': 1000},
+}
+
+# Скільки рядків накопичувати перед executemany
+CHUNK_ROWS = 50000
+
+# ============= СЛОВНИКИ =============
+
+PLACES = (
+    # (місто, країна, валюта)
+    ('Київ', 'Україна', 'UAH'), ('Львів', 'Україна', 'UAH'), ('Одеса', 'Україна', 'UAH'),
+    ('Яремче', 'Україна', 'UAH'), ('Ужгород', 'Україна', 'UAH'), ('Чернівці', 'Україна', 'UAH'),
+    ('Kraków', 'Poland', 'PLN'), ('Warszawa', 'Poland', 'PLN'), ('Gdańsk', 'Poland', 'PLN'),
+    ('Praha', 'Czech Republic', 'CZK'), ('Wien', 'Austria', 'EUR'), ('Berlin', 'Germany', 'EUR'),
+    ('Paris', 'France', 'EUR'), ('Barcelona', 'Spain', 'EUR'), ('Roma', 'Italy', 'EUR'),
+    ('Lisboa', 'Portugal', 'EUR'), ('Amsterdam', 'Netherlands', 'EUR'), ('Budapest', 'Hungary', 'EUR'),
+    ('Zürich', 'Switzerland', 'CHF'), ('London', 'United Kingdom', 'GBP'), ('Edinburgh', 'United Kingdom', 'GBP'),
+    ('New York', 'United States', 'USD'), ('Istanbul', 'Turkey', 'USD'), ('Tbilisi', 'Georgia', 'USD'),
+    ('Tokyo', 'Japan', 'USD'), ('Bangkok', 'Thailand', 'USD'), ('Dubai', 'United Arab Emirates', 'USD'),
+)
+# Ближчі напрямки популярніші: вага спадає за індексом
+PLACE_WEIGHTS = tuple(1 / (index + 3) for index in range(len(PLACES)))
+
+CURRENCIES = ('UAH', 'EUR', 'USD', 'PLN', 'GBP', 'CHF', 'CZK')
+CURRENCY_WEIGHTS = (50, 22, 15, 7, 3, 2, 1)
+
+FIRST_NAMES = ('olena', 'andrii', 'iryna', 'taras', 'oksana', 'dmytro', 'kateryna', 'bohdan',
+               'anna', 'maksym', 'sofia', 'john', 'emma', 'oliver', 'mia', 'lucas')
+
+TRIP_TITLES = ('Відпустка в {city}', 'Вихідні: {city}', 'Відрядження до {city}', '{city} з друзями',
+               'Trip to {city}', 'Weekend in {city}', '{city} getaway', 'Сімейна подорож — {city}')
+
+ACTIVITIES = {
+    'general': ('Прогулянка центром', 'Огляд старого міста', 'Walking tour', 'Free time'),
+    'food': ('Сніданок у кав\'ярні', 'Вечеря в ресторані', 'Street food tour', 'Дегустація вин', 'Lunch'),
+    'activity': ('Музей', 'Екскурсія', 'Museum visit', 'Boat trip', 'Похід у гори', 'Концерт'),
+    'transport': ('Трансфер з аеропорту', 'Поїзд', 'Taxi to hotel', 'Оренда авто'),
+    'shopping': ('Ринок', 'Сувеніри', 'Shopping mall', 'Outlet'),
+    'accommodation': ('Заселення', 'Check-out', 'Виселення з готелю'),
+}
+ACTIVITY_CATEGORIES = tuple(ACTIVITIES)
+ACTIVITY_WEIGHTS = (25, 25, 30, 8, 8, 4)
+
+PACKING = {
+    'clothes': ('Футболки', 'Светр', 'Jacket', 'Шкарпетки', 'Кросівки', 'Swimsuit', 'Дощовик'),
+    'toiletries': ('Зубна щітка', 'Шампунь', 'Sunscreen', 'Дезодорант', 'Аптечка'),
+    'electronics': ('Зарядка', 'Power bank', 'Навушники', 'Адаптер для розетки', 'Camera'),
+    'documents': ('Паспорт', 'Страховка', 'Квитки', 'Booking confirmation', 'Водійське посвідчення'),
+    'other': ('Книга', 'Пляшка для води', 'Umbrella', 'Подушка для подорожей'),
+}
+PACKING_CATEGORIES = tuple(PACKING)
+
+HOTELS = ('Hotel {city}', 'Apartments {city} Center', 'Хостел "{city}"', 'Grand {city}', 'Guest house')
+TRANSPORT_TYPES = ('plane', 'train', 'bus', 'car', 'ferry')
+TRANSPORT_WEIGHTS = (40, 30, 20, 8, 2)
+CARRIERS = {'plane': ('МАУ', 'LOT', 'Wizz Air', 'Ryanair'), 'train': ('Укрзалізниця', 'PKP Intercity', 'ÖBB'),
+            'bus': ('FlixBus', 'Regiojet', 'Ecolines'), 'car': ('',), 'ferry': ('DFDS',)}
+NOTE_CATEGORIES = ('Загальне', 'Важливе', 'Контакти', 'Посилання')
+CHECKLIST = {
+    'Документи': ('Перевірити паспорт', 'Оформити страховку', 'Visa check'),
+    'Бронювання': ('Забронювати готель', 'Купити квитки', 'Book a table'),
+    'Підготовка': ('Обміняти валюту', 'Завантажити офлайн-карти', 'Pack the bags'),
+    'Інше': ('Полити квіти', 'Попросити сусідів забрати пошту'),
+}
+DESTINATION_TYPES = ('Пляж', 'Гори', 'Місто', 'Природа', 'Культура')
+
+# ============= ТАБЛИЦІ =============
+
+# Порядок колонок у кортежах, які повертає генератор
+COLUMNS = {
+    'user': ('id', 'username', 'email', 'password', 'created_at', 'data_version'),
+    'trip': ('id', 'title', 'destination', 'start_date', 'end_date', 'budget', 'currency', 'created_at',
+             'version', 'updated_at', 'user_id'),
+    'activity': ('id', 'title', 'description', 'date', 'time', 'location', 'cost', 'category', 'completed',
+                 'position', 'created_at', 'trip_id'),
+    'packing_item': ('id', 'name', 'category', 'quantity', 'is_packed', 'created_at', 'trip_id'),
+    'accommodation': ('id', 'name', 'address', 'check_in', 'check_out', 'price_per_night', 'total_price',
+                      'booking_reference', 'rating', 'booking_status', 'created_at', 'trip_id'),
+    'transport': ('id', 'trip_id', 'type', 'from_location', 'to_location', 'departure_date', 'arrival_date',
+                  'carrier', 'cost', 'created_at'),
+    'trip_note': ('id', 'title', 'content', 'category', 'is_pinned', 'trip_id', 'created_at', 'updated_at'),
+    'trip_checklist': ('id', 'item', 'category', 'is_completed', 'due_date', 'trip_id', 'created_at'),
+    'trip_destination': ('id', 'trip_id', 'city', 'country', 'arrival_date', 'departure_date', 'order',
+                         'created_at'),
+    'visited_country': ('id', 'user_id', 'country_name', 'status', 'visit_date', 'created_at'),
+    'trip_template': ('id', 'name', 'description', 'destination_type', 'duration_days', 'budget_estimate',
+                      'currency', 'is_public', 'user_id', 'created_at', 'activity_count', 'item_count',
+                      'use_count', 'rating_sum', 'rating_count', 'popularity'),
+    'template_activity': ('id', 'template_id', 'position', 'day', 'title', 'category', 'location', 'time', 'cost'),
+    'template_packing_item': ('id', 'template_id', 'position', 'name', 'category', 'quantity'),
+    'template_rating': ('id', 'template_id', 'user_id', 'rating', 'created_at'),
+}
+
+
+def _timestamp(value):
+    """Формат, у якому SQLAlchemy зберігає DateTime у SQLite"""
+    return f'{value:%Y-%m-%d %H:%M:%S}.000000'
+
+
+def _day(value):
+    return f'{value:%Y-%m-%d}'
+
+
+class DatasetWriter:
+    """Буфери рядків за таблицями; лічильники id для кожної таблиці"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = {table: [] for table in COLUMNS}
+        self.counts = dict.fromkeys(COLUMNS, 0)
+        self._pending = 0
+        self._sql = {
+            table: 'INSERT INTO "{}" ({}) VALUES ({})'.format(
+                table, ', '.join(f'"{column}"' for column in columns), ', '.join('?' * len(columns)))
+            for table, columns in COLUMNS.items()
+        }
+
+    def next_id(self, table):
+        self.counts[table] += 1
+        return self.counts[table]
+
+    def add(self, table, row):
+        self.rows[table].append(row)
+        self._pending += 1
+        if self._pending >= CHUNK_ROWS:
+            self.flush()
+
+    def flush(self):
+        # Батьківські таблиці першими (порядок COLUMNS), на випадок увімкнених foreign_keys
+        for table, rows in self.rows.items():
+            if rows:
+                self.conn.executemany(self._sql[table], rows)
+                rows.clear()
+        self._pending = 0
+
+
+# ============= ГЕНЕРАЦІЯ =============
+
+def trip_count(rng):
+    """Поїздок у користувача: більшість 1-5, довгий хвіст до сотень"""
+    return min(int(rng.paretovariate(1.3)), 300)
+
+
+def write_trip(rng, out, user_id, activities_per_trip=None):
+    trip_id = out.next_id('trip')
+    city, country, local_currency = rng.choices(PLACES, PLACE_WEIGHTS)[0]
+    currency = local_currency if rng.random() < 0.3 else rng.choices(CURRENCIES, CURRENCY_WEIGHTS)[0]
+
+    # Поїздки розкидані на ±3 роки навколо BASE_DATE, старіші створено раніше
+    start = BASE_DATE + timedelta(days=rng.randint(-3 * 365, 365))
+    days = min(int(rng.lognormvariate(1.4, 0.6)) + 1, 30)
+    end = start + timedelta(days=days - 1)
+    created = _timestamp(start - timedelta(days=rng.randint(1, 120), minutes=rng.randint(0, 1439)))
+    budget = round(rng.lognormvariate(9, 0.8), -1) if rng.random() < 0.8 else 0
+    day_stamps = [_timestamp(start + timedelta(days=day)) for day in range(days)]
+
+    out.add('trip', (trip_id, rng.choice(TRIP_TITLES).format(city=city), f'{city}, {country}',
+                     day_stamps[0], day_stamps[-1], budget, currency, created, 1, created, user_id))
+
+    if activities_per_trip is None:
+        activities_per_trip = sum(rng.randint(0, 5) for _ in range(days))
+    for _ in range(activities_per_trip):
+        category = rng.choices(ACTIVITY_CATEGORIES, ACTIVITY_WEIGHTS)[0]
+        out.add('activity', (
+            out.next_id('activity'), rng.choice(ACTIVITIES[category]), None, rng.choice(day_stamps),
+            f'{rng.randint(7, 22):02d}:{rng.choice((0, 15, 30, 45)):02d}' if rng.random() < 0.8 else None,
+            city if rng.random() < 0.5 else None,
+            round(rng.expovariate(1 / 400)) if rng.random() < 0.6 else 0,
+            category, rng.random() < 0.3, 0, created, trip_id,
+        ))
+
+    for _ in range(rng.randint(0, 35)):
+        category = rng.choice(PACKING_CATEGORIES)
+        out.add('packing_item', (out.next_id('packing_item'), rng.choice(PACKING[category]), category,
+                                 rng.randint(1, 4) if category == 'clothes' else 1, rng.random() < 0.4,
+                                 created, trip_id))
+
+    nights = max(days - 1, 1)
+    for _ in range(rng.choices((0, 1, 2, 3), (20, 55, 18, 7))[0]):
+        price = round(rng.lognormvariate(7, 0.6))
+        out.add('accommodation', (out.next_id('accommodation'), rng.choice(HOTELS).format(city=city), city,
+                                  day_stamps[0], day_stamps[-1], price, price * nights,
+                                  f'BK{rng.randint(100000, 999999)}' if rng.random() < 0.6 else None,
+                                  rng.randint(0, 5), rng.choice(('pending', 'confirmed', 'confirmed', 'cancelled')),
+                                  created, trip_id))
+
+    for leg in range(rng.choices((0, 1, 2, 4), (15, 20, 55, 10))[0]):
+        kind = rng.choices(TRANSPORT_TYPES, TRANSPORT_WEIGHTS)[0]
+        there = leg % 2 == 0
+        departure = start if there else end
+        out.add('transport', (out.next_id('transport'), trip_id, kind,
+                              'Київ' if there else city, city if there else 'Київ',
+                              _timestamp(departure + timedelta(hours=rng.randint(5, 22))),
+                              _timestamp(departure + timedelta(hours=23)), rng.choice(CARRIERS[kind]),
+                              round(rng.lognormvariate(7.5, 0.7)), created))
+
+    for _ in range(rng.choices((0, 1, 2, 5), (50, 25, 15, 10))[0]):
+        out.add('trip_note', (out.next_id('trip_note'), rng.choice(('Контакти', 'Адреса', 'Ideas', 'Важливо')),
+                              f'Нотатка до поїздки {city}', rng.choice(NOTE_CATEGORIES), rng.random() < 0.1,
+                              trip_id, created, created))
+
+    for _ in range(rng.choices((0, 3, 6, 10), (40, 30, 20, 10))[0]):
+        category = rng.choice(tuple(CHECKLIST))
+        out.add('trip_checklist', (out.next_id('trip_checklist'), rng.choice(CHECKLIST[category]), category,
+                                   rng.random() < 0.5, _day(start - timedelta(days=rng.randint(1, 30))),
+                                   trip_id, created))
+
+    stops = rng.choices((1, 2, 3, 4), (60, 25, 10, 5))[0]
+    for order in range(stops):
+        stop_city, stop_country, _ = (city, country, None) if order == 0 else rng.choice(PLACES)
+        first = start + timedelta(days=order * days // stops)
+        last = start + timedelta(days=(order + 1) * days // stops - 1) if days >= stops else end
+        out.add('trip_destination', (out.next_id('trip_destination'), trip_id, stop_city, stop_country,
+                                     _day(first), _day(max(first, last)), order, created))
+
+    return country
+
+
+def write_user(rng, out, password_hash, trips, activities_per_trip=None):
+    user_id = out.next_id('user')
+    name = f'{rng.choice(FIRST_NAMES)}{user_id}'
+    joined = _timestamp(BASE_DATE - timedelta(days=3 * 365 + rng.randint(0, 365)))
+    out.add('user', (user_id, name, f'{name}@example.com', password_hash, joined, 1))
+
+    countries = {write_trip(rng, out, user_id, activities_per_trip) for _ in range(trips)}
+
+    for country in sorted(countries):
+        out.add('visited_country', (out.next_id('visited_country'), user_id, country, 'visited',
+                                    _day(BASE_DATE - timedelta(days=rng.randint(0, 1000))), joined))
+    for _ in range(rng.choices((0, 1, 3), (60, 30, 10))[0]):
+        out.add('visited_country', (out.next_id('visited_country'), user_id, rng.choice(PLACES)[1],
+                                    'planned', None, joined))
+
+    return user_id
+
+
+def write_template(rng, out, user_id, raters):
+    template_id = out.next_id('trip_template')
+    city, country, currency = rng.choices(PLACES, PLACE_WEIGHTS)[0]
+    days = rng.randint(2, 14)
+    activity_count = rng.randint(3, 30)
+    item_count = rng.randint(5, 25)
+
+    for position in range(activity_count):
+        category = rng.choices(ACTIVITY_CATEGORIES, ACTIVITY_WEIGHTS)[0]
+        out.add('template_activity', (out.next_id('template_activity'), template_id, position,
+                                      position * days // activity_count, rng.choice(ACTIVITIES[category]),
+                                      category, city, f'{rng.randint(8, 20):02d}:00', round(rng.expovariate(1 / 300))))
+    for position in range(item_count):
+        category = rng.choice(PACKING_CATEGORIES)
+        out.add('template_packing_item', (out.next_id('template_packing_item'), template_id, position,
+                                          rng.choice(PACKING[category]), category, 1))
+
+    is_public = rng.random() < 0.4
+    use_count = min(int(rng.paretovariate(1.1)) - 1, 5000) if is_public else 0
+    rating_sum = rating_count = 0
+    if is_public:
+        for rater in rng.sample(raters, min(len(raters), int(rng.expovariate(1 / 4)))):
+            if rater == user_id:
+                continue
+            rating = rng.choices((1, 2, 3, 4, 5), (3, 5, 15, 40, 37))[0]
+            rating_sum += rating
+            rating_count += 1
+            out.add('template_rating', (out.next_id('template_rating'), template_id, rater, rating,
+                                        _timestamp(BASE_DATE)))
+
+    out.add('trip_template', (
+        template_id, f'{days} днів у {city}', f'Перевірений маршрут: {city}, {country}',
+        rng.choice(DESTINATION_TYPES), days, round(rng.lognormvariate(9, 0.6), -2), currency, is_public,
+        user_id, _timestamp(BASE_DATE - timedelta(days=rng.randint(0, 700))), activity_count, item_count,
+        use_count, rating_sum, rating_count, use_count + rating_sum - 3 * rating_count,
+    ))
+
+
+def generate_dataset(path, users=50, heavy_trips=0, seed=DEFAULT_SEED, templates_share=0.05, progress=None):
+    """Створює новий файл SQLite зі схемою застосунку і синтетичними даними
+
+    Повертає {таблиця: рядків}; progress(users_done) викликається після кожної
+    тисячі користувачів.
+    """
+    if os.path.exists(path):
+        raise FileExistsError(path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    engine = create_engine('sqlite:///' + os.path.abspath(path))
+    db.metadata.create_all(engine)
+    engine.dispose()
+
+    rng = random.Random(seed)
+    password_hash = hash_password(SYNTHETIC_PASSWORD)
+
+    conn = sqlite3.connect(path, isolation_level=None)
+    # Файл новий і нікому не видимий до кінця генерації — журнал і fsync не потрібні
+    conn.execute('PRAGMA journal_mode=OFF')
+    conn.execute('PRAGMA synchronous=OFF')
+    conn.execute('PRAGMA cache_size=-200000')
+    # Вторинні індекси дешевше побудувати один раз після вставки, ніж оновлювати на кожен рядок
+    indexes = conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL").fetchall()
+    conn.execute('BEGIN')
+    try:
+        for name, _ in indexes:
+            conn.execute(f'DROP INDEX "{name}"')
+        out = DatasetWriter(conn)
+
+        if heavy_trips:
+            write_user(rng, out, password_hash, heavy_trips, activities_per_trip=HEAVY_ACTIVITIES)
+
+        for index in range(users):
+            write_user(rng, out, password_hash, trip_count(rng))
+            if progress and (index + 1) % 1000 == 0:
+                progress(index + 1)
+
+        raters = list(range(1, out.counts['user'] + 1))
+        for user_id in rng.sample(raters, int(len(raters) * templates_share)):
+            for _ in range(rng.choices((1, 2, 5), (70, 20, 10))[0]):
+                write_template(rng, out, user_id, raters)
+
+        out.flush()
+        for _, sql in indexes:
+            conn.execute(sql)
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.close()
+        os.remove(path)
+        raise
+
+    # Дані згенеровано вже в поточному форматі: разові міграції (planner.database) не потрібні
+    conn.execute(f'PRAGMA user_version = {len(DATA_MIGRATIONS)}')
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('ANALYZE')
+    conn.close()
+    return dict(out.counts)
+
+
+def dataset_path(profile='small', seed=DEFAULT_SEED, directory=None):
+    """Файл набору даних профілю (будується при першому виклику)"""
+    if directory is None:
+        from planner import PROJECT_ROOT
+
+        directory = os.path.join(PROJECT_ROOT, 'instance', 'datasets')
+
+    path = os.path.join(directory, f'{profile}-s{seed}-v{DATASET_VERSION}.db')
+    if not os.path.exists(path):
+        settings = PROFILES[profile]
+        # Будуємо поруч і перейменовуємо: паралельний процес не побачить напівготовий файл
+        partial = f'{path}.{os.getpid()}.partial'
+        generate_dataset(partial, settings['users'], settings['heavy_trips'], seed)
+        os.replace(partial, path)
+    return path
+
+
+def heavy_user_id(profile):
+    """id важкого користувача у файлі профілю (він генерується першим)"""
+    return 1 if PROFILES[profile]['heavy_trips'] else None
+
+
+def describe(counts, elapsed):
+    total = sum(counts.values())
+    lines = [f"{table:<22} {count:>12,}" for table, count in counts.items()]
+    lines.append(f"{'разом':<22} {total:>12,}  за {elapsed:.1f} с ({total / max(elapsed, 1e-9):,.0f} рядків/с)")
+    return '\n'.join(lines)
+
@@ -0,0 +1,9 @@
+"""Розширення Flask, що підключаються до застосунку в create_app()"""
+from flask_login import LoginManager
+from flask_sqlalchemy import SQLAlchemy
+
+db = SQLAlchemy()
+
+login_manager = LoginManager()
+login_manager.login_view = 'auth.login'
+login_manager.session_protection = "strong"
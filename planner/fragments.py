@@ -0,0 +1,187 @@
+"""Кеш фрагментів шаблонів: блок {% cache key, version %} ... {% endcache %}
+
+    {% cache ['dashboard-tiles', current_user.id, filter_status], data_version %}
+        ... дорогий фрагмент ...
+    {% endcache %}
+
+Ключ — рядок або список частин, версія — будь-яке значення, що змінюється
+разом з даними фрагмента (наприклад, User.data_version). Тому інвалідація не
+потрібна: нова версія дає новий ключ, а старі записи витісняються за TTL/LRU.
+Відбиток коду й шаблонів теж входить у ключ, тож після деплою фрагменти
+рендеряться заново.
+
+Сховище підключається через конфіг FRAGMENT_CACHE: 'memory' (LRU у процесі),
+'sqlite' (спільне для всіх воркерів, instance/fragment_cache.db) або 'none'.
+Щоб на промаху не рахувати дані наперед, view передає їх через lazy_context.
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from assistant.storage import SQLiteStore
+from planner.conditional import build_fingerprint
+
+
+class NullFragmentStore:
+    """Кеш вимкнено: кожен фрагмент рендериться заново"""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl):
+        pass
+
+    def clear(self):
+        pass
+
+
+class MemoryFragmentStore:
+    """LRU з TTL у пам'яті процесу"""
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteFragmentStore(SQLiteStore):
+    """Фрагменти у файлі SQLite, спільному для всіх воркерів gunicorn"""
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS fragment (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        );
+    """
+
+    def get(self, key):
+        row = self.connection().execute(
+            'SELECT value FROM fragment WHERE key = ? AND expires_at >= ?', (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        with self.transaction() as conn:
+            conn.execute('INSERT OR REPLACE INTO fragment (key, value, expires_at) VALUES (?, ?, ?)',
+                         (key, value, now + ttl))
+            # Прострочені записи прибираємо принагідно, без окремого процесу
+            conn.execute('DELETE FROM fragment WHERE expires_at < ?', (now,))
+
+    def clear(self):
+        with self.transaction() as conn:
+            conn.execute('DELETE FROM fragment')
+
+
+def fragment_key(fingerprint, key, version):
+    parts = key if isinstance(key, (list, tuple)) else [key]
+    raw = '|'.join(str(part) for part in (fingerprint, *parts, version))
+    return 'fragment:' + hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+class FragmentCacheExtension(Extension):
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+
+        args = [parser.parse_expression()]
+        if parser.stream.skip_if('comma'):
+            args.append(parser.parse_expression())
+        else:
+            args.append(nodes.Const(None))
+
+        body = parser.parse_statements(['name:endcache'], drop_needle=True)
+        return nodes.CallBlock(self.call_method('_cache_support', args), [], [], body).set_lineno(lineno)
+
+    def _cache_support(self, key, version, caller):
+        app = self.environment.app
+        store = app.extensions.get('fragment_cache')
+        if store is None:
+            return caller()
+
+        cache_key = fragment_key(build_fingerprint(app), key, version)
+        try:
+            cached = store.get(cache_key)
+        except Exception as e:
+            print("FRAGMENT CACHE ERROR:", e)
+            cached = None
+
+        if cached is not None:
+            return Markup(cached)
+
+        rendered = caller()
+        try:
+            store.set(cache_key, str(rendered), app.config.get('FRAGMENT_CACHE_TTL', 3600))
+        except Exception as e:
+            print("FRAGMENT CACHE ERROR:", e)
+
+        return rendered
+
+
+class lazy_context:
+    """Дані для кешованих фрагментів, що обчислюються при першому зверненні
+
+    factory(*args) повертає словник; у шаблоні значення доступні як атрибути
+    ({{ stats.total_spent }}). Якщо всі фрагменти взято з кешу, factory не
+    викликається зовсім.
+    """
+
+    def __init__(self, factory, *args):
+        self._factory = factory
+        self._args = args
+        self._values = None
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if self._values is None:
+            self._values = self._factory(*self._args)
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+def create_fragment_store(app):
+    backend = (app.config.get('FRAGMENT_CACHE') or 'none').lower()
+
+    if backend == 'memory':
+        return MemoryFragmentStore(app.config.get('FRAGMENT_CACHE_SIZE', 512))
+    if backend == 'sqlite':
+        return SQLiteFragmentStore(os.path.join(app.instance_path, 'fragment_cache.db'))
+    return NullFragmentStore()
+
+
+def init_fragment_cache(app):
+    app.jinja_env.add_extension(FragmentCacheExtension)
+    app.extensions['fragment_cache'] = create_fragment_store(app)
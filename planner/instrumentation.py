@@ -0,0 +1,221 @@
+"""Вимірювання запитів: SQL, зовнішні HTTP-виклики, рендеринг шаблонів
+
+Для кожного HTTP-запиту рахується:
+- кількість SQL-запитів, їхній сумарний час і найповільніші інструкції;
+- однакові інструкції, виконані PERF_N_PLUS_ONE разів і більше, — імовірний
+  N+1 (SQLAlchemy передає параметри окремо, тож цикл по зв'язках дає той
+  самий текст SQL);
+- час зовнішніх викликів (погода, ПриватБанк, модель) — блок external_call,
+  він же пише метрики upstream (planner.metrics);
+- час рендерингу шаблонів (від render_template до готового HTML, тож сюди
+  входять і SQL-запити ледачих даних фрагментів).
+
+Підсумок іде в заголовок Server-Timing (видно у вкладці Network браузера), а
+запити, повільніші за SLOW_REQUEST_MS або з підозрою на N+1, пишуться
+JSON-рядками в instance/slow_requests.log з ротацією за розміром.
+Потокові відповіді (SSE) вимірюються лише до початку передачі тіла.
+"""
+import json
+import logging
+import os
+import re
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+from flask import before_render_template, g, has_request_context, request, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from planner.metrics import observe_upstream, registry
+
+# Скільки найповільніших інструкцій показувати в журналі
+SLOWEST_STATEMENTS = 3
+# Довжина тексту SQL у журналі
+STATEMENT_PREVIEW = 300
+
+slow_log = logging.getLogger('planner.slow_requests')
+slow_log.propagate = False
+
+
+class RequestStats:
+    """Лічильники одного HTTP-запиту (зберігаються в g)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_ms = 0.0
+        # Текст SQL -> [кількість, сумарний час, найдовший]
+        self.statements = defaultdict(lambda: [0, 0.0, 0.0])
+        self.external = defaultdict(float)
+        self.template_ms = 0.0
+        self._template_depth = 0
+        self._template_started = 0.0
+
+    def add_query(self, statement, ms):
+        self.queries += 1
+        self.sql_ms += ms
+        entry = self.statements[statement]
+        entry[0] += 1
+        entry[1] += ms
+        entry[2] = max(entry[2], ms)
+
+    def repeated(self, threshold):
+        """Інструкції, виконані threshold разів і більше: [(sql, кількість)]"""
+        return sorted(((sql, entry[0]) for sql, entry in self.statements.items() if entry[0] >= threshold),
+                      key=lambda item: -item[1])
+
+    def slowest(self, limit=SLOWEST_STATEMENTS):
+        return sorted(self.statements.items(), key=lambda item: -item[1][1])[:limit]
+
+
+def current_stats():
+    return g.get('request_stats') if has_request_context() else None
+
+
+class ExternalCall:
+    """Результат зовнішнього виклику: ok = False, якщо сервіс відповів помилкою"""
+
+    def __init__(self):
+        self.ok = True
+
+
+@contextmanager
+def external_call(name):
+    """Час блоку йде в статистику поточного запиту (якщо є) та в метрики upstream
+
+    Виняток у блоці рахується як помилка; відповідь з кодом помилки
+    позначає сам виклик: call.ok = response.ok.
+    """
+    call = ExternalCall()
+    started = time.perf_counter()
+    registry.gauge_add('upstream_in_flight', (('upstream', name),))
+    try:
+        yield call
+    except BaseException:
+        call.ok = False
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        registry.gauge_add('upstream_in_flight', (('upstream', name),), -1)
+        observe_upstream(name, elapsed, call.ok)
+
+        stats = current_stats()
+        if stats is not None:
+            stats.external[name] += elapsed * 1000
+
+
+def _preview(statement):
+    return re.sub(r'\s+', ' ', statement).strip()[:STATEMENT_PREVIEW]
+
+
+# ============= SQL =============
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if current_stats() is not None:
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    stats = current_stats()
+    started = conn.info.get('query_started')
+    if stats is not None and started:
+        stats.add_query(statement, (time.perf_counter() - started.pop()) * 1000)
+
+
+# ============= ШАБЛОНИ =============
+
+def _start_template(app, template, context, **extra):
+    stats = current_stats()
+    if stats is not None:
+        # Вкладені render_template (наприклад, у макросах) рахуються один раз
+        if stats._template_depth == 0:
+            stats._template_started = time.perf_counter()
+        stats._template_depth += 1
+
+
+def _stop_template(app, template, context, **extra):
+    stats = current_stats()
+    if stats is not None and stats._template_depth:
+        stats._template_depth -= 1
+        if stats._template_depth == 0:
+            stats.template_ms += (time.perf_counter() - stats._template_started) * 1000
+
+
+# ============= ЗАПИТ =============
+
+def server_timing(stats, total_ms, threshold):
+    metrics = [f'db;dur={stats.sql_ms:.1f};desc="SQL: {stats.queries}"']
+    repeated = stats.repeated(threshold)
+    if repeated:
+        metrics.append(f'n1;desc="N+1?: {len(repeated)}"')
+    if stats.template_ms:
+        metrics.append(f'tpl;dur={stats.template_ms:.1f}')
+    for name, ms in sorted(stats.external.items()):
+        metrics.append(f'ext-{name};dur={ms:.1f}')
+    metrics.append(f'total;dur={total_ms:.1f}')
+    return ', '.join(metrics)
+
+
+def slow_entry(stats, response, total_ms, threshold):
+    return {
+        'at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'pid': os.getpid(),
+        'method': request.method,
+        'path': request.full_path.rstrip('?'),
+        'endpoint': request.endpoint,
+        'status': response.status_code,
+        'total_ms': round(total_ms, 1),
+        'sql_ms': round(stats.sql_ms, 1),
+        'queries': stats.queries,
+        'template_ms': round(stats.template_ms, 1),
+        'external_ms': {name: round(ms, 1) for name, ms in stats.external.items()},
+        'slowest': [
+            {'sql': _preview(sql), 'count': count, 'total_ms': round(total, 1), 'max_ms': round(longest, 1)}
+            for sql, (count, total, longest) in stats.slowest()
+        ],
+        'n_plus_one': [{'sql': _preview(sql), 'count': count} for sql, count in stats.repeated(threshold)],
+    }
+
+
+def init_instrumentation(app):
+    if not app.config.get('PERF_INSTRUMENTATION', True):
+        return
+
+    path = app.config.get('SLOW_REQUEST_LOG') or os.path.join(app.instance_path, 'slow_requests.log')
+    if not any(getattr(handler, 'baseFilename', None) == os.path.abspath(path) for handler in slow_log.handlers):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        handler = RotatingFileHandler(path, maxBytes=app.config.get('SLOW_REQUEST_LOG_BYTES', 1024 * 1024),
+                                      backupCount=3, encoding='utf-8', delay=True)
+        slow_log.addHandler(handler)
+        slow_log.setLevel(logging.INFO)
+
+    before_render_template.connect(_start_template, app)
+    template_rendered.connect(_stop_template, app)
+
+    @app.before_request
+    def start_request_stats():
+        g.request_stats = RequestStats()
+
+    @app.after_request
+    def finish_request_stats(response):
+        # Не pop: лічильники SQL ще читає planner.metrics
+        stats = g.get('request_stats')
+        if stats is None:
+            return response
+
+        total_ms = (time.perf_counter() - stats.started) * 1000
+        threshold = app.config.get('PERF_N_PLUS_ONE', 5)
+        if app.config.get('SERVER_TIMING', True):
+            response.headers['Server-Timing'] = server_timing(stats, total_ms, threshold)
+
+        if total_ms >= app.config.get('SLOW_REQUEST_MS', 500) or stats.repeated(threshold):
+            try:
+                slow_log.info(json.dumps(slow_entry(stats, response, total_ms, threshold), ensure_ascii=False))
+            except Exception as e:
+                print("SLOW LOG ERROR:", e)
+
+        return response
@@ -0,0 +1,298 @@
+"""Метрики застосунку у форматі Prometheus (GET /metrics)
+
+Кожен процес накопичує лічильники та гістограми в пам'яті й раз на
+METRICS_FLUSH_INTERVAL секунд додає прирости до спільного SQLite
+(instance/metrics.db), тож /metrics у будь-якому воркері gunicorn віддає
+суму по всіх воркерах. Неперенесені прирости інших воркерів відстають не
+більше ніж на інтервал. Gauge-и (запити в обробці) кожен процес пише
+окремим рядком зі своїм pid; рядки завершених процесів відкидаються.
+
+Серії:
+- http_requests_total, http_request_duration_seconds, http_requests_in_flight
+  — за endpoint Flask (а не URL, щоб не роздувати кількість серій);
+- db_queries_total, db_query_duration_seconds_total — потребують
+  PERF_INSTRUMENTATION (лічильники planner.instrumentation);
+- cache_requests_total{cache, result} — курси валют, умовні GET сторінок
+  поїздки (зокрема погоди), кеш відповідей AI;
+- upstream_request_duration_seconds, upstream_errors_total,
+  upstream_in_flight — блоки planner.instrumentation.external_call;
+- ai_gateway_in_flight, ai_gateway_queue_depth — стан шлюзу моделі.
+"""
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+
+from flask import current_app, g, has_app_context, request
+
+from assistant.storage import SQLiteStore
+
+PREFIX = 'travel_planner_'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Сімейство -> (тип, опис)
+FAMILIES = {
+    'http_requests_total': ('counter', 'Оброблені HTTP-запити'),
+    'http_request_duration_seconds': ('histogram', 'Час обробки HTTP-запиту'),
+    'http_requests_in_flight': ('gauge', 'HTTP-запити в обробці'),
+    'db_queries_total': ('counter', 'SQL-запити'),
+    'db_query_duration_seconds_total': ('counter', 'Сумарний час SQL-запитів'),
+    'cache_requests_total': ('counter', 'Звернення до кешів за результатом'),
+    'upstream_request_duration_seconds': ('histogram', 'Час виклику зовнішнього сервісу'),
+    'upstream_errors_total': ('counter', 'Невдалі виклики зовнішніх сервісів'),
+    'upstream_in_flight': ('gauge', 'Виклики зовнішніх сервісів у процесі'),
+    'ai_gateway_in_flight': ('gauge', 'Зайняті слоти шлюзу моделі'),
+    'ai_gateway_queue_depth': ('gauge', 'Запити в черзі шлюзу моделі'),
+}
+
+HISTOGRAM_SUFFIXES = ('_bucket', '_sum', '_count')
+
+LE_LABEL = re.compile(r',?le="([^"]*)"$')
+
+
+def format_labels(labels):
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+    return ','.join(f'{name}="{escape(value)}"' for name, value in labels)
+
+
+def format_value(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class MetricsRegistry:
+    """Прирости лічильників і поточні gauge-и одного процесу"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._gauges = defaultdict(float)
+        self._gauges_flushed = {}
+        self._flushed_at = time.monotonic()
+
+    def inc(self, name, labels=(), amount=1.0):
+        with self._lock:
+            self._counters[(name, labels)] += amount
+
+    def observe(self, name, labels, seconds, buckets=LATENCY_BUCKETS):
+        with self._lock:
+            # Пишемо всі межі, навіть нульові: Prometheus очікує повний набір
+            for le in buckets:
+                self._counters[(name + '_bucket', labels + (('le', format_value(le)),))] += seconds <= le
+            self._counters[(name + '_bucket', labels + (('le', '+Inf'),))] += 1
+            self._counters[(name + '_sum', labels)] += seconds
+            self._counters[(name + '_count', labels)] += 1
+
+    def gauge_add(self, name, labels=(), amount=1.0):
+        with self._lock:
+            self._gauges[(name, labels)] += amount
+
+    def flush(self, store, force=False):
+        """Переносить прирости в спільне сховище (не частіше interval, якщо не force)"""
+        with self._lock:
+            gauges = dict(self._gauges)
+            gauges_changed = gauges != self._gauges_flushed
+            due = time.monotonic() - self._flushed_at >= store.interval
+            # Gauge, що повернувся до нуля, пишемо одразу: інакше простійний
+            # воркер до наступного запиту показував би старе значення
+            idle = gauges_changed and not any(gauges.values())
+            if not (force or due or idle):
+                return
+
+            counters = self._counters
+            self._counters = defaultdict(float)
+            self._gauges_flushed = gauges
+            self._flushed_at = time.monotonic()
+
+        try:
+            store.add(counters, gauges)
+        except Exception as e:
+            print("METRICS ERROR:", e)
+            # Прирости не губимо — спробуємо при наступному перенесенні
+            with self._lock:
+                for key, value in counters.items():
+                    self._counters[key] += value
+                self._gauges_flushed = {}
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._gauges_flushed = {}
+
+
+registry = MetricsRegistry()
+
+
+class MetricsStore(SQLiteStore):
+    """Сума приростів усіх воркерів (instance/metrics.db)"""
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS metric (
+            name TEXT NOT NULL,
+            labels TEXT NOT NULL,
+            value REAL NOT NULL,
+            PRIMARY KEY (name, labels)
+        );
+        CREATE TABLE IF NOT EXISTS metric_gauge (
+            pid INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            labels TEXT NOT NULL,
+            value REAL NOT NULL,
+            PRIMARY KEY (pid, name, labels)
+        );
+    """
+
+    def __init__(self, path, interval=2.0):
+        super().__init__(path)
+        self.interval = interval
+
+    def add(self, counters, gauges):
+        pid = os.getpid()
+        with self.transaction() as conn:
+            conn.executemany(
+                'INSERT INTO metric (name, labels, value) VALUES (?, ?, ?) '
+                'ON CONFLICT(name, labels) DO UPDATE SET value = value + excluded.value',
+                [(name, format_labels(labels), value) for (name, labels), value in counters.items()]
+            )
+            conn.execute('DELETE FROM metric_gauge WHERE pid = ?', (pid,))
+            conn.executemany(
+                'INSERT INTO metric_gauge (pid, name, labels, value) VALUES (?, ?, ?, ?)',
+                [(pid, name, format_labels(labels), value) for (name, labels), value in gauges.items()]
+            )
+
+    def collect(self):
+        """[(name, labels, value)] — лічильники та суми gauge-ів живих процесів"""
+        conn = self.connection()
+        rows = conn.execute('SELECT name, labels, value FROM metric').fetchall()
+
+        dead = []
+        for (pid,) in conn.execute('SELECT DISTINCT pid FROM metric_gauge').fetchall():
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                dead.append(pid)
+            except PermissionError:
+                pass
+        if dead:
+            with self.transaction() as write:
+                write.executemany('DELETE FROM metric_gauge WHERE pid = ?', [(pid,) for pid in dead])
+
+        rows += conn.execute('SELECT name, labels, SUM(value) FROM metric_gauge GROUP BY name, labels').fetchall()
+        return rows
+
+    def forget_connections(self):
+        """Після fork: з'єднання master не використовуємо, воркер відкриє власні"""
+        self._local = threading.local()
+
+    def clear(self):
+        with self.transaction() as conn:
+            conn.execute('DELETE FROM metric')
+            conn.execute('DELETE FROM metric_gauge')
+
+
+# ============= ЗАПИС =============
+
+def count_cache(cache, result):
+    """result: hit, miss або stale (віддано застарілі дані)"""
+    registry.inc('cache_requests_total', (('cache', cache), ('result', result)))
+
+
+def observe_upstream(name, seconds, ok):
+    labels = (('upstream', name),)
+    registry.observe('upstream_request_duration_seconds', labels, seconds)
+    if not ok:
+        registry.inc('upstream_errors_total', labels)
+
+
+def flush_metrics(force=False):
+    store = current_app.extensions.get('metrics') if has_app_context() else None
+    if store is not None:
+        registry.flush(store, force=force)
+
+
+def _request_labels():
+    return (('endpoint', request.endpoint or 'unmatched'), ('method', request.method))
+
+
+def init_metrics(app):
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    app.extensions['metrics'] = MetricsStore(
+        app.config.get('METRICS_DB') or os.path.join(app.instance_path, 'metrics.db'),
+        interval=app.config.get('METRICS_FLUSH_INTERVAL', 2.0),
+    )
+
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_started = time.perf_counter()
+        registry.gauge_add('http_requests_in_flight')
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.get('metrics_started')
+        if started is None:
+            return response
+
+        labels = _request_labels()
+        registry.observe('http_request_duration_seconds', labels, time.perf_counter() - started)
+        registry.inc('http_requests_total', labels + (('status', response.status_code),))
+
+        # Лічильники SQL веде planner.instrumentation (якщо увімкнено)
+        stats = g.get('request_stats')
+        if stats is not None and stats.queries:
+            endpoint = labels[:1]
+            registry.inc('db_queries_total', endpoint, stats.queries)
+            registry.inc('db_query_duration_seconds_total', endpoint, stats.sql_ms / 1000)
+        return response
+
+    @app.teardown_request
+    def finish_request_metrics(error=None):
+        if g.pop('metrics_started', None) is not None:
+            registry.gauge_add('http_requests_in_flight', amount=-1)
+            flush_metrics()
+
+
+# ============= ВИВІД =============
+
+def _family(name):
+    if name in FAMILIES:
+        return name
+    for suffix in HISTOGRAM_SUFFIXES:
+        if name.endswith(suffix) and name[:-len(suffix)] in FAMILIES:
+            return name[:-len(suffix)]
+    return name
+
+
+def _sort_key(row):
+    name, labels, _ = row
+    family = _family(name)
+    suffix = HISTOGRAM_SUFFIXES.index(name[len(family):]) if name != family else 0
+
+    # Межі гістограми — за числом, +Inf останньою
+    le = 0.0
+    match = LE_LABEL.search(labels)
+    if match:
+        labels = labels[:match.start()]
+        le = float(match.group(1).replace('+Inf', 'inf'))
+    return family, labels, suffix, le
+
+
+def render_metrics(rows):
+    """Текстовий формат Prometheus 0.0.4"""
+    lines = []
+    current = None
+    for name, labels, value in sorted(rows, key=_sort_key):
+        family = _family(name)
+        if family != current:
+            current = family
+            kind, description = FAMILIES.get(family, ('untyped', ''))
+            lines.append(f'# HELP {PREFIX}{family} {description}')
+            lines.append(f'# TYPE {PREFIX}{family} {kind}')
+        series = f'{PREFIX}{name}{{{labels}}}' if labels else f'{PREFIX}{name}'
+        lines.append(f'{series} {format_value(value)}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,491 @@
+"""Моделі бази даних"""
+from datetime import datetime, timedelta
+
+from flask_login import UserMixin
+
+from planner.extensions import db
+
+
+class User(UserMixin, db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(80), unique=True, nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    password = db.Column(db.String(200), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    # Збільшується при зміні будь-якої поїздки користувача (ключі кешу фрагментів)
+    data_version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+
+    trips = db.relationship('Trip', backref='owner', lazy=True)
+
+    def __repr__(self):
+        return f'<User {self.username}>'
+
+
+class Trip(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(200), nullable=False)
+    destination = db.Column(db.String(200), nullable=False)
+    start_date = db.Column(db.DateTime, nullable=False)
+    end_date = db.Column(db.DateTime, nullable=False)
+    budget = db.Column(db.Float, default=0.0)
+    currency = db.Column(db.String(3), default='UAH')
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    # Збільшується при будь-якій зміні поїздки або її дочірніх записів
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    # Час останньої зміни версії (Last-Modified сторінок поїздки)
+    updated_at = db.Column(db.DateTime, default=datetime.now)
+
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+
+    activities = db.relationship('Activity', backref='trip', lazy=True, cascade='all, delete-orphan',
+                                 order_by='Activity.position, Activity.time, Activity.id')
+    packing_items = db.relationship('PackingItem', backref='trip', lazy=True, cascade='all, delete-orphan')
+    accommodations = db.relationship('Accommodation', backref='trip', lazy=True, cascade='all, delete-orphan')
+
+    def __repr__(self):
+        return f'<Trip {self.title}>'
+
+
+class Activity(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text)
+    date = db.Column(db.DateTime, nullable=False)
+    time = db.Column(db.String(10))
+    location = db.Column(db.String(200))
+    cost = db.Column(db.Float, default=0.0)
+    category = db.Column(db.String(50), default='general')
+    completed = db.Column(db.Boolean, default=False)
+    # Порядок у межах дня з 1; 0 у всіх — день ще не впорядковували вручну (сортування за часом)
+    position = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    trip_id = db.Column(db.Integer, db.ForeignKey('trip.id'), nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_activity_trip_day_position', 'trip_id', 'date', 'position'),
+    )
+
+    def __repr__(self):
+        return f'<Activity {self.title}>'
+
+
+class PackingItem(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(200), nullable=False)
+    category = db.Column(db.String(50), default='general')
+    quantity = db.Column(db.Integer, default=1)
+    is_packed = db.Column(db.Boolean, default=False)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    trip_id = db.Column(db.Integer, db.ForeignKey('trip.id'), nullable=False)
+
+    def __repr__(self):
+        return f'<PackingItem {self.name}>'
+
+
+class Accommodation(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(200), nullable=False)
+    address = db.Column(db.String(300))
+    check_in = db.Column(db.DateTime, nullable=False)
+    check_out = db.Column(db.DateTime, nullable=False)
+    price_per_night = db.Column(db.Float, default=0.0)
+    total_price = db.Column(db.Float, default=0.0)
+    booking_reference = db.Column(db.String(100))
+    phone = db.Column(db.String(50))
+    email = db.Column(db.String(100))
+    website = db.Column(db.String(200))
+    notes = db.Column(db.Text)
+    rating = db.Column(db.Float, default=0.0)
+    amenities = db.Column(db.String(500))
+    image_url = db.Column(db.String(500))
+    booking_status = db.Column(db.String(50), default='pending')
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    trip_id = db.Column(db.Integer, db.ForeignKey('trip.id'), nullable=False)
+
+    def __repr__(self):
+        return f'<Accommodation {self.name}>'
+
+
+# Нотатки для поїздки
+class TripNote(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(200), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    category = db.Column(db.String(50))  # Загальне, Важливе, Контакти, Посилання
+    is_pinned = db.Column(db.Boolean, default=False)
+    trip_id = db.Column(db.Integer, db.ForeignKey('trip.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+    trip = db.relationship('Trip', backref='notes_list')
+
+    def __repr__(self):
+        return f'<TripNote {self.title}>'
+
+
+# Чекліст для поїздки (віза, страховка тощо)
+class TripChecklist(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    item = db.Column(db.String(200), nullable=False)
+    category = db.Column(db.String(50))  # Документи, Бронювання, Підготовка, Інше
+    is_completed = db.Column(db.Boolean, default=False)
+    due_date = db.Column(db.Date, nullable=True)
+    notes = db.Column(db.Text)
+    trip_id = db.Column(db.Integer, db.ForeignKey('trip.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    trip = db.relationship('Trip', backref='checklist_items')
+
+    def __repr__(self):
+        return f'<TripChecklist {self.item}>'
+
+
+# Транспорт
+class Transport(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    trip_id = db.Column(db.Integer, db.ForeignKey('trip.id'), nullable=False)
+    type = db.Column(db.String(50), nullable=False)  # plane, train, bus, car, ferry
+    from_location = db.Column(db.String(200), nullable=False)
+    to_location = db.Column(db.String(200), nullable=False)
+    departure_date = db.Column(db.DateTime, nullable=False)
+    arrival_date = db.Column(db.DateTime, nullable=True)
+    carrier = db.Column(db.String(200))  # Авіакомпанія, автобусна компанія
+    ticket_number = db.Column(db.String(100))
+    seat_number = db.Column(db.String(20))
+    cost = db.Column(db.Float, default=0)
+    booking_reference = db.Column(db.String(100))
+    notes = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    trip = db.relationship('Trip', backref='transports')
+
+
+# Напрямки (міста) в поїздці
+class TripDestination(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    trip_id = db.Column(db.Integer, db.ForeignKey('trip.id'), nullable=False)
+    city = db.Column(db.String(200), nullable=False)
+    country = db.Column(db.String(200), nullable=False)
+    arrival_date = db.Column(db.Date, nullable=True)
+    departure_date = db.Column(db.Date, nullable=True)
+    order = db.Column(db.Integer, default=0)  # Порядок відвідування
+    notes = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    trip = db.relationship('Trip', backref='destinations')
+
+    def __repr__(self):
+        return f'<TripDestination {self.city}, {self.country}>'
+
+
+# Відвідані країни
+class VisitedCountry(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    country_name = db.Column(db.String(200), nullable=False)
+    status = db.Column(db.String(20), nullable=False)  # visited, planned
+    visit_date = db.Column(db.Date, nullable=True)
+    notes = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    user = db.relationship('User', backref='visited_countries')
+
+    def __repr__(self):
+        return f'<VisitedCountry {self.country_name} - {self.status}>'
+
+
+# Досягнення користувача
+class UserAchievement(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    achievement_type = db.Column(db.String(50), nullable=False)  # badge_first_trip, badge_5_trips тощо
+    unlocked_at = db.Column(db.DateTime, default=datetime.now)
+
+    user = db.relationship('User', backref='achievements')
+
+    def __repr__(self):
+        return f'<Achievement {self.achievement_type}>'
+
+
+# Модель шаблону поїздки
+class TripTemplate(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text)
+    destination_type = db.Column(db.String(100))  # Пляж, Гори, Місто тощо
+    duration_days = db.Column(db.Integer)
+    budget_estimate = db.Column(db.Float)
+    currency = db.Column(db.String(3), default='UAH')
+    is_public = db.Column(db.Boolean, default=False)  # Публічний шаблон чи особистий
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    source_trip_id = db.Column(db.Integer, db.ForeignKey('trip.id'), nullable=True)  # З якої поїздки створено
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    # Застарілі JSON-поля: init_db переносить їх у TemplateActivity/TemplatePackingItem
+    activities_template = db.Column(db.Text)
+    packing_template = db.Column(db.Text)
+
+    # Кількість записів шаблону — для галереї без підрахунку дочірніх таблиць
+    activity_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    item_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    # Популярність: скільки разів використали та оцінки користувачів
+    use_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    popularity = db.Column(db.Float, nullable=False, default=0, server_default='0')
+
+    user = db.relationship('User', backref='templates')
+    activities = db.relationship('TemplateActivity', lazy=True, cascade='all, delete-orphan',
+                                 order_by='TemplateActivity.position')
+    packing_items = db.relationship('TemplatePackingItem', lazy=True, cascade='all, delete-orphan',
+                                    order_by='TemplatePackingItem.position')
+
+    __table_args__ = (
+        # Галерея: фільтр за типом і тривалістю, сортування за популярністю (keyset по popularity, id)
+        db.Index('ix_template_gallery', 'is_public', 'destination_type', 'duration_days', 'popularity', 'id'),
+        db.Index('ix_template_popular', 'is_public', 'popularity', 'id'),
+    )
+
+    @property
+    def rating(self):
+        return round(self.rating_sum / self.rating_count, 1) if self.rating_count else None
+
+
+def template_popularity(use_count, rating_sum, rating_count):
+    """Бал популярності шаблону; працює і з числами, і з колонками в UPDATE
+
+    Кожне використання — +1, оцінка вище 3 додає, нижче 3 — віднімає.
+    """
+    return use_count + rating_sum - 3 * rating_count
+
+
+class TemplateActivity(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    template_id = db.Column(db.Integer, db.ForeignKey('trip_template.id'), nullable=False, index=True)
+    position = db.Column(db.Integer, nullable=False, default=0)
+    day = db.Column(db.Integer)  # День від початку поїздки; NULL — розподілити автоматично
+    title = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text)
+    category = db.Column(db.String(50), default='general')
+    location = db.Column(db.String(200))
+    time = db.Column(db.String(10))
+    cost = db.Column(db.Float, default=0.0)
+
+
+class TemplatePackingItem(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    template_id = db.Column(db.Integer, db.ForeignKey('trip_template.id'), nullable=False, index=True)
+    position = db.Column(db.Integer, nullable=False, default=0)
+    name = db.Column(db.String(200), nullable=False)
+    category = db.Column(db.String(50), default='other')
+    quantity = db.Column(db.Integer, default=1)
+
+
+# Оцінка шаблону користувачем (одна на користувача)
+class TemplateRating(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    template_id = db.Column(db.Integer, db.ForeignKey('trip_template.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    rating = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    __table_args__ = (
+        db.UniqueConstraint('template_id', 'user_id', name='uq_template_rating_user'),
+    )
+
+
+# Розмови з AI асистентом (пам'ять між запитами)
+class AIConversation(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    trip_id = db.Column(db.Integer, db.ForeignKey('trip.id'), nullable=True)
+    title = db.Column(db.String(200))
+    summary = db.Column(db.Text, default='')  # Зміст згорнутих старших реплік
+    summarized_until_id = db.Column(db.Integer, default=0)  # Остання репліка, що вже у змісті
+    unsummarized_count = db.Column(db.Integer, default=0)
+    message_count = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now, index=True)
+
+    def __repr__(self):
+        return f'<AIConversation {self.title}>'
+
+
+class AIMessage(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    conversation_id = db.Column(db.Integer, db.ForeignKey('ai_conversation.id'), nullable=False, index=True)
+    role = db.Column(db.String(10), nullable=False)  # user, model
+    content = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    def __repr__(self):
+        return f'<AIMessage {self.role}>'
+
+
+# Фонові завдання AI (генерація плану поїздки)
+class AIJob(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    trip_id = db.Column(db.Integer, db.ForeignKey('trip.id'), nullable=False, index=True)
+    kind = db.Column(db.String(30), nullable=False)  # itinerary
+    status = db.Column(db.String(20), default='queued')  # queued, running, done, failed
+    progress = db.Column(db.Integer, default=0)  # 0-100
+    result_count = db.Column(db.Integer, default=0)
+    error = db.Column(db.String(500))
+    params = db.Column(db.Text)  # JSON
+    created_at = db.Column(db.DateTime, default=datetime.now)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+    finished_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<AIJob {self.kind} {self.status}>'
+
+
+# Журнал змін поїздок для дельта-синхронізації клієнтів; id — курсор
+class ChangeLog(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    entity = db.Column(db.String(30), nullable=False)  # ім'я таблиці: trip, activity, packing_item...
+    entity_id = db.Column(db.Integer, nullable=False)
+    trip_id = db.Column(db.Integer)
+    op = db.Column(db.String(10), nullable=False)  # upsert, delete, reset (поїздку треба завантажити заново)
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    __table_args__ = (
+        db.Index('ix_change_log_user_cursor', 'user_id', 'id'),
+        db.Index('ix_change_log_entity', 'entity', 'entity_id', 'id'),
+    )
+
+    def __repr__(self):
+        return f'<ChangeLog {self.op} {self.entity}:{self.entity_id}>'
+
+
+# ============= ПОРЯДОК АКТИВНОСТЕЙ =============
+
+def next_activity_position(connection, trip_id, day):
+    """Позиція нової активності дня: у кінець, якщо день уже впорядковували вручну"""
+    day_start = datetime(day.year, day.month, day.day)
+    last = connection.execute(
+        db.select(db.func.max(Activity.position)).where(
+            Activity.trip_id == trip_id,
+            Activity.date >= day_start,
+            Activity.date < day_start + timedelta(days=1),
+        )
+    ).scalar()
+    return last + 1 if last else 0
+
+
+def assign_activity_positions(connection, trip_id, rows):
+    """Позиції для масової вставки активностей (вона оминає before_insert)
+
+    rows — словники з ключем date; у вручну впорядкований день нові
+    активності стають у кінець у порядку rows.
+    """
+    positions = {}
+    for row in rows:
+        day = row['date'].date()
+        if day not in positions:
+            positions[day] = next_activity_position(connection, trip_id, day)
+        row['position'] = positions[day]
+        if positions[day]:
+            positions[day] += 1
+
+
+@db.event.listens_for(Activity, 'before_insert')
+def place_new_activity(mapper, connection, target):
+    if target.position is None and target.trip_id and target.date:
+        target.position = next_activity_position(connection, target.trip_id, target.date)
+
+
+# ============= ВЕРСІЇ ПОЇЗДОК =============
+
+def trip_child_models():
+    """Моделі, зміна яких змінює версію батьківської поїздки"""
+    return (Activity, PackingItem, Accommodation, Transport, TripNote, TripChecklist, TripDestination)
+
+
+@db.event.listens_for(db.session, 'before_flush')
+def bump_trip_versions(session, flush_context, instances):
+    """Збільшує Trip.version, якщо змінилась поїздка або будь-який її дочірній запис,
+    і User.data_version власника (також при створенні чи видаленні поїздки)"""
+    child_models = trip_child_models()
+    trip_ids = set()
+    user_ids = set()
+
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, child_models):
+            if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+                continue
+            if obj.trip_id:
+                trip_ids.add(obj.trip_id)
+        elif isinstance(obj, Trip):
+            if obj in session.dirty and session.is_modified(obj, include_collections=False):
+                trip_ids.add(obj.id)
+            elif obj in session.new or obj in session.deleted:
+                user_ids.add(obj.user_id)
+
+    for trip_id in trip_ids:
+        trip = session.get(Trip, trip_id)
+        if trip is not None and trip not in session.deleted:
+            trip.version = (trip.version or 0) + 1
+            trip.updated_at = datetime.now()
+            user_ids.add(trip.user_id)
+
+    for user_id in user_ids:
+        user = session.get(User, user_id) if user_id else None
+        if user is not None and user not in session.deleted:
+            user.data_version = (user.data_version or 0) + 1
+
+
+@db.event.listens_for(db.session, 'after_flush')
+def record_changes(session, flush_context):
+    """Пише в change_log кожну створену, змінену чи видалену поїздку та її дочірні записи"""
+    synced_models = (Trip,) + trip_child_models()
+    changes = []
+    owners = {}
+
+    for op, objects in (('upsert', session.new), ('upsert', session.dirty), ('delete', session.deleted)):
+        for obj in objects:
+            if not isinstance(obj, synced_models):
+                continue
+            if objects is session.dirty and not session.is_modified(obj, include_collections=False):
+                continue
+
+            if isinstance(obj, Trip):
+                owners[obj.id] = obj.user_id
+                changes.append((obj.__tablename__, obj.id, obj.id, op))
+            else:
+                changes.append((obj.__tablename__, obj.id, obj.trip_id, op))
+
+    if not changes:
+        return
+
+    connection = session.connection()
+    missing = {trip_id for _, _, trip_id, _ in changes if trip_id not in owners}
+    if missing:
+        owners.update(connection.execute(
+            db.select(Trip.id, Trip.user_id).where(Trip.id.in_(missing))
+        ).all())
+
+    rows = [
+        {'user_id': owners[trip_id], 'entity': entity, 'entity_id': entity_id, 'trip_id': trip_id, 'op': op}
+        for entity, entity_id, trip_id, op in changes if owners.get(trip_id)
+    ]
+    if rows:
+        connection.execute(ChangeLog.__table__.insert(), rows)
+
+
+def touch_trip(trip_id):
+    """Збільшує версію поїздки після масових UPDATE/DELETE, що оминають сесію
+
+    Які саме рядки змінились, невідомо, тому клієнти синхронізації
+    отримують поїздку цілком (op='reset').
+    """
+    db.session.execute(db.update(Trip).where(Trip.id == trip_id).values(
+        version=Trip.version + 1, updated_at=datetime.now()))
+    owner_id = db.select(Trip.user_id).where(Trip.id == trip_id).scalar_subquery()
+    db.session.execute(db.update(User).where(User.id == owner_id).values(data_version=User.data_version + 1))
+    db.session.execute(db.insert(ChangeLog).values(
+        user_id=owner_id, entity=Trip.__tablename__, entity_id=trip_id, trip_id=trip_id, op='reset'))
@@ -0,0 +1,104 @@
+"""Хешування паролів: налаштовувана політика, перехешування при вході
+та обмежений пул перевірок
+
+Алгоритм і вартість задає PASSWORD_HASH_METHOD у форматі werkzeug:
+'pbkdf2:sha256:600000', 'scrypt:32768:8:1' тощо. Хеш зберігає параметри,
+якими його створено, тож після зміни політики старі хеші перевіряються як
+і раніше, а при наступному вдалому вході пароль перехешовується.
+
+Перевірка пароля — це сотні мілісекунд чистого CPU. Щоб хвиля входів не
+зайняла всі потоки воркера, хешування виконується в пулі з
+PASSWORD_VERIFY_WORKERS потоків (hashlib відпускає GIL). Якщо в пулі та
+черзі вже PASSWORD_VERIFY_WORKERS + PASSWORD_VERIFY_QUEUE завдань, новий
+вхід одразу отримує відмову з Retry-After замість очікування.
+"""
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+from planner.config import (
+    PASSWORD_HASH_METHOD, PASSWORD_VERIFY_QUEUE, PASSWORD_VERIFY_TIMEOUT, PASSWORD_VERIFY_WORKERS,
+)
+
+# Параметри werkzeug за замовчуванням для скорочених записів ('scrypt', 'pbkdf2:sha256')
+SCRYPT_DEFAULTS = (2 ** 15, 8, 1)
+
+
+def canonical_method(method):
+    """Повний запис методу, як його пише werkzeug на початку хешу"""
+    name, *args = method.split(':')
+
+    if name == 'scrypt':
+        n, r, p = [int(value) for value in args] + list(SCRYPT_DEFAULTS[len(args):])
+        return f'scrypt:{n}:{r}:{p}'
+    if name == 'pbkdf2':
+        hash_name = args[0] if args else 'sha256'
+        iterations = int(args[1]) if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f'pbkdf2:{hash_name}:{iterations}'
+
+    raise ValueError(f'Невідомий метод хешування: {method}')
+
+
+def hash_password(password, method=None):
+    return generate_password_hash(password, method=method or PASSWORD_HASH_METHOD)
+
+
+def needs_rehash(pwhash, method=None):
+    """True, якщо хеш створено не за поточною політикою"""
+    return pwhash.split('$', 1)[0] != canonical_method(method or PASSWORD_HASH_METHOD)
+
+
+class VerificationRejected(Exception):
+    """Пул перевірок переповнений або перевірка не вклалась у таймаут"""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class PasswordPool:
+    """Пул потоків для хешування з обмеженою кількістю завдань (виконуються + чекають)"""
+
+    def __init__(self, workers=2, max_queue=16, timeout=10.0):
+        self.workers = workers
+        self.timeout = timeout
+        # Потоки стартують при першому завданні, тож пул безпечно створювати до fork
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password')
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+
+    def run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            raise VerificationRejected('busy', 1)
+
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # Слот звільняється, коли завдання завершилось, навіть якщо запит уже не чекає
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise VerificationRejected('timeout', self.timeout) from None
+
+
+password_pool = PasswordPool(PASSWORD_VERIFY_WORKERS, PASSWORD_VERIFY_QUEUE, PASSWORD_VERIFY_TIMEOUT)
+
+
+def verify_password(pwhash, password):
+    """Перевіряє пароль у пулі; кидає VerificationRejected, якщо пул переповнений"""
+    return password_pool.run(check_password_hash, pwhash, password)
+
+
+def upgrade_hash(user, password):
+    """Після вдалої перевірки перехешовує пароль за поточною політикою; True — хеш змінено"""
+    if not needs_rehash(user.password):
+        return False
+    user.password = password_pool.run(hash_password, password)
+    return True
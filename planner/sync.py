@@ -0,0 +1,323 @@
+"""Дельта-синхронізація поїздок для офлайн і мобільних клієнтів
+
+Кожна зміна поїздки чи її дочірнього запису потрапляє в change_log
+(див. record_changes у models.py); id запису журналу — курсор клієнта.
+
+    pull:  що змінилось після курсора — лише останній стан кожного запису
+    push:  черга офлайн-змін клієнта; зміна, під якою на сервері вже є
+           новіші записи журналу, ніж бачив клієнт (base_cursor), —
+           конфлікт, і клієнт отримує поточний серверний рядок
+
+Перша синхронізація (без курсора) повертає повний знімок поїздок
+сторінками по SNAPSHOT_TRIPS поїздок разом з їхніми дочірніми записами:
+поки has_more, клієнт запитує ?after=<after>&cursor=<cursor>, де cursor —
+з першої сторінки; з нього потім починається pull.
+"""
+from datetime import date, datetime
+
+from sqlalchemy.exc import IntegrityError
+
+from planner.extensions import db
+from planner.models import Activity, ChangeLog, Trip, trip_child_models
+
+# Максимум записів журналу за один pull та змін за один push
+SYNC_BATCH = 500
+PUSH_LIMIT = 200
+# Поїздок (з усіма дочірніми записами) на одній сторінці повного знімка
+SNAPSHOT_TRIPS = 50
+
+# Колонки, які клієнт не може задавати
+READONLY_COLUMNS = {'id', 'trip_id', 'user_id', 'version', 'created_at', 'updated_at'}
+
+
+class SyncError(ValueError):
+    """Зміну від клієнта неможливо застосувати"""
+
+
+def sync_models():
+    return {model.__tablename__: model for model in (Trip,) + trip_child_models()}
+
+
+def serialize(obj):
+    row = {}
+    for column in obj.__table__.columns:
+        if column.name == 'user_id':
+            continue
+        value = getattr(obj, column.name)
+        row[column.name] = value.isoformat() if isinstance(value, (date, datetime)) else value
+    return row
+
+
+def current_cursor(user_id):
+    return db.session.query(db.func.max(ChangeLog.id)).filter(ChangeLog.user_id == user_id).scalar() or 0
+
+
+# ============= PULL =============
+
+def _load(model, ids):
+    return model.query.filter(model.id.in_(ids)).all() if ids else []
+
+
+def snapshot(user_id, after=0, cursor=None, limit=SNAPSHOT_TRIPS):
+    """Сторінка знімка: поїздки з id > after разом з дочірніми записами
+
+    cursor — з першої сторінки: наступні сторінки повертають його ж, щоб
+    зміни, зроблені під час читання знімка, прийшли наступним pull.
+    """
+    if cursor is None:
+        # Курсор беремо до читання даних
+        cursor = current_cursor(user_id)
+
+    trips = Trip.query.filter(Trip.user_id == user_id, Trip.id > after).order_by(Trip.id).limit(limit + 1).all()
+    has_more = len(trips) > limit
+    trips = trips[:limit]
+    trip_ids = [trip.id for trip in trips]
+
+    changes = {Trip.__tablename__: {'upserts': [serialize(trip) for trip in trips], 'deletes': []}}
+    for model in trip_child_models():
+        rows = model.query.filter(model.trip_id.in_(trip_ids)).all() if trip_ids else []
+        changes[model.__tablename__] = {'upserts': [serialize(row) for row in rows], 'deletes': []}
+
+    return {
+        'cursor': cursor,
+        'has_more': has_more,
+        'after': trip_ids[-1] if has_more else None,
+        'full': True,
+        'resets': [],
+        'changes': changes,
+    }
+
+
+def pull_changes(user_id, cursor, limit=SYNC_BATCH):
+    """Зміни після cursor: для кожного запису лише його поточний стан або видалення"""
+    entries = ChangeLog.query.filter(
+        ChangeLog.user_id == user_id, ChangeLog.id > cursor
+    ).order_by(ChangeLog.id).limit(limit + 1).all()
+
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    # Кілька змін одного запису згортаються в останню
+    latest = {}
+    resets = set()
+    for entry in entries:
+        if entry.op == 'reset':
+            resets.add(entry.entity_id)
+            latest[(Trip.__tablename__, entry.entity_id)] = 'upsert'
+        else:
+            latest[(entry.entity, entry.entity_id)] = entry.op
+
+    models = sync_models()
+    changes = {}
+    for entity, model in models.items():
+        upsert_ids = {entity_id for (name, entity_id), op in latest.items() if name == entity and op == 'upsert'}
+        deletes = {entity_id for (name, entity_id), op in latest.items() if name == entity and op == 'delete'}
+
+        rows = _load(model, upsert_ids)
+        if resets and model is not Trip:
+            # Поїздку після масової зміни віддаємо цілком
+            rows += model.query.filter(model.trip_id.in_(resets), model.id.notin_(upsert_ids)).all()
+
+        # Запис, видалений уже після цієї порції журналу
+        deletes |= upsert_ids - {row.id for row in rows}
+
+        if rows or deletes:
+            changes[entity] = {'upserts': [serialize(row) for row in rows], 'deletes': sorted(deletes)}
+
+    return {
+        'cursor': entries[-1].id if entries else cursor,
+        'has_more': has_more,
+        'full': False,
+        'resets': sorted(resets),
+        'changes': changes,
+    }
+
+
+# ============= PUSH =============
+
+def _convert(column, value):
+    if value is None:
+        if not column.nullable:
+            raise SyncError(f"Поле {column.name} обов'язкове")
+        return None
+
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(str(value))
+    if python_type is date:
+        return date.fromisoformat(str(value)[:10])
+    if python_type is bool:
+        # bool("false") — True, тому приймаємо лише справжні JSON-булеві та 0/1
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, int) and value in (0, 1):
+            return bool(value)
+        raise SyncError(f"Поле {column.name} має бути true або false")
+    return python_type(value)
+
+
+def column_values(model, data):
+    """Значення з JSON, перетворені до типів колонок моделі"""
+    if not isinstance(data, dict):
+        raise SyncError("Очікується об'єкт data")
+
+    columns = model.__table__.columns
+    values = {}
+    for name, value in data.items():
+        if name in READONLY_COLUMNS or name not in columns:
+            raise SyncError(f"Поле {name} не можна змінювати")
+        values[name] = _convert(columns[name], value)
+    return values
+
+
+def _check_activity(trip, values):
+    day = values.get('date')
+    if day is not None and not trip.start_date.date() <= day.date() <= trip.end_date.date():
+        raise SyncError('Дата активності повинна бути в межах дат поїздки')
+
+
+# Перевірки, що залежать від поїздки (спільні для sync і batch)
+CHECKS = {Activity.__tablename__: _check_activity}
+
+
+def check_values(trip, entity, values):
+    if entity in CHECKS:
+        CHECKS[entity](trip, values)
+
+
+def assign(obj, data, trip=None):
+    """trip — поїздка дочірнього запису, для перевірок CHECKS"""
+    values = column_values(type(obj), data)
+    if trip is not None:
+        check_values(trip, obj.__tablename__, values)
+    for name, value in values.items():
+        setattr(obj, name, value)
+
+
+def _owner(obj):
+    if isinstance(obj, Trip):
+        return obj.user_id
+    trip = db.session.get(Trip, obj.trip_id)
+    return trip.user_id if trip else None
+
+
+def _resolve(value, created):
+    """id з сервера або client_id запису, створеного раніше в цьому ж push"""
+    if isinstance(value, str) and value in created:
+        return created[value]
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise SyncError(f"Невідомий запис: {value}") from None
+
+
+def _has_conflict(entity, obj, base_cursor, push_cursor):
+    """Чи змінювався запис (або вся поїздка) між base_cursor клієнта і початком push"""
+    trip_id = obj.id if isinstance(obj, Trip) else obj.trip_id
+    return db.session.query(ChangeLog.id).filter(
+        ChangeLog.id > base_cursor,
+        ChangeLog.id <= push_cursor,
+        db.or_(
+            db.and_(ChangeLog.entity == entity, ChangeLog.entity_id == obj.id),
+            db.and_(ChangeLog.entity == Trip.__tablename__, ChangeLog.entity_id == trip_id, ChangeLog.op == 'reset'),
+        )
+    ).first() is not None
+
+
+def _delete_trip(trip):
+    # Не всі дочірні зв'язки мають cascade, тому видаляємо записи явно
+    for model in trip_child_models():
+        for row in model.query.filter_by(trip_id=trip.id).all():
+            db.session.delete(row)
+    db.session.delete(trip)
+
+
+def apply_mutation(user_id, mutation, created, push_cursor):
+    model = sync_models().get(mutation.get('entity'))
+    if model is None:
+        raise SyncError("Невідомий тип запису")
+
+    entity = model.__tablename__
+    op = mutation.get('op')
+    data = mutation.get('data') or {}
+
+    if op == 'create':
+        obj = model()
+        trip = None
+        if model is Trip:
+            obj.user_id = user_id
+        else:
+            trip = db.session.get(Trip, _resolve(mutation.get('trip_id'), created))
+            if trip is None or trip.user_id != user_id:
+                raise SyncError('Access denied')
+            obj.trip_id = trip.id
+
+        assign(obj, data, trip)
+        db.session.add(obj)
+        db.session.flush()
+
+        if mutation.get('client_id'):
+            created[mutation['client_id']] = obj.id
+        return {'status': 'applied', 'entity': entity, 'entity_id': obj.id, 'row': serialize(obj)}
+
+    if op not in ('update', 'delete'):
+        raise SyncError("Невідома операція")
+
+    entity_id = _resolve(mutation.get('entity_id'), created)
+    obj = db.session.get(model, entity_id)
+
+    if obj is None:
+        # Видалення вже видаленого запису — не помилка
+        if op == 'delete':
+            return {'status': 'applied', 'entity': entity, 'entity_id': entity_id}
+        return {'status': 'conflict', 'entity': entity, 'entity_id': entity_id, 'row': None}
+
+    if _owner(obj) != user_id:
+        raise SyncError('Access denied')
+
+    try:
+        base_cursor = int(mutation.get('base_cursor') or 0)
+    except (TypeError, ValueError):
+        raise SyncError("Некоректний base_cursor") from None
+
+    if _has_conflict(entity, obj, base_cursor, push_cursor):
+        return {'status': 'conflict', 'entity': entity, 'entity_id': obj.id, 'row': serialize(obj)}
+
+    if op == 'delete':
+        if model is Trip:
+            _delete_trip(obj)
+        else:
+            db.session.delete(obj)
+        db.session.flush()
+        return {'status': 'applied', 'entity': entity, 'entity_id': entity_id}
+
+    assign(obj, data, None if model is Trip else db.session.get(Trip, obj.trip_id))
+    db.session.flush()
+    return {'status': 'applied', 'entity': entity, 'entity_id': obj.id, 'row': serialize(obj)}
+
+
+def push_mutations(user_id, mutations):
+    """Застосовує зміни по черзі, кожну у власному savepoint; повертає результати"""
+    # Зміни, які робить сам цей push, не повинні вважатися конфліктами
+    push_cursor = current_cursor(user_id)
+    created = {}
+    results = []
+
+    for mutation in mutations:
+        if not isinstance(mutation, dict):
+            results.append({'status': 'error', 'error': 'Некоректна зміна'})
+            continue
+
+        try:
+            with db.session.begin_nested():
+                result = apply_mutation(user_id, mutation, created, push_cursor)
+        except SyncError as e:
+            result = {'status': 'error', 'error': str(e)}
+        except (ValueError, TypeError, IntegrityError) as e:
+            result = {'status': 'error', 'error': f"Некоректні дані: {e.__class__.__name__}"}
+
+        result['client_id'] = mutation.get('client_id')
+        results.append(result)
+
+    db.session.commit()
+    return results
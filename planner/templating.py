@@ -0,0 +1,46 @@
+"""Кеш байткоду шаблонів Jinja та їх попередня компіляція
+
+Скомпільовані шаблони зберігаються у файлах (instance/jinja_cache), тож
+новий воркер не парсить і не компілює шаблони, а лише завантажує готовий
+байткод. Ключ кешу містить контрольну суму джерела шаблону, тому змінений
+шаблон перекомпілюється автоматично.
+"""
+import os
+
+from jinja2 import FileSystemBytecodeCache
+
+
+def init_bytecode_cache(app):
+    if not app.config.get('JINJA_BYTECODE_CACHE', True):
+        return
+
+    directory = app.config.get('JINJA_BYTECODE_CACHE_DIR') or os.path.join(app.instance_path, 'jinja_cache')
+    os.makedirs(directory, exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+
+
+def template_names(app):
+    return app.jinja_env.list_templates(filter_func=lambda name: name.endswith('.html'))
+
+
+def compile_templates(app):
+    """Компілює всі шаблони (і записує їх байткод у кеш)
+
+    Повертає (кількість шаблонів, [(шаблон, помилка)]).
+    """
+    names = template_names(app)
+    errors = []
+
+    for name in names:
+        try:
+            app.jinja_env.get_template(name)
+        except Exception as e:
+            lineno = getattr(e, 'lineno', None)
+            errors.append((f"{name}:{lineno}" if lineno else name, f"{type(e).__name__}: {e}"))
+
+    return len(names), errors
+
+
+def clear_bytecode_cache(app):
+    if app.jinja_env.bytecode_cache is not None:
+        app.jinja_env.bytecode_cache.clear()
@@ -0,0 +1,317 @@
+"""Шаблони поїздок: збереження, створення поїздки з шаблону, галерея
+
+Активності та речі шаблону лежать у дочірніх таблицях (TemplateActivity,
+TemplatePackingItem) і вставляються масово — по одному executemany на
+таблицю. Дати активностей обчислюються заздалегідь: збережений у шаблоні
+день або рівномірний розподіл по тривалості поїздки.
+
+Галерея публічних шаблонів відсортована за популярністю і гортається
+keyset-пагінацією: курсор — (popularity, id) останнього показаного
+шаблону, тож кожна сторінка — один запит по індексу ix_template_gallery
+незалежно від того, наскільки далеко користувач догортав.
+"""
+import json
+import math
+import time
+from datetime import datetime, timedelta
+
+from planner.extensions import db
+from planner.models import (
+    Activity, PackingItem, TemplateActivity, TemplatePackingItem, TemplateRating, Trip, TripTemplate,
+    template_popularity, touch_trip,
+)
+
+# Шаблонів на сторінці галереї
+GALLERY_PAGE_SIZE = 24
+# Як довго (секунд) показувати закешований список найпопулярніших шаблонів
+TOP_LIST_TTL = 300
+
+
+def distribute_days(count, days):
+    """Номер дня (від 0) для кожної з count активностей у поїздці з days днів
+
+    Порядок шаблону зберігається. Якщо активностей більше, ніж днів, вони
+    діляться на послідовні групи, що відрізняються за розміром не більш ніж
+    на одну; якщо менше — розставляються з рівними проміжками між днями.
+    """
+    days = max(days, 1)
+    return [index * days // count for index in range(count)]
+
+
+def load_items(raw):
+    """Список записів з JSON-поля шаблону; пошкоджений JSON — порожній список"""
+    if not raw:
+        return []
+    try:
+        items = json.loads(raw)
+    except ValueError:
+        return []
+    return [item for item in items if isinstance(item, dict)] if isinstance(items, list) else []
+
+
+def _template_day(item, days):
+    day = item.get('day')
+    if isinstance(day, int) and 0 <= day < days:
+        return day
+    return None
+
+
+def activity_rows(activities, trip_id, start_date, days):
+    """Рядки для масового INSERT: дати зі збереженого дня або розподілу"""
+    activities = [item for item in activities if item.get('title')]
+    free = sum(1 for item in activities if _template_day(item, days) is None)
+    spread = iter(distribute_days(free, days))
+
+    rows = []
+    for item in activities:
+        day = _template_day(item, days)
+        if day is None:
+            day = next(spread)
+
+        rows.append({
+            'trip_id': trip_id,
+            'title': item['title'],
+            # Старі шаблони могли містити notes замість description
+            'description': item.get('description') or item.get('notes'),
+            'date': start_date + timedelta(days=day),
+            'time': item.get('time'),
+            'location': item.get('location'),
+            'category': item.get('category') or 'general',
+            'cost': float(item.get('cost') or 0),
+            'position': 0,
+        })
+    return rows
+
+
+def packing_rows(items, trip_id):
+    return [
+        {
+            'trip_id': trip_id,
+            'name': item['name'],
+            'category': item.get('category') or 'other',
+            'quantity': int(item.get('quantity') or 1),
+        }
+        for item in items if item.get('name')
+    ]
+
+
+def template_items(model, template_id, columns):
+    """Записи шаблону як словники (одним запитом, у збереженому порядку)"""
+    rows = db.session.execute(
+        db.select(*[getattr(model, name) for name in columns])
+        .where(model.template_id == template_id).order_by(model.position)
+    )
+    return [dict(row._mapping) for row in rows]
+
+
+def store_template_items(template, activities, packing):
+    """Замінює активності та речі шаблону; приймає словники у форматі template_activity"""
+    if template.id is None:
+        db.session.flush()
+
+    db.session.execute(db.delete(TemplateActivity).where(TemplateActivity.template_id == template.id))
+    db.session.execute(db.delete(TemplatePackingItem).where(TemplatePackingItem.template_id == template.id))
+
+    new_activities = [
+        {
+            'template_id': template.id,
+            'position': position,
+            'day': item.get('day') if isinstance(item.get('day'), int) else None,
+            'title': item['title'],
+            'description': item.get('description') or item.get('notes'),
+            'category': item.get('category') or 'general',
+            'location': item.get('location'),
+            'time': item.get('time'),
+            'cost': float(item.get('cost') or 0),
+        }
+        for position, item in enumerate(item for item in activities if item.get('title'))
+    ]
+    new_packing = [
+        {
+            'template_id': template.id,
+            'position': position,
+            'name': item['name'],
+            'category': item.get('category') or 'other',
+            'quantity': int(item.get('quantity') or 1),
+        }
+        for position, item in enumerate(item for item in packing if item.get('name'))
+    ]
+
+    if new_activities:
+        db.session.execute(db.insert(TemplateActivity), new_activities)
+    if new_packing:
+        db.session.execute(db.insert(TemplatePackingItem), new_packing)
+
+    template.activity_count = len(new_activities)
+    template.item_count = len(new_packing)
+
+
+def record_use(template_id):
+    """+1 використання одним UPDATE (без гонки між воркерами)"""
+    db.session.execute(db.update(TripTemplate).where(TripTemplate.id == template_id).values(
+        use_count=TripTemplate.use_count + 1,
+        popularity=template_popularity(TripTemplate.use_count + 1, TripTemplate.rating_sum,
+                                       TripTemplate.rating_count),
+    ))
+
+
+def instantiate_template(template, user_id, title, destination, start_date, budget):
+    """Створює поїздку з шаблону; повертає нову Trip (зміни закомічено)"""
+    days = max(template.duration_days or 1, 1)
+    start = datetime(start_date.year, start_date.month, start_date.day)
+
+    trip = Trip(
+        title=title,
+        destination=destination,
+        start_date=start,
+        end_date=start + timedelta(days=days - 1),
+        budget=budget,
+        currency=template.currency,
+        user_id=user_id,
+    )
+    db.session.add(trip)
+    db.session.flush()  # Отримуємо ID нової поїздки
+
+    activities = activity_rows(
+        template_items(TemplateActivity, template.id,
+                       ('title', 'description', 'day', 'time', 'location', 'category', 'cost')),
+        trip.id, start, days)
+    packing = packing_rows(template_items(TemplatePackingItem, template.id, ('name', 'category', 'quantity')),
+                           trip.id)
+
+    if activities:
+        db.session.execute(db.insert(Activity), activities)
+    if packing:
+        db.session.execute(db.insert(PackingItem), packing)
+
+    # Масові INSERT оминають слухачі сесії
+    if activities or packing:
+        touch_trip(trip.id)
+
+    record_use(template.id)
+    db.session.commit()
+    return trip
+
+
+def template_activity(activity, trip_start):
+    """Активність поїздки у форматі шаблону (з номером дня)"""
+    return {
+        'title': activity.title,
+        'description': activity.description,
+        'category': activity.category,
+        'location': activity.location,
+        'time': activity.time,
+        'cost': activity.cost,
+        'day': (activity.date.date() - trip_start.date()).days,
+    }
+
+
+# ============= ОЦІНКИ =============
+
+def rate_template(template, user_id, rating):
+    """Зберігає оцінку користувача (1-5) і перераховує суму, кількість та популярність"""
+    existing = TemplateRating.query.filter_by(template_id=template.id, user_id=user_id).first()
+    if existing:
+        existing.rating = rating
+    else:
+        db.session.add(TemplateRating(template_id=template.id, user_id=user_id, rating=rating))
+    db.session.flush()
+
+    total, count = db.session.execute(
+        db.select(db.func.coalesce(db.func.sum(TemplateRating.rating), 0), db.func.count(TemplateRating.id))
+        .where(TemplateRating.template_id == template.id)
+    ).one()
+
+    db.session.execute(db.update(TripTemplate).where(TripTemplate.id == template.id).values(
+        rating_sum=total,
+        rating_count=count,
+        popularity=template_popularity(TripTemplate.use_count, total, count),
+    ))
+    db.session.commit()
+
+
+# ============= ГАЛЕРЕЯ =============
+
+def encode_cursor(template):
+    return f'{template.popularity!r}:{template.id}'
+
+
+def decode_cursor(cursor):
+    """(popularity, id) з курсора; некоректний курсор — з початку"""
+    try:
+        popularity, template_id = cursor.split(':')
+        popularity, template_id = float(popularity), int(template_id)
+    except (AttributeError, ValueError):
+        return None
+    # "nan:5" дав би порожню сторінку замість першої
+    if not math.isfinite(popularity):
+        return None
+    return popularity, template_id
+
+
+def gallery_page(destination=None, min_days=None, max_days=None, search=None, after=None,
+                 limit=GALLERY_PAGE_SIZE):
+    """Сторінка публічних шаблонів; повертає (шаблони, курсор наступної сторінки або None)"""
+    query = TripTemplate.query.filter(TripTemplate.is_public.is_(True))
+
+    if destination:
+        query = query.filter(TripTemplate.destination_type == destination)
+    if min_days:
+        query = query.filter(TripTemplate.duration_days >= min_days)
+    if max_days:
+        query = query.filter(TripTemplate.duration_days <= max_days)
+    if search:
+        pattern = f'%{search}%'
+        query = query.filter(db.or_(TripTemplate.name.ilike(pattern), TripTemplate.description.ilike(pattern)))
+
+    position = decode_cursor(after) if after else None
+    if position:
+        popularity, template_id = position
+        query = query.filter(db.or_(
+            TripTemplate.popularity < popularity,
+            db.and_(TripTemplate.popularity == popularity, TripTemplate.id < template_id),
+        ))
+
+    templates = query.order_by(TripTemplate.popularity.desc(), TripTemplate.id.desc()).limit(limit + 1).all()
+
+    if len(templates) > limit:
+        templates = templates[:limit]
+        return templates, encode_cursor(templates[-1])
+    return templates, None
+
+
+def top_list_version():
+    """Версія кешу списків популярного: змінюється раз на TOP_LIST_TTL секунд"""
+    return int(time.time() // TOP_LIST_TTL)
+
+
+def top_templates(limit=6):
+    """Найпопулярніші публічні шаблони (сторінка кешує результат фрагментом)"""
+    return TripTemplate.query.filter(TripTemplate.is_public.is_(True)).order_by(
+        TripTemplate.popularity.desc(), TripTemplate.id.desc()).limit(limit).all()
+
+
+def popular_destinations(limit=30):
+    """Найчастіші напрямки публічних шаблонів — підказки для фільтра"""
+    rows = db.session.query(TripTemplate.destination_type, db.func.count(TripTemplate.id)).filter(
+        TripTemplate.is_public.is_(True), TripTemplate.destination_type.isnot(None)
+    ).group_by(TripTemplate.destination_type).order_by(db.func.count(TripTemplate.id).desc()).limit(limit).all()
+    return [destination for destination, _ in rows]
+
+
+def gallery_item(template):
+    """Шаблон у форматі JSON API галереї"""
+    return {
+        'id': template.id,
+        'name': template.name,
+        'description': template.description,
+        'destination_type': template.destination_type,
+        'duration_days': template.duration_days,
+        'budget_estimate': template.budget_estimate,
+        'currency': template.currency,
+        'activity_count': template.activity_count,
+        'item_count': template.item_count,
+        'use_count': template.use_count,
+        'rating': template.rating,
+        'rating_count': template.rating_count,
+    }
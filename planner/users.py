@@ -0,0 +1,161 @@
+"""Завантаження користувача для Flask-Login без запиту до БД на кожен запит
+
+current_user — незмінний знімок (UserSnapshot) з id, іменем, email і датою
+реєстрації. Знімки живуть у кеші процесу USER_CACHE_TTL секунд; після
+коміту, що змінив ім'я, email чи пароль, знімок видаляється з кешу.
+Інші воркери gunicorn побачать зміну профілю не пізніше ніж через TTL.
+
+data_version (версія даних для кешу фрагментів та ETag) змінюється при
+кожному редагуванні поїздки, тому в знімок не кешується: її читають одним
+запитом при першому зверненні і пам'ятають до кінця запиту.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+from flask import current_app, g, has_app_context
+from flask_login import UserMixin
+
+from planner.extensions import db, login_manager
+from planner.models import User
+
+# Зміна цих полів робить закешований знімок застарілим
+SNAPSHOT_FIELDS = ('username', 'email', 'password')
+
+
+@dataclass(frozen=True, eq=False)
+class UserSnapshot(UserMixin):
+    id: int
+    username: str
+    email: str
+    created_at: datetime
+
+    @property
+    def data_version(self):
+        return user_data_version(self.id)
+
+
+class UserCache:
+    """LRU знімків з TTL у пам'яті процесу"""
+
+    def __init__(self, ttl, maxsize=1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[1] < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[0]
+
+    def set(self, snapshot):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[snapshot.id] = (snapshot, time.monotonic() + self.ttl)
+            self._entries.move_to_end(snapshot.id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def forget(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _cache():
+    return current_app.extensions.get('user_cache') if has_app_context() else None
+
+
+def snapshot_of(user):
+    return UserSnapshot(id=user.id, username=user.username, email=user.email, created_at=user.created_at)
+
+
+def remember_user(user):
+    """Кладе знімок щойно завантаженого користувача в кеш (наприклад, при вході)"""
+    cache = _cache()
+    if cache is not None:
+        cache.set(snapshot_of(user))
+
+
+def forget_user(user_id):
+    """Видаляє знімок; потрібен після масових UPDATE/DELETE, що оминають сесію"""
+    cache = _cache()
+    if cache is not None:
+        cache.forget(user_id)
+
+
+@login_manager.user_loader
+def load_user(user_id):
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+
+    cache = _cache()
+    snapshot = cache.get(user_id) if cache is not None else None
+    if snapshot is not None:
+        return snapshot
+
+    row = db.session.execute(
+        db.select(User.id, User.username, User.email, User.created_at).where(User.id == user_id)
+    ).first()
+    if row is None:
+        return None
+
+    snapshot = snapshot_of(row)
+    if cache is not None:
+        cache.set(snapshot)
+    return snapshot
+
+
+def user_data_version(user_id):
+    """User.data_version — не більше одного запиту за HTTP-запит"""
+    versions = g.setdefault('user_data_versions', {})
+    if user_id not in versions:
+        versions[user_id] = db.session.scalar(db.select(User.data_version).where(User.id == user_id))
+    return versions[user_id]
+
+
+# ============= ІНВАЛІДАЦІЯ =============
+
+@db.event.listens_for(User, 'after_update')
+def mark_updated_user(mapper, connection, target):
+    state = db.inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in SNAPSHOT_FIELDS):
+        state.session.info.setdefault('stale_users', set()).add(target.id)
+
+
+@db.event.listens_for(User, 'after_delete')
+def mark_deleted_user(mapper, connection, target):
+    db.inspect(target).session.info.setdefault('stale_users', set()).add(target.id)
+
+
+@db.event.listens_for(db.session, 'after_commit')
+def evict_stale_users(session):
+    stale = session.info.pop('stale_users', None)
+    if stale:
+        for user_id in stale:
+            forget_user(user_id)
+
+
+@db.event.listens_for(db.session, 'after_soft_rollback')
+def discard_stale_users(session, previous_transaction):
+    session.info.pop('stale_users', None)
+
+
+def init_user_cache(app):
+    app.extensions['user_cache'] = UserCache(app.config.get('USER_CACHE_TTL', 60),
+                                             app.config.get('USER_CACHE_SIZE', 1024))
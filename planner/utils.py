@@ -0,0 +1,38 @@
+"""Допоміжні функції для шаблонів та експорту"""
+
+
+def transliterate(text):
+    """Транслітерація українського тексту для PDF"""
+    if not text:
+        return text
+
+    translit_dict = {
+        'а': 'a', 'б': 'b', 'в': 'v', 'г': 'h', 'ґ': 'g', 'д': 'd', 'е': 'e', 'є': 'ie',
+        'ж': 'zh', 'з': 'z', 'и': 'y', 'і': 'i', 'ї': 'i', 'й': 'i', 'к': 'k', 'л': 'l',
+        'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
+        'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'shch', 'ь': '', 'ю': 'iu', 'я': 'ia',
+        'А': 'A', 'Б': 'B', 'В': 'V', 'Г': 'H', 'Ґ': 'G', 'Д': 'D', 'Е': 'E', 'Є': 'Ie',
+        'Ж': 'Zh', 'З': 'Z', 'И': 'Y', 'І': 'I', 'Ї': 'I', 'Й': 'I', 'К': 'K', 'Л': 'L',
+        'М': 'M', 'Н': 'N', 'О': 'O', 'П': 'P', 'Р': 'R', 'С': 'S', 'Т': 'T', 'У': 'U',
+        'Ф': 'F', 'Х': 'Kh', 'Ц': 'Ts', 'Ч': 'Ch', 'Ш': 'Sh', 'Щ': 'Shch', 'Ь': '', 'Ю': 'Iu', 'Я': 'Ia',
+        '✈': '', '️': '', '📅': '', '🎒': '', '📝': '', '✓': 'V', '☐': '[ ]'
+    }
+
+    result = []
+    for char in text:
+        result.append(translit_dict.get(char, char))
+    return ''.join(result)
+
+
+# Фільтр для відмінювання слів
+def plural_filter(number, form1, form2, form5):
+    n = abs(number)
+    n %= 100
+    if n >= 5 and n <= 20:
+        return form5
+    n %= 10
+    if n == 1:
+        return form1
+    if n >= 2 and n <= 4:
+        return form2
+    return form5
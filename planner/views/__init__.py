@@ -0,0 +1,11 @@
+"""Blueprint-и підсистем Travel Planner"""
+from planner.views import (
+    accommodations, ai, assets, auth, batch, export, main, map, metrics, notes, offline, packing, sync, transport,
+    trip_templates, trips,
+)
+
+BLUEPRINTS = (
+    main.bp, auth.bp, trips.bp, trip_templates.bp, packing.bp, notes.bp,
+    transport.bp, accommodations.bp, export.bp, ai.bp, map.bp, assets.bp,
+    offline.bp, sync.bp, batch.bp, metrics.bp,
+)
@@ -0,0 +1,195 @@
+"""Житло поїздки"""
+from datetime import datetime
+
+from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask_login import login_required, current_user
+
+from planner.conditional import conditional_trip_page
+from planner.extensions import db
+from planner.models import Accommodation, Trip
+
+
+bp = Blueprint('accommodations', __name__)
+
+
+# Список готелів
+@bp.route('/trip/<int:trip_id>/accommodations')
+@login_required
+@conditional_trip_page
+def accommodations_list(trip_id):
+    trip = Trip.query.get_or_404(trip_id)
+
+    if trip.user_id != current_user.id:
+        flash('У вас немає доступу до цієї поїздки', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    accommodations = Accommodation.query.filter_by(trip_id=trip.id).order_by(Accommodation.check_in).all()
+
+    # Статистика
+    total_cost = sum(acc.total_price for acc in accommodations)
+    total_nights = sum((acc.check_out - acc.check_in).days for acc in accommodations)
+
+    return render_template('accommodations_list.html',
+                           trip=trip,
+                           accommodations=accommodations,
+                           total_cost=total_cost,
+                           total_nights=total_nights)
+
+
+# Додавання готелю
+@bp.route('/trip/<int:trip_id>/accommodations/add', methods=['GET', 'POST'])
+@login_required
+def add_accommodation(trip_id):
+    trip = Trip.query.get_or_404(trip_id)
+
+    if trip.user_id != current_user.id:
+        flash('У вас немає доступу до цієї поїздки', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    if request.method == 'POST':
+        name = request.form.get('name', '').strip()
+        address = request.form.get('address', '').strip()
+        check_in_str = request.form.get('check_in')
+        check_out_str = request.form.get('check_out')
+        price_per_night = float(request.form.get('price_per_night', 0))
+        booking_reference = request.form.get('booking_reference', '').strip()
+        phone = request.form.get('phone', '').strip()
+        email = request.form.get('email', '').strip()
+        website = request.form.get('website', '').strip()
+        notes = request.form.get('notes', '').strip()
+        rating = float(request.form.get('rating', 0))
+        amenities = request.form.get('amenities', '').strip()
+        image_url = request.form.get('image_url', '').strip()
+        booking_status = request.form.get('booking_status', 'pending')
+
+        if not name or not check_in_str or not check_out_str:
+            flash('Назва та дати є обов\'язковими', 'danger')
+            return render_template('accommodation_form.html', trip=trip)
+
+        try:
+            check_in = datetime.strptime(check_in_str, '%Y-%m-%d')
+            check_out = datetime.strptime(check_out_str, '%Y-%m-%d')
+
+            if check_out <= check_in:
+                flash('Дата виїзду має бути пізніше дати заїзду', 'danger')
+                return render_template('accommodation_form.html', trip=trip)
+
+            # Обчислюємо загальну вартість
+            nights = (check_out - check_in).days
+            total_price = price_per_night * nights
+
+            new_accommodation = Accommodation(
+                name=name,
+                address=address,
+                check_in=check_in,
+                check_out=check_out,
+                price_per_night=price_per_night,
+                total_price=total_price,
+                booking_reference=booking_reference,
+                phone=phone,
+                email=email,
+                website=website,
+                notes=notes,
+                rating=rating,
+                amenities=amenities,
+                image_url=image_url,
+                booking_status=booking_status,
+                trip_id=trip.id
+            )
+
+            db.session.add(new_accommodation)
+            db.session.commit()
+
+            flash('Готель додано!', 'success')
+            return redirect(url_for('accommodations.accommodations_list', trip_id=trip.id))
+
+        except ValueError:
+            flash('Невірний формат даних', 'danger')
+            return render_template('accommodation_form.html', trip=trip)
+
+    return render_template('accommodation_form.html', trip=trip)
+
+
+# Редагування готелю
+@bp.route('/trip/<int:trip_id>/accommodations/<int:acc_id>/edit', methods=['GET', 'POST'])
+@login_required
+def edit_accommodation(trip_id, acc_id):
+    trip = Trip.query.get_or_404(trip_id)
+    accommodation = Accommodation.query.get_or_404(acc_id)
+
+    if trip.user_id != current_user.id or accommodation.trip_id != trip.id:
+        flash('У вас немає доступу', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    if request.method == 'POST':
+        accommodation.name = request.form.get('name', '').strip()
+        accommodation.address = request.form.get('address', '').strip()
+        check_in_str = request.form.get('check_in')
+        check_out_str = request.form.get('check_out')
+        accommodation.price_per_night = float(request.form.get('price_per_night', 0))
+        accommodation.booking_reference = request.form.get('booking_reference', '').strip()
+        accommodation.phone = request.form.get('phone', '').strip()
+        accommodation.email = request.form.get('email', '').strip()
+        accommodation.website = request.form.get('website', '').strip()
+        accommodation.notes = request.form.get('notes', '').strip()
+        accommodation.rating = float(request.form.get('rating', 0))
+        accommodation.amenities = request.form.get('amenities', '').strip()
+        accommodation.image_url = request.form.get('image_url', '').strip()
+        accommodation.booking_status = request.form.get('booking_status', 'pending')
+
+        try:
+            check_in = datetime.strptime(check_in_str, '%Y-%m-%d')
+            check_out = datetime.strptime(check_out_str, '%Y-%m-%d')
+
+            if check_out <= check_in:
+                flash('Дата виїзду має бути пізніше дати заїзду', 'danger')
+                return render_template('accommodation_form.html', trip=trip, accommodation=accommodation)
+
+            accommodation.check_in = check_in
+            accommodation.check_out = check_out
+
+            # Перерахунок загальної вартості
+            nights = (check_out - check_in).days
+            accommodation.total_price = accommodation.price_per_night * nights
+
+            db.session.commit()
+
+            flash('Готель оновлено!', 'success')
+            return redirect(url_for('accommodations.accommodations_list', trip_id=trip.id))
+
+        except ValueError:
+            flash('Невірний формат даних', 'danger')
+            return render_template('accommodation_form.html', trip=trip, accommodation=accommodation)
+
+    return render_template('accommodation_form.html', trip=trip, accommodation=accommodation)
+
+
+# Видалення готелю
+@bp.route('/trip/<int:trip_id>/accommodations/<int:acc_id>/delete', methods=['POST'])
+@login_required
+def delete_accommodation(trip_id, acc_id):
+    trip = Trip.query.get_or_404(trip_id)
+    accommodation = Accommodation.query.get_or_404(acc_id)
+
+    if trip.user_id != current_user.id or accommodation.trip_id != trip.id:
+        flash('У вас немає доступу', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    db.session.delete(accommodation)
+    db.session.commit()
+
+    flash('Готель видалено', 'info')
+    return redirect(url_for('accommodations.accommodations_list', trip_id=trip.id))
+
+
+# Пошук готелів (заготовка для API)
+@bp.route('/trip/<int:trip_id>/accommodations/search')
+@login_required
+def search_accommodations(trip_id):
+    trip = Trip.query.get_or_404(trip_id)
+
+    if trip.user_id != current_user.id:
+        flash('У вас немає доступу до цієї поїздки', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    return render_template('accommodations_search.html', trip=trip)
@@ -0,0 +1,601 @@
+"""AI асистент: чат, розмови та фонова генерація плану поїздки"""
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import Blueprint, Response, current_app, jsonify, render_template, request, stream_with_context, url_for
+from flask_login import login_required, current_user
+
+from assistant import itinerary, llm, memory
+from assistant.cache import CachePolicy, ResponseCache
+from assistant.context import TripContextBuilder
+from assistant.gateway import AIGateway, GatewayRejected
+from assistant.streaming import sse_stream
+from planner.config import (
+    AI_CACHE_DENY, AI_CACHE_ENABLED, AI_CACHE_MAX_ENTRIES, AI_CACHE_TTL, AI_CONTEXT_TOKENS,
+    AI_JOB_RETRIES, AI_JOB_TIMEOUT, AI_JOB_WORKERS, AI_MAX_IN_FLIGHT, AI_MAX_QUEUE,
+    AI_MEMORY_MAX_AGE_DAYS, AI_MEMORY_MAX_CONVERSATIONS, AI_MEMORY_MAX_MESSAGES, AI_MEMORY_SUMMARY,
+    AI_QUEUE_TIMEOUT, AI_RATE_BURST, AI_RATE_PER_MINUTE,
+)
+from planner.extensions import db
+from planner.instrumentation import external_call
+from planner.models import AIConversation, AIJob, AIMessage, Activity, Trip, assign_activity_positions, touch_trip
+
+
+bp = Blueprint('ai', __name__)
+
+
+@bp.route("/ai")
+@login_required
+def ai_page():
+    trips = Trip.query.filter_by(user_id=current_user.id).order_by(Trip.start_date.desc()).all()
+    return render_template("AI.html", trips=trips)
+
+
+# Налаштування моделі — див. assistant/llm.py (Gemini або локальний фейковий сервер)
+
+@bp.record_once
+def init_ai_stores(state):
+    """Сховища шлюзу та кешу в instance/ застосунку (спільні для всіх воркерів)"""
+    app = state.app
+
+    # Шлюз до моделі: обмежує одночасні виклики, чергу та частоту запитів користувача
+    app.extensions['ai_gateway'] = AIGateway(
+        os.path.join(app.instance_path, 'ai_gateway.db'),
+        max_in_flight=AI_MAX_IN_FLIGHT,
+        max_queue=AI_MAX_QUEUE,
+        queue_timeout=AI_QUEUE_TIMEOUT,
+        rate_per_minute=AI_RATE_PER_MINUTE,
+        burst=AI_RATE_BURST
+    )
+
+    # Кеш відповідей: однакові (після нормалізації) запити не звертаються до моделі
+    app.extensions['ai_cache'] = ResponseCache(
+        os.path.join(app.instance_path, 'ai_cache.db'),
+        ttl=AI_CACHE_TTL,
+        max_entries=AI_CACHE_MAX_ENTRIES,
+        namespace=llm.model_fingerprint()
+    )
+
+
+def ai_gateway():
+    return current_app.extensions['ai_gateway']
+
+
+def ai_cache():
+    return current_app.extensions['ai_cache']
+
+
+ai_cache_policy = CachePolicy(enabled=AI_CACHE_ENABLED, deny_patterns=AI_CACHE_DENY)
+
+
+def cached_ai_reply(user_message, personal_context=False):
+    """Повертає (cacheable, reply) — reply не None, якщо відповідь є в кеші"""
+    if not ai_cache_policy.is_cacheable(user_message, personal_context=personal_context):
+        ai_cache().record_bypass()
+        return False, None
+
+    return True, ai_cache().get(user_message)
+
+
+# Контекст вибраної поїздки (мемоізується за версією поїздки)
+trip_context_builder = TripContextBuilder(token_budget=AI_CONTEXT_TOKENS)
+
+
+def get_ai_trip(trip_id):
+    """Поїздка поточного користувача для контексту або None"""
+    if not trip_id:
+        return None
+
+    trip = Trip.query.get(int(trip_id))
+    if trip is None or trip.user_id != current_user.id:
+        return None
+    return trip
+
+
+def evict_ai_conversations(user_id):
+    """Видаляє застарілі розмови та найдавніші понад ліміт користувача"""
+    cutoff = datetime.now() - timedelta(days=AI_MEMORY_MAX_AGE_DAYS)
+
+    stale = db.session.query(AIConversation.id).filter(
+        AIConversation.user_id == user_id,
+        AIConversation.updated_at < cutoff
+    )
+    overflow = db.session.query(AIConversation.id).filter(
+        AIConversation.user_id == user_id
+    ).order_by(AIConversation.updated_at.desc()).offset(max(AI_MEMORY_MAX_CONVERSATIONS - 1, 0))
+
+    ids = {row.id for row in stale} | {row.id for row in overflow}
+    if ids:
+        AIMessage.query.filter(AIMessage.conversation_id.in_(ids)).delete(synchronize_session=False)
+        AIConversation.query.filter(AIConversation.id.in_(ids)).delete(synchronize_session=False)
+
+
+def open_ai_conversation(conversation_id, trip, user_message):
+    """Розмова з запиту або нова; None — якщо чужа чи не існує
+
+    Нова розмова не зберігається, доки немає відповіді (див. save_ai_turn):
+    відмова шлюзу чи помилка моделі не лишає порожніх розмов і не витісняє старі.
+    """
+    if conversation_id:
+        conversation = AIConversation.query.get(int(conversation_id))
+        if conversation is None or conversation.user_id != current_user.id:
+            return None
+        return conversation
+
+    return AIConversation(
+        user_id=current_user.id,
+        trip_id=trip.id if trip else None,
+        title=memory.clip(user_message, 80),
+        summary='',
+        summarized_until_id=0,
+        unsummarized_count=0,
+        message_count=0
+    )
+
+
+def recent_ai_messages(conversation):
+    """Незгорнуті репліки розмови (їх не більше вікна + порції згортання)"""
+    return AIMessage.query.filter(
+        AIMessage.conversation_id == conversation.id,
+        AIMessage.id > conversation.summarized_until_id
+    ).order_by(AIMessage.id).limit(memory.WINDOW_MESSAGES + memory.SUMMARY_BATCH + 2).all()
+
+
+def build_ai_contents(user_message, trip=None, conversation=None):
+    """Запит до моделі: повідомлення + контекст поїздки + пам'ять розмови"""
+    context = trip_context_builder.build(trip) if trip is not None else ''
+    # Ще не збережена розмова історії не має
+    stored = conversation is not None and conversation.id is not None
+    recent = recent_ai_messages(conversation) if stored else []
+    summary = conversation.summary if stored else ''
+
+    if not context and not recent and not summary:
+        return user_message
+
+    return memory.build_contents(user_message, recent, summary=summary, context=context)
+
+
+def save_ai_turn(conversation, user_message, reply):
+    """Зберігає запит і відповідь у розмові (нову розмову — разом з першою відповіддю)"""
+    if conversation.id is None:
+        evict_ai_conversations(conversation.user_id)
+        db.session.add(conversation)
+        db.session.flush()
+
+    db.session.add(AIMessage(conversation_id=conversation.id, role='user', content=user_message))
+    db.session.add(AIMessage(conversation_id=conversation.id, role='model', content=reply))
+    conversation.message_count = (conversation.message_count or 0) + 2
+    conversation.unsummarized_count = (conversation.unsummarized_count or 0) + 2
+    conversation.updated_at = datetime.now()
+    db.session.commit()
+
+
+def summarize_with_model(prompt):
+    """Оновлення змісту через модель (з урахуванням лімітів шлюзу)"""
+    with ai_gateway().acquire(current_user.id), external_call('llm'):
+        return llm.generate(prompt)
+
+
+def compact_ai_conversation(conversation):
+    """Згортає старші репліки в зміст і обрізає збережену історію"""
+    if not memory.needs_compaction(conversation.unsummarized_count or 0):
+        return
+
+    oldest = AIMessage.query.filter(
+        AIMessage.conversation_id == conversation.id,
+        AIMessage.id > conversation.summarized_until_id
+    ).order_by(AIMessage.id).limit(memory.compaction_size(conversation.unsummarized_count)).all()
+
+    if not oldest:
+        return
+
+    summarizer = summarize_with_model if AI_MEMORY_SUMMARY == 'llm' else None
+    conversation.summary = memory.rolling_summary(conversation.summary, oldest, summarizer)
+    conversation.summarized_until_id = oldest[-1].id
+    conversation.unsummarized_count -= len(oldest)
+
+    # Обмеження розміру: найстаріші вже згорнуті репліки понад ліміт видаляємо
+    keep_ids = db.session.query(AIMessage.id).filter(
+        AIMessage.conversation_id == conversation.id
+    ).order_by(AIMessage.id.desc()).limit(AI_MEMORY_MAX_MESSAGES)
+
+    deleted = AIMessage.query.filter(
+        AIMessage.conversation_id == conversation.id,
+        AIMessage.id <= conversation.summarized_until_id,
+        AIMessage.id.notin_(keep_ids.scalar_subquery())
+    ).delete(synchronize_session=False)
+    conversation.message_count -= deleted
+
+    db.session.commit()
+
+
+def ai_rejected_response(error):
+    """Швидка відповідь 429, якщо шлюз не пропустив запит до моделі"""
+    if error.reason == 'rate_limited':
+        reply = "⏳ Забагато запитів. Спробуйте трохи пізніше."
+    else:
+        reply = "⏳ Асистент зараз перевантажений, спробуйте за кілька секунд."
+
+    response = jsonify({"reply": reply, "reason": error.reason})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+
+def prepare_ai_request(data):
+    """Перевіряє запит до асистента
+
+    Повертає (user_message, trip, conversation, error_response).
+    """
+    user_message = data.get("message")
+    trip_id = data.get("trip_id")
+
+    if not llm.is_configured():
+        return None, None, None, (jsonify({"reply": "❌ Немає API ключа"}), 500)
+
+    if not user_message:
+        return None, None, None, (jsonify({"reply": "❌ Повідомлення порожнє"}), 400)
+
+    trip = get_ai_trip(trip_id)
+    if trip_id and trip is None:
+        return None, None, None, (jsonify({"reply": "❌ Поїздку не знайдено"}), 404)
+
+    conversation = open_ai_conversation(data.get("conversation_id"), trip, user_message)
+    if conversation is None:
+        return None, None, None, (jsonify({"reply": "❌ Розмову не знайдено"}), 404)
+
+    # Поїздка, вибрана на початку розмови, залишається її контекстом
+    if trip is None and conversation.trip_id:
+        trip = get_ai_trip(conversation.trip_id)
+
+    return user_message, trip, conversation, None
+
+
+@bp.route("/api/ai", methods=["POST"])
+@login_required
+def ai():
+    try:
+        user_message, trip, conversation, error = prepare_ai_request(request.json or {})
+        if error:
+            return error
+
+        personal_context = trip is not None or bool(conversation.message_count)
+        cacheable, reply = cached_ai_reply(user_message, personal_context=personal_context)
+
+        if reply is None:
+            contents = build_ai_contents(user_message, trip, conversation)
+
+            try:
+                lease = ai_gateway().acquire(current_user.id)
+            except GatewayRejected as e:
+                return ai_rejected_response(e)
+
+            # Генерація відповіді
+            with lease, external_call('llm'):
+                reply = llm.generate(contents)
+
+            if cacheable:
+                ai_cache().set(user_message, reply)
+            cached = False
+        else:
+            cached = True
+
+        save_ai_turn(conversation, user_message, reply)
+        compact_ai_conversation(conversation)
+
+        return jsonify({
+            "reply": reply,
+            "cached": cached,
+            "conversation_id": conversation.id
+        })
+
+    except Exception as e:
+        print("GEMINI ERROR:", e)
+        return jsonify({"reply": f"⚠️ Помилка сервера: {str(e)}"}), 500
+
+
+# Потокова відповідь (Server-Sent Events): токени надсилаються в міру генерації
+@bp.route("/api/ai/stream", methods=["POST"])
+@login_required
+def ai_stream():
+    user_message, trip, conversation, error = prepare_ai_request(request.get_json(silent=True) or {})
+    if error:
+        return error
+
+    personal_context = trip is not None or bool(conversation.message_count)
+    cacheable, cached_reply = cached_ai_reply(user_message, personal_context=personal_context)
+    meta = {'conversation_id': conversation.id}
+
+    def save_reply(reply):
+        if cacheable and cached_reply is None:
+            ai_cache().set(user_message, reply)
+        save_ai_turn(conversation, user_message, reply)
+        # Нова розмова отримує id лише тут; подія done надсилається після збереження
+        meta['conversation_id'] = conversation.id
+
+    if cached_reply is not None:
+        meta['cached'] = True
+
+        # Відповідь з кешу — без звернення до моделі та без слота шлюзу
+        def generate_events():
+            yield from sse_stream(iter([cached_reply]), on_complete=save_reply, meta=meta)
+            compact_ai_conversation(conversation)
+    else:
+        # Контекст будуємо до початку потоку, поки доступна сесія БД запиту
+        contents = build_ai_contents(user_message, trip, conversation)
+
+        try:
+            lease = ai_gateway().acquire(current_user.id)
+        except GatewayRejected as e:
+            return ai_rejected_response(e)
+
+        def generate_events():
+            # Слот звільняється і після завершення, і після обриву з'єднання клієнтом
+            try:
+                yield from sse_stream(llm.stream(contents), on_complete=save_reply, meta=meta)
+            finally:
+                lease.release()
+            # Згортання історії вже після того, як клієнт отримав відповідь
+            compact_ai_conversation(conversation)
+
+    response = Response(stream_with_context(generate_events()), mimetype='text/event-stream')
+    if cached_reply is None:
+        # Якщо клієнт відключився до початку тіла, генератор не стартує і його
+        # finally не виконається — слот звільняємо при закритті відповіді
+        # (release() повторно нічого не робить)
+        response.call_on_close(lease.release)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # вимикаємо буферизацію в nginx
+    return response
+
+
+# Історія розмов (сторінками, від найновішої)
+@bp.route("/api/ai/conversations")
+@login_required
+def ai_conversations():
+    page = request.args.get('page', 1, type=int)
+    per_page = min(request.args.get('per_page', 20, type=int), 100)
+
+    pagination = AIConversation.query.filter_by(user_id=current_user.id).order_by(
+        AIConversation.updated_at.desc()).paginate(page=page, per_page=per_page, error_out=False)
+
+    return jsonify({
+        'conversations': [{
+            'id': conversation.id,
+            'title': conversation.title,
+            'trip_id': conversation.trip_id,
+            'message_count': conversation.message_count,
+            'updated_at': conversation.updated_at.isoformat()
+        } for conversation in pagination.items],
+        'page': pagination.page,
+        'pages': pagination.pages,
+        'total': pagination.total
+    })
+
+
+# Повідомлення розмови: ?before=<id> повертає попередню сторінку (keyset)
+@bp.route("/api/ai/conversations/<int:conversation_id>/messages")
+@login_required
+def ai_conversation_messages(conversation_id):
+    conversation = AIConversation.query.get_or_404(conversation_id)
+
+    if conversation.user_id != current_user.id:
+        return {'success': False, 'error': 'Access denied'}, 403
+
+    limit = min(request.args.get('limit', 50, type=int), 200)
+    before = request.args.get('before', type=int)
+
+    query = AIMessage.query.filter_by(conversation_id=conversation.id)
+    if before:
+        query = query.filter(AIMessage.id < before)
+    messages = query.order_by(AIMessage.id.desc()).limit(limit + 1).all()
+
+    has_more = len(messages) > limit
+    messages = list(reversed(messages[:limit]))
+
+    return jsonify({
+        'conversation_id': conversation.id,
+        'title': conversation.title,
+        'trip_id': conversation.trip_id,
+        'summary': conversation.summary,
+        'messages': [{
+            'id': message.id,
+            'role': message.role,
+            'content': message.content,
+            'created_at': message.created_at.isoformat()
+        } for message in messages],
+        'next_before': messages[0].id if has_more and messages else None
+    })
+
+
+# Видалити розмову
+@bp.route("/api/ai/conversations/<int:conversation_id>", methods=["DELETE"])
+@login_required
+def delete_ai_conversation(conversation_id):
+    conversation = AIConversation.query.get_or_404(conversation_id)
+
+    if conversation.user_id != current_user.id:
+        return {'success': False, 'error': 'Access denied'}, 403
+
+    AIMessage.query.filter_by(conversation_id=conversation.id).delete()
+    db.session.delete(conversation)
+    db.session.commit()
+
+    return {'success': True}
+
+
+# ============= ФОНОВІ ЗАВДАННЯ AI =============
+
+# Виконуються поза запитом, стан зберігається в БД — опитувати можна з будь-якого воркера
+ai_job_executor = ThreadPoolExecutor(max_workers=AI_JOB_WORKERS, thread_name_prefix='ai-job')
+
+
+def ai_job_payload(job):
+    return {
+        'success': True,
+        'job_id': job.id,
+        'trip_id': job.trip_id,
+        'status': job.status,
+        'progress': job.progress,
+        'result_count': job.result_count,
+        'error': job.error,
+        'status_url': url_for('ai.ai_job_status', job_id=job.id)
+    }
+
+
+def expire_stale_ai_job(job):
+    """Завдання, що давно не оновлювалось (воркер перезапустився), вважаємо невдалим"""
+    if job.status in ('queued', 'running') and job.updated_at < datetime.now() - timedelta(seconds=AI_JOB_TIMEOUT):
+        job.status = 'failed'
+        job.error = 'Перевищено час виконання'
+        job.finished_at = datetime.now()
+        db.session.commit()
+
+
+def update_ai_job(job_id, **fields):
+    fields['updated_at'] = datetime.now()
+    AIJob.query.filter_by(id=job_id).update(fields)
+    db.session.commit()
+
+
+def acquire_job_lease(user_id):
+    """Слот шлюзу для фонового завдання: при відмові чекаємо замість помилки"""
+    for attempt in range(AI_JOB_RETRIES):
+        try:
+            return ai_gateway().acquire(user_id)
+        except GatewayRejected as e:
+            if attempt == AI_JOB_RETRIES - 1:
+                raise
+            time.sleep(min(e.retry_after, 30))
+
+
+def generate_itinerary_rows(job, trip, params):
+    """Генерує план порціями днів, оновлюючи прогрес завдання"""
+    start = trip.start_date.date()
+    total_days = min((trip.end_date.date() - start).days + 1, itinerary.MAX_DAYS)
+    context = trip_context_builder.build(trip)
+    chunks = itinerary.day_chunks(total_days)
+
+    rows = []
+    for index, (first_day, last_day) in enumerate(chunks):
+        prompt = itinerary.plan_prompt(context, start, first_day, last_day, params.get('preferences', ''))
+
+        # Одна повторна спроба, якщо модель повернула непридатний JSON
+        for attempt in range(2):
+            with acquire_job_lease(job.user_id):
+                text = llm.generate_json(prompt, itinerary.PLAN_SCHEMA)
+            try:
+                rows.extend(itinerary.parse_plan(text, start, first_day, last_day))
+                break
+            except itinerary.PlanError:
+                if attempt:
+                    raise
+
+        # Останні 10% — збереження
+        update_ai_job(job.id, progress=round((index + 1) / len(chunks) * 90))
+
+    return rows
+
+
+def save_itinerary(job, rows, replace=False):
+    """Зберігає план однією транзакцією: масова вставка активностей"""
+    if replace:
+        Activity.query.filter_by(trip_id=job.trip_id, completed=False).delete(synchronize_session=False)
+
+    now = datetime.now()
+    rows = [{**row, 'trip_id': job.trip_id, 'completed': False, 'created_at': now} for row in rows]
+    # Вручну впорядковані дні зберігають свій порядок: план стає в кінець дня
+    assign_activity_positions(db.session.connection(), job.trip_id, rows)
+    db.session.execute(db.insert(Activity), rows)
+    touch_trip(job.trip_id)
+
+    job.status = 'done'
+    job.progress = 100
+    job.result_count = len(rows)
+    job.finished_at = now
+    db.session.commit()
+
+
+def run_itinerary_job(app, job_id):
+    with app.app_context():
+        job = db.session.get(AIJob, job_id)
+        trip = db.session.get(Trip, job.trip_id)
+
+        try:
+            update_ai_job(job.id, status='running')
+            params = json.loads(job.params or '{}')
+
+            rows = generate_itinerary_rows(job, trip, params)
+            save_itinerary(job, rows, replace=params.get('replace', False))
+
+        except Exception as e:
+            db.session.rollback()
+            print("AI JOB ERROR:", e)
+            message = "Модель перевантажена, спробуйте пізніше" if isinstance(e, GatewayRejected) else str(e)
+            update_ai_job(job_id, status='failed', error=message[:500], finished_at=datetime.now())
+
+
+# Згенерувати план поїздки (фонове завдання)
+@bp.route('/api/trip/<int:trip_id>/itinerary', methods=['POST'])
+@login_required
+def generate_itinerary(trip_id):
+    trip = Trip.query.get_or_404(trip_id)
+
+    if trip.user_id != current_user.id:
+        return {'success': False, 'error': 'Access denied'}, 403
+
+    if not llm.is_configured():
+        return {'success': False, 'error': 'Немає API ключа'}, 500
+
+    # Для однієї поїздки одночасно виконується лише одне завдання
+    active = AIJob.query.filter(
+        AIJob.trip_id == trip.id,
+        AIJob.kind == 'itinerary',
+        AIJob.status.in_(('queued', 'running'))
+    ).first()
+    if active:
+        expire_stale_ai_job(active)
+        if active.status != 'failed':
+            return jsonify(ai_job_payload(active)), 202
+
+    data = request.get_json(silent=True) or {}
+    job = AIJob(
+        user_id=current_user.id,
+        trip_id=trip.id,
+        kind='itinerary',
+        params=json.dumps({
+            'preferences': memory.clip(data.get('preferences', ''), 500),
+            'replace': bool(data.get('replace'))
+        }, ensure_ascii=False)
+    )
+    db.session.add(job)
+    db.session.commit()
+
+    ai_job_executor.submit(run_itinerary_job, current_app._get_current_object(), job.id)
+
+    return jsonify(ai_job_payload(job)), 202
+
+
+# Стан фонового завдання (для опитування з браузера)
+@bp.route('/api/ai/jobs/<int:job_id>')
+@login_required
+def ai_job_status(job_id):
+    job = AIJob.query.get_or_404(job_id)
+
+    if job.user_id != current_user.id:
+        return {'success': False, 'error': 'Access denied'}, 403
+
+    expire_stale_ai_job(job)
+    return jsonify(ai_job_payload(job))
+
+
+# Метрики шлюзу (черга, слоти, час очікування, відмови) та кешу відповідей
+@bp.route("/api/ai/metrics")
+@login_required
+def ai_metrics():
+    metrics = ai_gateway().metrics()
+    metrics['cache'] = ai_cache().stats()
+    return jsonify(metrics)
@@ -0,0 +1,33 @@
+"""Зібрані статичні ресурси (static/dist) з довічним кешуванням"""
+import mimetypes
+import os
+
+from flask import Blueprint, current_app, request, send_from_directory
+
+from planner.assets import DIST_DIR
+
+bp = Blueprint('assets', __name__)
+
+# Ім'я файлу містить хеш вмісту, тому він ніколи не змінюється
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+@bp.route('/assets/<path:filename>')
+def asset(filename):
+    directory = os.path.join(current_app.static_folder, DIST_DIR)
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    # Попередньо стиснута версія, якщо браузер її приймає
+    for encoding, suffix in ENCODINGS:
+        if encoding in request.accept_encodings and os.path.isfile(os.path.join(directory, filename + suffix)):
+            response = send_from_directory(directory, filename + suffix, mimetype=mimetype)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(directory, filename, mimetype=mimetype)
+
+    response.headers['Cache-Control'] = IMMUTABLE
+    response.vary.add('Accept-Encoding')
+    return response
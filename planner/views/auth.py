@@ -0,0 +1,176 @@
+"""Реєстрація, вхід та профіль користувача"""
+from flask import Blueprint, render_template, redirect, url_for, flash, request, session
+from flask_login import login_user, logout_user, login_required, current_user
+
+from planner.extensions import db
+from planner.models import Activity, Trip, User
+from planner.passwords import VerificationRejected, hash_password, upgrade_hash, verify_password
+from planner.users import forget_user, remember_user
+
+
+bp = Blueprint('auth', __name__)
+
+
+# Реєстрація
+@bp.route('/register', methods=['GET', 'POST'])
+def register():
+    if current_user.is_authenticated:
+        return redirect(url_for('main.dashboard'))
+
+    if request.method == 'POST':
+        username = request.form.get('username')
+        email = request.form.get('email')
+        password = request.form.get('password')
+
+        # Перевірка чи існує користувач
+        user = User.query.filter_by(email=email).first()
+        if user:
+            flash('Email вже зареєстрований', 'danger')
+            return redirect(url_for('auth.register'))
+
+        # Створення нового користувача
+        new_user = User(
+            username=username,
+            email=email,
+            password=hash_password(password)
+        )
+
+        db.session.add(new_user)
+        db.session.commit()
+
+        flash('Реєстрація успішна! Тепер ви можете увійти.', 'success')
+        return redirect(url_for('auth.login'))
+
+    return render_template('register.html')
+
+
+# Вхід
+@bp.route('/login', methods=['GET', 'POST'])
+def login():
+    if current_user.is_authenticated:
+        return redirect(url_for('main.dashboard'))
+
+    if request.method == 'POST':
+        email = request.form.get('email')
+        password = request.form.get('password')
+
+        user = User.query.filter_by(email=email).first()
+
+        try:
+            valid = user is not None and verify_password(user.password, password)
+        except VerificationRejected as e:
+            flash('Забагато спроб входу одночасно. Спробуйте за кілька секунд.', 'warning')
+            return render_template('login.html'), 503, {'Retry-After': str(e.retry_after)}
+
+        if valid:
+            # Хеш за старою політикою — перехешовуємо, поки відомий пароль
+            try:
+                if upgrade_hash(user, password):
+                    db.session.commit()
+            except VerificationRejected:
+                pass  # Спробуємо при наступному вході
+
+            login_user(user, remember=True)
+            remember_user(user)
+            session.permanent = True  # ← Робить сесію постійною
+            flash('Ви успішно увійшли!', 'success')
+            return redirect(url_for('main.dashboard'))
+        else:
+            flash('Невірний email або пароль', 'danger')
+
+    return render_template('login.html')
+
+
+# Вихід
+@bp.route('/logout')
+@login_required
+def logout():
+    logout_user()
+    flash('Ви вийшли з системи', 'info')
+    return redirect(url_for('main.index'))
+
+
+# Профіль користувача
+@bp.route('/profile', methods=['GET', 'POST'])
+@login_required
+def user_profile():
+    if request.method == 'POST':
+        username = request.form.get('username', '').strip()
+        email = request.form.get('email', '').strip()
+
+        if not username or not email:
+            flash('Ім\'я та email є обов\'язковими', 'danger')
+            return render_template('user_profile.html')
+
+        # Перевірка унікальності email (якщо змінився)
+        if email != current_user.email:
+            existing_user = User.query.filter_by(email=email).first()
+            if existing_user:
+                flash('Цей email вже використовується', 'danger')
+                return render_template('user_profile.html')
+
+        # Перевірка унікальності username (якщо змінився)
+        if username != current_user.username:
+            existing_user = User.query.filter_by(username=username).first()
+            if existing_user:
+                flash('Це ім\'я користувача вже зайняте', 'danger')
+                return render_template('user_profile.html')
+
+        # current_user — незмінний знімок, тож редагуємо запис з БД
+        user = db.session.get(User, current_user.id)
+        user.username = username
+        user.email = email
+
+        # Зміна паролю (якщо вказано)
+        new_password = request.form.get('new_password', '').strip()
+        if new_password:
+            current_password = request.form.get('current_password', '').strip()
+
+            try:
+                valid = verify_password(user.password, current_password)
+            except VerificationRejected:
+                db.session.rollback()
+                flash('Сервер перевантажений. Спробуйте за кілька секунд.', 'warning')
+                return redirect(url_for('auth.user_profile'))
+
+            if not valid:
+                db.session.rollback()
+                flash('Невірний поточний пароль', 'danger')
+                return render_template('user_profile.html')
+
+            user.password = hash_password(new_password)
+
+        db.session.commit()
+        flash('Профіль оновлено!', 'success')
+        return redirect(url_for('auth.user_profile'))
+
+    # Статистика користувача
+    total_trips = Trip.query.filter_by(user_id=current_user.id).count()
+    total_activities = Activity.query.join(Trip).filter(Trip.user_id == current_user.id).count()
+    total_spent = db.session.query(db.func.sum(Activity.cost)).join(Trip).filter(
+        Trip.user_id == current_user.id).scalar() or 0
+
+    # Останні поїздки
+    recent_trips = Trip.query.filter_by(user_id=current_user.id).order_by(Trip.created_at.desc()).limit(5).all()
+
+    return render_template('user_profile.html',
+                           total_trips=total_trips,
+                           total_activities=total_activities,
+                           total_spent=total_spent,
+                           recent_trips=recent_trips)
+
+
+# Видалення акаунту
+@bp.route('/delete-account', methods=['POST'])
+@login_required
+def delete_account():
+    user_id = current_user.id
+
+    # Видаляємо користувача (всі пов'язані дані видаляться автоматично через cascade)
+    User.query.filter_by(id=user_id).delete()
+    db.session.commit()
+    forget_user(user_id)
+
+    logout_user()
+    flash('Ваш акаунт було видалено', 'info')
+    return redirect(url_for('main.index'))
@@ -0,0 +1,33 @@
+"""API пакетних змін дочірніх записів поїздки"""
+from flask import Blueprint, request
+from flask_login import login_required, current_user
+
+from planner.batch import BATCH_LIMIT, apply_batch, validate_batch
+from planner.models import Trip
+
+bp = Blueprint('batch', __name__)
+
+
+# Кілька створень, змін і видалень за один запит і одну транзакцію
+@bp.route('/api/trip/<int:trip_id>/batch', methods=['POST'])
+@login_required
+def trip_batch(trip_id):
+    trip = Trip.query.get_or_404(trip_id)
+
+    if trip.user_id != current_user.id:
+        return {'success': False, 'error': 'Access denied'}, 403
+
+    data = request.get_json(silent=True) or {}
+    operations = data.get('operations')
+
+    if not isinstance(operations, list) or not operations:
+        return {'success': False, 'error': 'Очікується список operations'}, 400
+    if len(operations) > BATCH_LIMIT:
+        return {'success': False, 'error': f'Не більше {BATCH_LIMIT} операцій за один запит'}, 400
+
+    parsed, errors = validate_batch(trip, operations)
+    if errors:
+        return {'success': False, 'error': 'Пакет не застосовано', 'errors': errors}, 400
+
+    results = apply_batch(trip, parsed)
+    return {'success': True, 'results': results, 'version': trip.version}
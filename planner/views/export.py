@@ -0,0 +1,457 @@
+"""Експорт поїздки в PDF"""
+import importlib
+import os
+from io import BytesIO
+
+from flask import Blueprint, current_app, redirect, url_for, flash, send_file
+from flask_login import login_required, current_user
+
+from planner.currency import CURRENCY_SYMBOLS
+from planner.models import PackingItem, Transport, Trip, TripDestination
+
+
+bp = Blueprint('export', __name__)
+
+# Модулі ReportLab, що імпортує export_trip_pdf
+PDF_MODULES = (
+    'reportlab.lib.colors', 'reportlab.lib.enums', 'reportlab.lib.pagesizes',
+    'reportlab.lib.styles', 'reportlab.lib.units', 'reportlab.platypus',
+)
+
+# (звичайний, жирний) після першої реєстрації шрифтів у процесі
+_pdf_fonts = None
+
+
+def register_pdf_fonts(font_dir):
+    """Реєструє шрифти DejaVu (з кирилицею) один раз на процес"""
+    global _pdf_fonts
+
+    if _pdf_fonts is None:
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+
+        try:
+            pdfmetrics.registerFont(TTFont('DejaVu', os.path.join(font_dir, 'DejaVuSans.ttf')))
+            pdfmetrics.registerFont(TTFont('DejaVu-Bold', os.path.join(font_dir, 'DejaVuSans-Bold.ttf')))
+            _pdf_fonts = ('DejaVu', 'DejaVu-Bold')
+        except Exception as e:
+            print(f"Шрифти DejaVu недоступні, використовується Helvetica: {e}")
+            _pdf_fonts = ('Helvetica', 'Helvetica-Bold')
+
+    return _pdf_fonts
+
+
+def preload_pdf_toolkit(font_dir):
+    """Імпортує ReportLab, реєструє шрифти та будує базові стилі заздалегідь"""
+    for module in PDF_MODULES:
+        importlib.import_module(module)
+
+    from reportlab.lib.styles import getSampleStyleSheet
+
+    register_pdf_fonts(font_dir)
+    getSampleStyleSheet()
+
+
+@bp.route('/trip/<int:trip_id>/export/pdf')
+@login_required
+def export_trip_pdf(trip_id):
+    trip = Trip.query.get_or_404(trip_id)
+
+    if trip.user_id != current_user.id:
+        flash('У вас немає доступу до цієї поїздки', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    # ReportLab завантажується лише при першому експорті, а не при старті воркера
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import cm
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        rightMargin=1.5 * cm,
+        leftMargin=1.5 * cm,
+        topMargin=1.5 * cm,
+        bottomMargin=1.5 * cm
+    )
+
+    elements = []
+
+    # Шрифт
+    font_name, font_bold = register_pdf_fonts(os.path.join(current_app.static_folder, 'fonts'))
+
+    # Стилі
+    styles = getSampleStyleSheet()
+
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=32,
+        fontName=font_bold,
+        textColor=colors.HexColor('#667eea'),
+        spaceAfter=10,
+        alignment=TA_CENTER,
+        leading=38
+    )
+
+    subtitle_style = ParagraphStyle(
+        'Subtitle',
+        parent=styles['Normal'],
+        fontSize=16,
+        fontName=font_name,
+        textColor=colors.HexColor('#718096'),
+        spaceAfter=30,
+        alignment=TA_CENTER
+    )
+
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=20,
+        fontName=font_bold,
+        textColor=colors.white,
+        spaceAfter=15,
+        spaceBefore=25,
+        backColor=colors.HexColor('#667eea'),
+        borderPadding=10,
+        borderRadius=5
+    )
+
+    normal_style = ParagraphStyle(
+        'CustomNormal',
+        parent=styles['Normal'],
+        fontName=font_name,
+        fontSize=10,
+        leading=14
+    )
+
+    # ========== ОБКЛАДИНКА ==========
+
+    icon_style = ParagraphStyle(
+        'Icon',
+        parent=styles['Normal'],
+        fontSize=60,
+        alignment=TA_CENTER,
+        spaceAfter=20
+    )
+    elements.append(Paragraph(trip.title, title_style))
+
+    subtitle_text = f"{trip.destination}"
+    elements.append(Paragraph(subtitle_text, subtitle_style))
+
+    line = Table([['']], colWidths=[18 * cm])
+    line.setStyle(TableStyle([
+        ('LINEABOVE', (0, 0), (-1, 0), 3, colors.HexColor('#667eea')),
+    ]))
+    elements.append(line)
+    elements.append(Spacer(1, 0.5 * cm))
+
+    # ========== ІНФОРМАЦІЙНА КАРТКА ==========
+
+    trip_duration = (trip.end_date - trip.start_date).days + 1
+
+    info_card_data = [
+        [
+            Paragraph('<b>ДАТИ</b>', normal_style),
+            Paragraph(f'{trip.start_date.strftime("%d.%m.%Y")} - {trip.end_date.strftime("%d.%m.%Y")}', normal_style)
+        ],
+        [
+            Paragraph('<b>ТРИВАЛІСТЬ</b>', normal_style),
+            Paragraph(f'{trip_duration} днів', normal_style)
+        ],
+        [
+            Paragraph('<b>БЮДЖЕТ</b>', normal_style),
+            Paragraph(f'{trip.budget:.2f} {CURRENCY_SYMBOLS.get(trip.currency, trip.currency)}', normal_style)
+        ],
+    ]
+
+    info_card = Table(info_card_data, colWidths=[5 * cm, 13 * cm])
+    info_card.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#edf2f7')),
+        ('BACKGROUND', (1, 0), (1, -1), colors.white),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2d3748')),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('FONTNAME', (0, 0), (-1, -1), font_name),
+        ('FONTSIZE', (0, 0), (-1, -1), 11),
+        ('LEFTPADDING', (0, 0), (-1, -1), 15),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 15),
+        ('TOPPADDING', (0, 0), (-1, -1), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('GRID', (0, 0), (-1, -1), 1.5, colors.HexColor('#cbd5e0')),
+    ]))
+
+    elements.append(info_card)
+    elements.append(Spacer(1, 1 * cm))
+
+    # ========== МІСТА ПОЇЗДКИ ==========
+
+    destinations = TripDestination.query.filter_by(trip_id=trip_id).order_by(TripDestination.order).all()
+
+    if destinations:
+        elements.append(Paragraph("МІСТА ПОЇЗДКИ", heading_style))
+        elements.append(Spacer(1, 0.3 * cm))
+
+        dest_data = []
+        for i, dest in enumerate(destinations, 1):
+            dest_data.append([
+                Paragraph(f'<b>{i}</b>', normal_style),
+                Paragraph(f'<b>{dest.city}</b>', normal_style),
+                Paragraph(dest.country, normal_style),
+                Paragraph(
+                    f'{dest.arrival_date.strftime("%d.%m") if dest.arrival_date else "—"} - {dest.departure_date.strftime("%d.%m") if dest.departure_date else "—"}',
+                    normal_style)
+            ])
+
+        dest_table = Table(dest_data, colWidths=[1.5 * cm, 7 * cm, 5 * cm, 4.5 * cm])
+        dest_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#667eea')),
+            ('TEXTCOLOR', (0, 0), (0, -1), colors.white),
+            ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, -1), font_name),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('LEFTPADDING', (0, 0), (-1, -1), 10),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
+            ('ROWBACKGROUNDS', (1, 0), (-1, -1), [colors.white, colors.HexColor('#f7fafc')])
+        ]))
+
+        elements.append(dest_table)
+        elements.append(Spacer(1, 0.5 * cm))
+
+    # ========== ТРАНСПОРТ ==========
+
+    transports = Transport.query.filter_by(trip_id=trip_id).order_by(Transport.departure_date).all()
+
+    if transports:
+        elements.append(Paragraph(" ТРАНСПОРТ ТА МАРШРУТИ", heading_style))
+        elements.append(Spacer(1, 0.3 * cm))
+
+        transport_icons = {
+            'plane': '',
+            'train': '',
+            'bus': '',
+            'car': '',
+            'ferry': ''
+        }
+
+        for transport in transports:
+            icon = transport_icons.get(transport.type, '•')
+
+            transport_data = [[
+                Paragraph(f'<b>{icon} {transport.from_location} → {transport.to_location}</b>', normal_style),
+                Paragraph(f'{transport.cost:.0f} грн' if transport.cost > 0 else '—', normal_style)
+            ]]
+
+            transport_info = f'{transport.departure_date.strftime("%d.%m.%Y %H:%M")}'
+            if transport.arrival_date:
+                transport_info += f' → {transport.arrival_date.strftime("%d.%m.%Y %H:%M")}'
+            if transport.carrier:
+                transport_info += f' • {transport.carrier}'
+
+            transport_data.append([
+                Paragraph(f'<i>{transport_info}</i>', ParagraphStyle('Small', parent=normal_style, fontSize=9,
+                                                                     textColor=colors.HexColor('#718096'))),
+                ''
+            ])
+
+            transport_table = Table(transport_data, colWidths=[15 * cm, 3 * cm])
+            transport_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f7fafc')),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                ('LEFTPADDING', (0, 0), (-1, -1), 10),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 10),
+                ('TOPPADDING', (0, 0), (-1, -1), 8),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+                ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#cbd5e0'))
+            ]))
+
+            elements.append(transport_table)
+            elements.append(Spacer(1, 0.3 * cm))
+
+    # ========== МАРШРУТ ПОДОРОЖІ ==========
+
+    from collections import defaultdict
+    activities_by_day = defaultdict(list)
+
+    for activity in trip.activities:
+        activity_date = activity.date.date() if hasattr(activity.date, 'date') else activity.date
+        activities_by_day[activity_date].append(activity)
+
+    if activities_by_day:
+        elements.append(PageBreak())
+        elements.append(Paragraph(" ПЛАН ПОДОРОЖІ", heading_style))
+        elements.append(Spacer(1, 0.3 * cm))
+
+        trip_start = trip.start_date.date() if hasattr(trip.start_date, 'date') else trip.start_date
+
+        for day_date in sorted(activities_by_day.keys()):
+            day_activities = activities_by_day[day_date]
+            day_num = (day_date - trip_start).days + 1
+
+            day_heading = ParagraphStyle(
+                'DayHeading',
+                parent=normal_style,
+                fontSize=14,
+                fontName=font_bold,
+                textColor=colors.HexColor('#2d3748'),
+                spaceAfter=10,
+                spaceBefore=15,
+                leftIndent=10,
+                backColor=colors.HexColor('#edf2f7'),
+                borderPadding=8
+            )
+
+            day_title = f"День {day_num} • {day_date.strftime('%d %B %Y')}"
+            elements.append(Paragraph(day_title, day_heading))
+            elements.append(Spacer(1, 0.2 * cm))
+
+            activities_data = []
+
+            for activity in day_activities:
+                time_cell = Paragraph(
+                    f'<b>{activity.time or "—"}</b>',
+                    normal_style
+                )
+
+                title_cell = Paragraph(
+                    f'<b>{activity.title}</b>',
+                    normal_style
+                )
+
+                location_cell = Paragraph(
+                    f' {activity.location}' if activity.location else '—',
+                    ParagraphStyle('Location', parent=normal_style, textColor=colors.HexColor('#718096'))
+                )
+
+                cost_cell = Paragraph(
+                    f'<b>{activity.cost:.0f} грн</b>' if activity.cost else '—',
+                    ParagraphStyle('Cost', parent=normal_style, textColor=colors.HexColor('#48bb78'))
+                )
+
+                activities_data.append([time_cell, title_cell, location_cell, cost_cell])
+
+            if activities_data:
+                activities_table = Table(activities_data, colWidths=[2 * cm, 8 * cm, 5 * cm, 3 * cm])
+                activities_table.setStyle(TableStyle([
+                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                    ('FONTNAME', (0, 0), (-1, -1), font_name),
+                    ('FONTSIZE', (0, 0), (-1, -1), 10),
+                    ('LEFTPADDING', (0, 0), (-1, -1), 10),
+                    ('RIGHTPADDING', (0, 0), (-1, -1), 10),
+                    ('TOPPADDING', (0, 0), (-1, -1), 10),
+                    ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+                    ('BACKGROUND', (0, 0), (-1, -1), colors.white),
+                    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
+                    ('ROWBACKGROUNDS', (0, 0), (-1, -1), [colors.white, colors.HexColor('#f7fafc')])
+                ]))
+
+                elements.append(activities_table)
+                elements.append(Spacer(1, 0.4 * cm))
+
+    # ========== PACKING LIST ==========
+
+    packing_items = PackingItem.query.filter_by(trip_id=trip.id).all()
+
+    if packing_items:
+        elements.append(PageBreak())
+        elements.append(Paragraph("СПИСОК РЕЧЕЙ", heading_style))
+        elements.append(Spacer(1, 0.3 * cm))
+
+        items_by_category = defaultdict(list)
+
+        category_names = {
+            'clothes': ' Одяг',
+            'toiletries': ' Засоби особистої гігієни',
+            'electronics': ' Електроніка',
+            'documents': ' Документи',
+            'other': ' Інше'
+        }
+
+        for item in packing_items:
+            cat_name = category_names.get(item.category, item.category)
+            items_by_category[cat_name].append(item)
+
+        for category in sorted(items_by_category.keys()):
+            items = items_by_category[category]
+
+            cat_heading = ParagraphStyle(
+                'CategoryHeading',
+                parent=normal_style,
+                fontSize=12,
+                fontName=font_bold,
+                textColor=colors.HexColor('#4a5568'),
+                spaceAfter=8,
+                spaceBefore=12
+            )
+            elements.append(Paragraph(category, cat_heading))
+
+            packing_data = []
+
+            for item in items:
+                checkbox = '☑' if item.is_packed else '☐'
+                item_style = ParagraphStyle(
+                    'ItemStyle',
+                    parent=normal_style,
+                    textColor=colors.HexColor('#a0aec0') if item.is_packed else colors.HexColor('#2d3748')
+                )
+
+                packing_data.append([
+                    Paragraph(checkbox, normal_style),
+                    Paragraph(item.name, item_style),
+                    Paragraph(f'x{item.quantity}', item_style)
+                ])
+
+            packing_table = Table(packing_data, colWidths=[1 * cm, 15 * cm, 2 * cm])
+            packing_table.setStyle(TableStyle([
+                ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+                ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+                ('ALIGN', (2, 0), (2, -1), 'CENTER'),
+                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ('FONTNAME', (0, 0), (-1, -1), font_name),
+                ('FONTSIZE', (0, 0), (-1, -1), 10),
+                ('LEFTPADDING', (0, 0), (-1, -1), 8),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+                ('TOPPADDING', (0, 0), (-1, -1), 6),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+                ('BACKGROUND', (0, 0), (-1, -1), colors.white)
+            ]))
+
+            elements.append(packing_table)
+            elements.append(Spacer(1, 0.2 * cm))
+
+    # ========== ФУТЕР ==========
+
+    elements.append(Spacer(1, 1.5 * cm))
+    elements.append(line)
+    elements.append(Spacer(1, 0.3 * cm))
+
+    footer_style = ParagraphStyle(
+        'Footer',
+        parent=styles['Normal'],
+        fontName=font_name,
+        fontSize=9,
+        textColor=colors.HexColor('#a0aec0'),
+        alignment=TA_CENTER
+    )
+
+
+    # Генеруємо PDF
+    doc.build(elements)
+
+    buffer.seek(0)
+    filename = f"trip_{trip.title.replace(' ', '_')}_{trip.start_date.strftime('%Y%m%d')}.pdf"
+
+    return send_file(
+        buffer,
+        mimetype='application/pdf',
+        as_attachment=True,
+        download_name=filename
+    )
@@ -0,0 +1,614 @@
+"""Головна, дашборд, календар, пошук та інші загальні сторінки"""
+from flask import Blueprint, render_template, url_for, request
+from flask_login import login_required, current_user
+
+from planner.achievements import ACHIEVEMENTS, get_user_level
+from planner.currency import CURRENCY_RATES, CURRENCY_SYMBOLS, get_live_exchange_rates
+from planner.extensions import db
+from planner.fragments import lazy_context
+from planner.models import Accommodation, Activity, Trip, TripNote, UserAchievement
+
+
+bp = Blueprint('main', __name__)
+
+
+# Головна сторінка
+@bp.route('/')
+def index():
+    return render_template('index.html')
+
+
+def dashboard_stats(user_id, trips):
+    """Агрегати для плиток, топу напрямків і графіка дашборду
+
+    Викликається через lazy_context лише тоді, коли кешованих фрагментів
+    для поточної версії даних користувача ще немає.
+    """
+    # Суми та кількості одним запитом на таблицю: по поїздках і місяцях
+    activity_month = db.func.strftime('%Y-%m', Activity.date)
+    activity_rows = db.session.query(
+        Activity.trip_id,
+        activity_month,
+        db.func.coalesce(db.func.sum(Activity.cost), 0),
+        db.func.count(Activity.id),
+        db.func.sum(db.case((Activity.completed, 1), else_=0)),
+    ).join(Trip).filter(Trip.user_id == user_id).group_by(Activity.trip_id, activity_month).all()
+
+    accommodation_month = db.func.strftime('%Y-%m', Accommodation.check_in)
+    accommodation_rows = db.session.query(
+        Accommodation.trip_id,
+        accommodation_month,
+        db.func.coalesce(db.func.sum(Accommodation.total_price), 0),
+        db.func.count(Accommodation.id),
+    ).join(Trip).filter(Trip.user_id == user_id).group_by(Accommodation.trip_id, accommodation_month).all()
+
+    spent_by_trip = {}
+    monthly_expenses = {}
+    total_activities = 0
+    completed_activities = 0
+    for trip_id, month_key, cost, count, completed in activity_rows:
+        spent_by_trip[trip_id] = spent_by_trip.get(trip_id, 0) + cost
+        monthly_expenses[month_key] = monthly_expenses.get(month_key, 0) + cost
+        total_activities += count
+        completed_activities += completed or 0
+
+    total_accommodations = 0
+    for trip_id, month_key, price, count in accommodation_rows:
+        spent_by_trip[trip_id] = spent_by_trip.get(trip_id, 0) + price
+        monthly_expenses[month_key] = monthly_expenses.get(month_key, 0) + price
+        total_accommodations += count
+
+    # Витрати
+    total_spent = 0
+    total_budget = 0
+    for trip in trips:
+        total_spent += spent_by_trip.get(trip.id, 0)
+        total_budget += trip.budget
+
+    # Кількість днів подорожей
+    total_days = 0
+    for trip in trips:
+        days = (trip.end_date - trip.start_date).days + 1
+        total_days += days
+
+    # Відвідані країни та міста
+    destinations = [trip.destination for trip in trips]
+    unique_destinations = len(set(destinations))
+
+    # Топ-5 напрямків
+    destination_count = {}
+    for trip in trips:
+        if trip.destination in destination_count:
+            destination_count[trip.destination] += 1
+        else:
+            destination_count[trip.destination] = 1
+
+    top_destinations = sorted(destination_count.items(), key=lambda x: x[1], reverse=True)[:5]
+
+    # Витрати по місяцях (останні 6 місяців)
+    # Сортуємо по датах
+    sorted_months = sorted(monthly_expenses.items())[-6:]
+
+    # Форматуємо назви місяців
+    month_names = {
+        '01': 'Січ', '02': 'Лют', '03': 'Бер', '04': 'Кві',
+        '05': 'Тра', '06': 'Чер', '07': 'Лип', '08': 'Сер',
+        '09': 'Вер', '10': 'Жов', '11': 'Лис', '12': 'Гру'
+    }
+
+    monthly_data = []
+    for month_key, amount in sorted_months:
+        year, month = month_key.split('-')
+        month_label = f"{month_names[month]} {year}"
+        monthly_data.append({'month': month_label, 'amount': amount})
+
+    return {
+        'total_spent': total_spent,
+        'total_budget': total_budget,
+        'total_days': total_days,
+        'unique_destinations': unique_destinations,
+        'total_activities': total_activities,
+        'completed_activities': completed_activities,
+        'total_accommodations': total_accommodations,
+        'top_destinations': top_destinations,
+        'monthly_data': monthly_data,
+    }
+
+
+# Особистий кабінет
+# Dashboard з розширеною статистикою
+@bp.route('/dashboard')
+@login_required
+def dashboard():
+    from datetime import datetime, date
+
+    # Отримуємо параметри пошуку та фільтрації
+    search_query = request.args.get('search', '').strip()
+    sort_by = request.args.get('sort', 'date_desc')
+    filter_status = request.args.get('status', 'all')
+
+    # Базовий запит
+    query = Trip.query.filter_by(user_id=current_user.id)
+
+    # Пошук по назві або напрямку
+    if search_query:
+        # Конвертуємо в нижній регістр для порівняння
+        all_user_trips = Trip.query.filter_by(user_id=current_user.id).all()
+        search_lower = search_query.lower()
+
+        filtered = []
+        for trip in all_user_trips:
+            if (search_lower in trip.title.lower() or
+                    search_lower in trip.destination.lower()):
+                filtered.append(trip)
+
+        # Створюємо query з filtered trips
+        if filtered:
+            trip_ids = [t.id for t in filtered]
+            query = Trip.query.filter(Trip.id.in_(trip_ids))
+        else:
+            # Якщо нічого не знайдено, повертаємо порожній результат
+            query = Trip.query.filter(Trip.id == -1)
+    else:
+        query = Trip.query.filter_by(user_id=current_user.id)
+
+    # Сортування
+    if sort_by == 'date_desc':
+        query = query.order_by(Trip.start_date.desc())
+    elif sort_by == 'date_asc':
+        query = query.order_by(Trip.start_date.asc())
+    elif sort_by == 'budget_desc':
+        query = query.order_by(Trip.budget.desc())
+    elif sort_by == 'budget_asc':
+        query = query.order_by(Trip.budget.asc())
+    elif sort_by == 'title':
+        query = query.order_by(Trip.title.asc())
+
+    all_trips = query.all()
+
+    # Фільтрація по статусу (майбутні/минулі)
+    today = date.today()
+
+    if filter_status == 'upcoming':
+        trips = [t for t in all_trips if
+                 (t.start_date.date() if isinstance(t.start_date, datetime) else t.start_date) >= today]
+    elif filter_status == 'past':
+        trips = [t for t in all_trips if
+                 (t.end_date.date() if isinstance(t.end_date, datetime) else t.end_date) < today]
+    else:
+        trips = all_trips
+
+    # Загальна статистика
+    total_trips = len(trips)
+
+    # Майбутні поїздки
+    upcoming_trips = []
+    past_trips = []
+    for trip in trips:
+        # Конвертуємо datetime в date якщо потрібно
+        start = trip.start_date.date() if isinstance(trip.start_date, datetime) else trip.start_date
+        end = trip.end_date.date() if isinstance(trip.end_date, datetime) else trip.end_date
+
+        if start >= today:
+            upcoming_trips.append(trip)
+        elif end < today:
+            past_trips.append(trip)
+
+    # Плитки, топ і графік залежать від набору поїздок (фільтр, пошук, дата)
+    # та від версії даних користувача; сортування на них не впливає
+    stats_key = [current_user.id, filter_status, search_query, today.isoformat()]
+
+    return render_template('dashboard.html',
+                           trips=trips,
+                           total_trips=total_trips,
+                           stats=lazy_context(dashboard_stats, current_user.id, trips),
+                           stats_key=stats_key,
+                           data_version=current_user.data_version,
+                           upcoming_trips=upcoming_trips,
+                           past_trips=past_trips,
+                           today=today,
+                           search_query=search_query,
+                           sort_by=sort_by,
+                           filter_status=filter_status)
+
+
+# Мої поїздки (окрема сторінка)
+@bp.route('/my-trips')
+@login_required
+def my_trips():
+    from datetime import datetime, date
+
+    # Отримуємо параметри пошуку та фільтрації
+    search_query = request.args.get('search', '').strip()
+    sort_by = request.args.get('sort', 'date_desc')
+    filter_status = request.args.get('status', 'all')
+
+    # Отримуємо всі поїздки користувача
+    all_user_trips = Trip.query.filter_by(user_id=current_user.id).all()
+
+    # Пошук
+    if search_query:
+        search_lower = search_query.lower()
+        all_user_trips = [
+            trip for trip in all_user_trips
+            if search_lower in trip.title.lower() or
+               search_lower in trip.destination.lower()
+        ]
+
+    # Сортування
+    if sort_by == 'date_desc':
+        all_user_trips.sort(key=lambda x: x.start_date, reverse=True)
+    elif sort_by == 'date_asc':
+        all_user_trips.sort(key=lambda x: x.start_date)
+    elif sort_by == 'budget_desc':
+        all_user_trips.sort(key=lambda x: x.budget, reverse=True)
+    elif sort_by == 'budget_asc':
+        all_user_trips.sort(key=lambda x: x.budget)
+    elif sort_by == 'title':
+        all_user_trips.sort(key=lambda x: x.title.lower())
+
+    # Фільтрація по статусу
+    today = date.today()
+
+    if filter_status == 'upcoming':
+        trips = [t for t in all_user_trips if
+                 (t.start_date.date() if isinstance(t.start_date, datetime) else t.start_date) >= today]
+    elif filter_status == 'past':
+        trips = [t for t in all_user_trips if
+                 (t.end_date.date() if isinstance(t.end_date, datetime) else t.end_date) < today]
+    else:
+        trips = all_user_trips
+
+    return render_template('my_trips.html',
+                           trips=trips,
+                           today=today,
+                           search_query=search_query,
+                           sort_by=sort_by,
+                           filter_status=filter_status)
+
+
+# Календар подорожей
+@bp.route('/calendar')
+@login_required
+def trip_calendar():
+    from datetime import datetime, date, timedelta
+    import calendar as cal
+
+    # Отримуємо поточний місяць та рік
+    year = int(request.args.get('year', datetime.now().year))
+    month = int(request.args.get('month', datetime.now().month))
+
+    # Отримуємо всі поїздки користувача
+    trips = Trip.query.filter_by(user_id=current_user.id).all()
+
+    # Створюємо календар
+    month_calendar = cal.monthcalendar(year, month)
+    month_name = cal.month_name[month]
+
+    # Знаходимо поїздки для кожного дня місяця
+    trips_by_date = {}
+    for trip in trips:
+        start = trip.start_date.date() if isinstance(trip.start_date, datetime) else trip.start_date
+        end = trip.end_date.date() if isinstance(trip.end_date, datetime) else trip.end_date
+
+        # Додаємо поїздку до всіх днів між start та end
+        current_date = start
+        while current_date <= end:
+            if current_date.year == year and current_date.month == month:
+                date_key = current_date.day
+                if date_key not in trips_by_date:
+                    trips_by_date[date_key] = []
+                trips_by_date[date_key].append(trip)
+            current_date += timedelta(days=1)
+
+    # Навігація по місяцях
+    prev_month = month - 1 if month > 1 else 12
+    prev_year = year if month > 1 else year - 1
+    next_month = month + 1 if month < 12 else 1
+    next_year = year if month < 12 else year + 1
+
+    # Поточна дата
+    today = date.today()
+
+    # Статистика місяця
+    month_trips = [t for t in trips if
+                   (t.start_date.date() if isinstance(t.start_date, datetime) else t.start_date).year == year and
+                   (t.start_date.date() if isinstance(t.start_date, datetime) else t.start_date).month == month]
+
+    return render_template('calendar.html',
+                           year=year,
+                           month=month,
+                           month_name=month_name,
+                           month_calendar=month_calendar,
+                           trips_by_date=trips_by_date,
+                           prev_month=prev_month,
+                           prev_year=prev_year,
+                           next_month=next_month,
+                           next_year=next_year,
+                           today=today,
+                           month_trips=month_trips,
+                           all_trips=trips)
+
+
+# ==================== ГЛОБАЛЬНИЙ ПОШУК ====================
+
+@bp.route('/search')
+@login_required
+def global_search():
+    query = request.args.get('q', '').strip()
+
+    if not query:
+        return render_template('search_results.html',
+                               query='',
+                               trips=[],
+                               activities=[],
+                               notes=[],
+                               accommodations=[])
+
+    # Пошук в нижньому регістрі
+    words = query.lower().split()
+    words = [word for word in words if word not in ['в', 'у', 'до', 'на', 'по', 'і']]
+
+    # Пошук поїздок
+    trip_filters = []
+
+    for word in words:
+        search_term = f"%{word}%"
+        trip_filters.append(
+            db.or_(
+                Trip.title.ilike(search_term),
+                Trip.destination.ilike(search_term)
+            )
+        )
+
+    trips = Trip.query.filter(
+        Trip.user_id == current_user.id
+    ).filter(
+        db.or_(*trip_filters)
+    ).all()
+
+    # Пошук активностей
+    activities = Activity.query.join(Trip).filter(
+        Trip.user_id == current_user.id
+    ).filter(
+        db.or_(
+            Activity.title.ilike(search_term),
+            Activity.description.ilike(search_term),
+            Activity.location.ilike(search_term)
+        )
+    ).all()
+
+    # Пошук нотаток
+    notes = TripNote.query.join(Trip).filter(
+        Trip.user_id == current_user.id
+    ).filter(
+        db.or_(
+            TripNote.title.ilike(search_term),
+            TripNote.content.ilike(search_term)
+        )
+    ).all()
+
+    # Пошук готелів
+    accommodations = Accommodation.query.join(Trip).filter(
+        Trip.user_id == current_user.id
+    ).filter(
+        db.or_(
+            Accommodation.name.ilike(search_term),
+            Accommodation.address.ilike(search_term)
+        )
+    ).all()
+
+    return render_template('search_results.html',
+                           query=query,
+                           trips=trips,
+                           activities=activities,
+                           notes=notes,
+                           accommodations=accommodations)
+
+
+# Швидкий пошук (API для autocomplete)
+@bp.route('/api/quick-search')
+@login_required
+def quick_search():
+    query = request.args.get('q', '').strip()
+
+    if not query or len(query) < 2:
+        return {'results': []}
+
+    search_term = f"%{query.lower()}%"
+    results = []
+
+    # Пошук поїздок (топ 3)
+    trips = Trip.query.filter(
+        Trip.user_id == current_user.id
+    ).filter(
+        db.or_(
+            Trip.title.ilike(search_term),
+            Trip.destination.ilike(search_term)
+        )
+    ).limit(3).all()
+
+    for trip in trips:
+        results.append({
+            'type': 'trip',
+            'id': trip.id,
+            'title': trip.title,
+            'subtitle': trip.destination,
+            'url': url_for('trips.view_trip', trip_id=trip.id),
+            'icon': '🗺️'
+        })
+
+    # Пошук активностей (топ 3)
+    activities = Activity.query.join(Trip).filter(
+        Trip.user_id == current_user.id
+    ).filter(
+        Activity.title.ilike(search_term)
+    ).limit(3).all()
+
+    for activity in activities:
+        results.append({
+            'type': 'activity',
+            'id': activity.id,
+            'title': activity.title,
+            'subtitle': f"{activity.trip.title} • {activity.date.strftime('%d.%m.%Y')}",
+            'url': url_for('trips.view_trip', trip_id=activity.trip_id),
+            'icon': '📍'
+        })
+
+    # Пошук нотаток (топ 3)
+    notes = TripNote.query.join(Trip).filter(
+        Trip.user_id == current_user.id
+    ).filter(
+        db.or_(
+            TripNote.title.ilike(search_term),
+            TripNote.content.ilike(search_term)
+        )
+    ).limit(3).all()
+
+    for note in notes:
+        results.append({
+            'type': 'note',
+            'id': note.id,
+            'title': note.title,
+            'subtitle': note.trip.title,
+            'url': url_for('notes.trip_notes', trip_id=note.trip_id),
+            'icon': '📝'
+        })
+
+    return {'results': results[:9]}  # Максимум 9 результатів
+
+
+# Рекомендації на основі історії
+@bp.route('/recommendations')
+@login_required
+def recommendations():
+    # Аналізуємо історію подорожей
+    trips = Trip.query.filter_by(user_id=current_user.id).all()
+
+    # Найчастіші напрямки
+    destinations = {}
+    for trip in trips:
+        dest = trip.destination
+        destinations[dest] = destinations.get(dest, 0) + 1
+
+    top_destinations = sorted(destinations.items(), key=lambda x: x[1], reverse=True)[:5]
+
+    # Середній бюджет
+    if trips:
+        avg_budget = sum(t.budget * CURRENCY_RATES.get(t.currency, 1) for t in trips) / len(trips)
+    else:
+        avg_budget = 0
+
+    # Середня тривалість
+    if trips:
+        avg_duration = sum((t.end_date - t.start_date).days + 1 for t in trips) / len(trips)
+    else:
+        avg_duration = 0
+
+    # Популярні категорії активностей
+    activities = Activity.query.join(Trip).filter(Trip.user_id == current_user.id).all()
+
+    categories = {}
+    for activity in activities:
+        cat = activity.category
+        categories[cat] = categories.get(cat, 0) + 1
+
+    top_categories = sorted(categories.items(), key=lambda x: x[1], reverse=True)[:5]
+
+    # Рекомендації напрямків (прості - можна підключити реальний API)
+    recommendations_list = [
+        {'city': 'Львів', 'country': 'Україна', 'reason': 'Популярно серед користувачів', 'budget': 5000},
+        {'city': 'Краків', 'country': 'Польща', 'reason': 'Близько до України', 'budget': 8000},
+        {'city': 'Будапешт', 'country': 'Угорщина', 'reason': 'Культурна столиця', 'budget': 10000},
+        {'city': 'Стамбул', 'country': 'Туреччина', 'reason': 'Екзотика та історія', 'budget': 12000},
+        {'city': 'Прага', 'country': 'Чехія', 'reason': 'Архітектурна краса', 'budget': 15000},
+    ]
+
+    return render_template('recommendations.html',
+                           top_destinations=top_destinations,
+                           avg_budget=avg_budget,
+                           avg_duration=avg_duration,
+                           top_categories=top_categories,
+                           recommendations=recommendations_list)
+
+
+# Конвертер валют
+@bp.route('/converter')
+@login_required
+def currency_converter():
+    # Спробуємо отримати живі курси
+    live_rates = get_live_exchange_rates()
+
+    # Якщо не вийшло, використовуємо статичні
+    rates = live_rates if live_rates else CURRENCY_RATES
+
+    return render_template('currency_converter.html',
+                           currencies=rates.keys(),
+                           currency_rates=rates,
+                           currency_symbols=CURRENCY_SYMBOLS,
+                           live_rates=live_rates is not None)
+
+
+# Сторінка досягнень
+@bp.route('/achievements')
+@login_required
+def achievements_page():
+    from datetime import datetime, date
+
+    # Отримуємо всі досягнення користувача
+    user_achievements = UserAchievement.query.filter_by(user_id=current_user.id).all()
+    unlocked_types = [a.achievement_type for a in user_achievements]
+
+    # Розділяємо на розблоковані та заблоковані
+    unlocked = []
+    locked = []
+
+    for key, achievement in ACHIEVEMENTS.items():
+        achievement_data = {
+            'key': key,
+            'name': achievement['name'],
+            'description': achievement['description'],
+            'icon': achievement['icon'],
+            'color': achievement['color']
+        }
+
+        if key in unlocked_types:
+            # Знаходимо дату розблокування
+            user_ach = next((a for a in user_achievements if a.achievement_type == key), None)
+            if user_ach:
+                achievement_data['unlocked_at'] = user_ach.unlocked_at
+            unlocked.append(achievement_data)
+        else:
+            locked.append(achievement_data)
+
+    # Рівень користувача
+    user_level = get_user_level(current_user.id)
+    trips_count = Trip.query.filter_by(user_id=current_user.id).count()
+
+    # Прогрес до наступного рівня
+    if user_level['next']:
+        progress = (trips_count / user_level['next']) * 100
+    else:
+        progress = 100
+
+    # Статистика року
+    current_year = datetime.now().year
+    year_trips = Trip.query.filter_by(user_id=current_user.id).filter(
+        db.func.strftime('%Y', Trip.start_date) == str(current_year)
+    ).all()
+
+    year_stats = {
+        'trips': len(year_trips),
+        'countries': len(set([t.destination for t in year_trips])),
+        'total_days': sum([(t.end_date - t.start_date).days + 1 for t in year_trips])
+    }
+
+    return render_template('achievements.html',
+                           unlocked=unlocked,
+                           locked=locked,
+                           user_level=user_level,
+                           trips_count=trips_count,
+                           progress=progress,
+                           year_stats=year_stats,
+                           current_year=current_year,
+                           total_achievements=len(ACHIEVEMENTS))
@@ -0,0 +1,191 @@
+"""Карта світу та статуси відвіданих країн"""
+from datetime import datetime
+
+from flask import Blueprint, render_template, request
+from flask_login import login_required, current_user
+
+from planner.extensions import db
+from planner.models import Trip, VisitedCountry
+
+
+bp = Blueprint('map', __name__)
+
+
+@bp.route('/world-map')
+@login_required
+def world_map():
+    from datetime import date
+
+    # Всі поїздки користувача
+    trips = Trip.query.filter_by(user_id=current_user.id).all()
+
+    # Отримуємо вручну відмічені країни з БД
+    manual_countries = VisitedCountry.query.filter_by(user_id=current_user.id).all()
+
+    # Спочатку створюємо словники для вручну відмічених
+    manual_visited = {}
+    manual_planned = {}
+
+    for country in manual_countries:
+        if country.status == 'visited':
+            manual_visited[country.country_name] = True
+        elif country.status == 'planned':
+            manual_planned[country.country_name] = True
+
+    visited = {}
+    planned = {}
+
+    today = date.today()
+
+    # Обробляємо поїздки
+    for trip in trips:
+        destination_parts = trip.destination.split(',')
+        country = destination_parts[-1].strip() if len(destination_parts) > 1 else trip.destination.strip()
+
+        trip_end = trip.end_date.date() if hasattr(trip.end_date, 'date') else trip.end_date
+
+        if trip_end < today:
+            # Відвідано через поїздку
+            if country not in visited:
+                visited[country] = []
+            visited[country].append({
+                'title': trip.title,
+                'date': trip.start_date.strftime('%d.%m.%Y')
+            })
+        else:
+            # Заплановано через поїздку
+            # НЕ додаємо якщо вручну вже відмічено як visited
+            if country not in manual_visited and country not in planned:
+                planned[country] = {
+                    'country': country,
+                    'date': trip.start_date.strftime('%d.%m.%Y')
+                }
+
+    # ТЕПЕР додаємо вручну відмічені країни
+    for country_name in manual_visited:
+        if country_name not in visited:
+            visited[country_name] = []
+        visited[country_name].insert(0, {
+            'title': 'Відмічено вручну',
+            'date': 'Без дати'
+        })
+
+    for country_name in manual_planned:
+        # НЕ додаємо якщо вже є у visited (з поїздок або вручну)
+        if country_name not in visited and country_name not in planned:
+            planned[country_name] = {
+                'country': country_name,
+                'date': 'Не вказано'
+            }
+
+    # Форматуємо для шаблону
+    visited_countries = [
+        {
+            'country': country,
+            'trips': trips_list
+        }
+        for country, trips_list in visited.items()
+    ]
+
+    planned_countries = list(planned.values())
+
+    # Статистика
+    total_countries = 195
+    coverage = (len(visited) / total_countries * 100) if visited else 0
+
+    # ВАЖЛИВО: передаємо назви країн для JavaScript
+    visited_country_names = list(visited.keys())
+    planned_country_names = list(planned.keys())
+
+    return render_template('world_map.html',
+                           visited_countries=visited_countries,
+                           planned_countries=planned_countries,
+                           total_trips=len(trips),
+                           coverage_percentage=round(coverage, 1),
+                           visited_country_names=visited_country_names,
+                           planned_country_names=planned_country_names)
+
+
+# ==================== API ДЛЯ КАРТИ ====================
+
+# Отримати статус країни
+@bp.route('/api/country-status/<country_name>')
+@login_required
+def get_country_status(country_name):
+    country = VisitedCountry.query.filter_by(
+        user_id=current_user.id,
+        country_name=country_name
+    ).first()
+
+    if country:
+        return {
+            'status': country.status,
+            'visit_date': country.visit_date.strftime('%Y-%m-%d') if country.visit_date else None,
+            'notes': country.notes
+        }
+    else:
+        return {'status': 'not_visited'}
+
+
+# Встановити статус країни
+@bp.route('/api/country-status', methods=['POST'])
+@login_required
+def set_country_status():
+    try:
+        data = request.get_json()
+
+        if not data:
+            return {'success': False, 'error': 'No data provided'}, 400
+
+        country_name = data.get('country_name')
+        status = data.get('status')
+
+        if not country_name or not status:
+            return {'success': False, 'error': 'Missing country_name or status'}, 400
+
+        # Шукаємо чи є вже запис
+        country = VisitedCountry.query.filter_by(
+            user_id=current_user.id,
+            country_name=country_name
+        ).first()
+
+        if status == 'not_visited':
+            # Видаляємо запис якщо скидаємо статус
+            if country:
+                db.session.delete(country)
+                db.session.commit()
+            return {'success': True, 'status': 'not_visited'}
+
+        # Обробляємо дату
+        visit_date = None
+        if data.get('visit_date'):
+            try:
+                visit_date = datetime.strptime(data.get('visit_date'), '%Y-%m-%d').date()
+            except:
+                pass
+
+        # Створюємо або оновлюємо
+        if country:
+            country.status = status
+            country.visit_date = visit_date
+            country.notes = data.get('notes', '')
+        else:
+            country = VisitedCountry(
+                user_id=current_user.id,
+                country_name=country_name,
+                status=status,
+                visit_date=visit_date,
+                notes=data.get('notes', '')
+            )
+            db.session.add(country)
+
+        db.session.commit()
+
+        return {'success': True, 'status': status}
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error in set_country_status: {e}")
+        import traceback
+        traceback.print_exc()
+        return {'success': False, 'error': str(e)}, 500
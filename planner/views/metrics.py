@@ -0,0 +1,56 @@
+"""Метрики для Prometheus (див. planner/metrics.py)"""
+import hmac
+
+from flask import Blueprint, abort, current_app, request
+
+from planner.metrics import flush_metrics, format_labels, render_metrics
+
+bp = Blueprint('metrics', __name__)
+
+LOCAL_ADDRESSES = ('127.0.0.1', '::1')
+
+
+def metrics_allowed():
+    """З METRICS_TOKEN — лише з Authorization: Bearer <token>, без нього — лише локально"""
+    token = current_app.config.get('METRICS_TOKEN')
+    if token:
+        header = request.headers.get('Authorization', '')
+        return hmac.compare_digest(header, f'Bearer {token}')
+    return request.remote_addr in LOCAL_ADDRESSES
+
+
+def ai_rows():
+    """Стан шлюзу моделі та кешу відповідей — вже спільні для всіх воркерів"""
+    rows = []
+
+    gateway = current_app.extensions.get('ai_gateway')
+    if gateway is not None:
+        state = gateway.metrics()
+        rows += [('ai_gateway_in_flight', '', state['in_flight']),
+                 ('ai_gateway_queue_depth', '', state['queue_depth'])]
+
+    cache = current_app.extensions.get('ai_cache')
+    if cache is not None:
+        stats = cache.stats()
+        rows += [
+            ('cache_requests_total', format_labels((('cache', 'ai'), ('result', result))), stats[key])
+            for result, key in (('hit', 'hits'), ('miss', 'misses'), ('bypass', 'bypass'))
+        ]
+
+    return rows
+
+
+@bp.route('/metrics')
+def metrics():
+    store = current_app.extensions.get('metrics')
+    if store is None or not metrics_allowed():
+        abort(404)
+
+    flush_metrics(force=True)
+    rows = store.collect()
+    try:
+        rows += ai_rows()
+    except Exception as e:
+        print("METRICS ERROR:", e)
+
+    return current_app.response_class(render_metrics(rows), mimetype='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,211 @@
+"""Нотатки та чекліст поїздки"""
+from datetime import datetime
+
+from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask_login import login_required, current_user
+
+from planner.conditional import conditional_trip_page
+from planner.extensions import db
+from planner.models import Trip, TripChecklist, TripNote
+
+
+bp = Blueprint('notes', __name__)
+
+
+def checklist_progress(trip_id):
+    """Виконано/усього пунктів чекліста — одним запитом"""
+    total, done = db.session.query(
+        db.func.count(TripChecklist.id),
+        db.func.sum(db.case((TripChecklist.is_completed, 1), else_=0)),
+    ).filter(TripChecklist.trip_id == trip_id).one()
+
+    done = int(done or 0)
+    return {'done': done, 'total': total, 'percent': round(done / total * 100) if total else 0}
+
+
+# Сторінка з нотатками та чеклістом
+@bp.route('/trip/<int:trip_id>/notes')
+@login_required
+@conditional_trip_page
+def trip_notes(trip_id):
+    trip = Trip.query.get_or_404(trip_id)
+
+    if trip.user_id != current_user.id:
+        flash('У вас немає доступу до цієї поїздки', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    notes = TripNote.query.filter_by(trip_id=trip_id).order_by(TripNote.is_pinned.desc(),
+                                                               TripNote.created_at.desc()).all()
+    checklist_items = TripChecklist.query.filter_by(trip_id=trip_id).order_by(TripChecklist.is_completed,
+                                                                              TripChecklist.due_date).all()
+
+    # Групуємо чекліст по категоріях
+    from collections import defaultdict
+    checklist_by_category = defaultdict(list)
+    for item in checklist_items:
+        checklist_by_category[item.category or 'Інше'].append(item)
+
+    # Статистика чекліста
+    total_items = len(checklist_items)
+    completed_items = len([item for item in checklist_items if item.is_completed])
+    completion_percentage = (completed_items / total_items * 100) if total_items > 0 else 0
+
+    return render_template('trip_notes.html',
+                           trip=trip,
+                           notes=notes,
+                           checklist_by_category=dict(checklist_by_category),
+                           total_items=total_items,
+                           completed_items=completed_items,
+                           completion_percentage=completion_percentage)
+
+
+# Перемикач виконання пункту чекліста
+@bp.route('/trip/<int:trip_id>/checklist/<int:item_id>/toggle', methods=['POST'])
+@login_required
+def toggle_checklist_item(trip_id, item_id):
+    item = TripChecklist.query.get_or_404(item_id)
+
+    if item.trip.user_id != current_user.id:
+        flash('У вас немає доступу', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    item.is_completed = not item.is_completed
+    db.session.commit()
+
+    return redirect(url_for('notes.trip_notes', trip_id=trip_id))
+
+
+# Перемикач пункту чекліста без перезавантаження сторінки
+@bp.route('/api/trip/<int:trip_id>/checklist/<int:item_id>/toggle', methods=['POST'])
+@login_required
+def toggle_checklist_item_json(trip_id, item_id):
+    item = TripChecklist.query.get_or_404(item_id)
+
+    if item.trip_id != trip_id or item.trip.user_id != current_user.id:
+        return {'success': False, 'error': 'Access denied'}, 403
+
+    done = not item.is_completed
+    item.is_completed = done
+    db.session.commit()
+
+    return {'success': True, 'id': item_id, 'done': done, 'progress': checklist_progress(trip_id)}
+
+
+# Додати нотатку
+@bp.route('/trip/<int:trip_id>/notes/add', methods=['POST'])
+@login_required
+def add_note(trip_id):
+    trip = Trip.query.get_or_404(trip_id)
+
+    if trip.user_id != current_user.id:
+        flash('У вас немає доступу до цієї поїздки', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    title = request.form.get('title')
+    content = request.form.get('content')
+    category = request.form.get('category', 'Загальне')
+    is_pinned = request.form.get('is_pinned') == 'on'
+
+    note = TripNote(
+        title=title,
+        content=content,
+        category=category,
+        is_pinned=is_pinned,
+        trip_id=trip_id
+    )
+
+    db.session.add(note)
+    db.session.commit()
+
+    flash('Нотатку додано!', 'success')
+    return redirect(url_for('notes.trip_notes', trip_id=trip_id))
+
+
+# Редагувати нотатку
+@bp.route('/trip/<int:trip_id>/notes/<int:note_id>/edit', methods=['POST'])
+@login_required
+def edit_note(trip_id, note_id):
+    note = TripNote.query.get_or_404(note_id)
+
+    if note.trip.user_id != current_user.id:
+        flash('У вас немає доступу', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    note.title = request.form.get('title')
+    note.content = request.form.get('content')
+    note.category = request.form.get('category')
+    note.is_pinned = request.form.get('is_pinned') == 'on'
+    note.updated_at = datetime.now()
+
+    db.session.commit()
+
+    flash('Нотатку оновлено!', 'success')
+    return redirect(url_for('notes.trip_notes', trip_id=trip_id))
+
+
+# Видалити нотатку
+@bp.route('/trip/<int:trip_id>/notes/<int:note_id>/delete', methods=['POST'])
+@login_required
+def delete_note(trip_id, note_id):
+    note = TripNote.query.get_or_404(note_id)
+
+    if note.trip.user_id != current_user.id:
+        flash('У вас немає доступу', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    db.session.delete(note)
+    db.session.commit()
+
+    flash('Нотатку видалено', 'info')
+    return redirect(url_for('notes.trip_notes', trip_id=trip_id))
+
+
+# ==================== ЧЕКЛІСТ ====================
+
+# Додати пункт чекліста
+@bp.route('/trip/<int:trip_id>/checklist/add', methods=['POST'])
+@login_required
+def add_checklist_item(trip_id):
+    trip = Trip.query.get_or_404(trip_id)
+
+    if trip.user_id != current_user.id:
+        flash('У вас немає доступу', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    item = request.form.get('item')
+    category = request.form.get('category', 'Інше')
+    due_date_str = request.form.get('due_date')
+    notes = request.form.get('notes')
+
+    due_date = datetime.strptime(due_date_str, '%Y-%m-%d').date() if due_date_str else None
+
+    checklist_item = TripChecklist(
+        item=item,
+        category=category,
+        due_date=due_date,
+        notes=notes,
+        trip_id=trip_id
+    )
+
+    db.session.add(checklist_item)
+    db.session.commit()
+
+    flash('Пункт додано до чекліста!', 'success')
+    return redirect(url_for('notes.trip_notes', trip_id=trip_id))
+
+
+# Видалити пункт чекліста
+@bp.route('/trip/<int:trip_id>/checklist/<int:item_id>/delete', methods=['POST'])
+@login_required
+def delete_checklist_item(trip_id, item_id):
+    item = TripChecklist.query.get_or_404(item_id)
+
+    if item.trip.user_id != current_user.id:
+        flash('У вас немає доступу', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    db.session.delete(item)
+    db.session.commit()
+
+    flash('Пункт видалено', 'info')
+    return redirect(url_for('notes.trip_notes', trip_id=trip_id))
@@ -0,0 +1,182 @@
+"""Офлайн-режим: service worker, офлайн-сторінка та копія найближчих поїздок"""
+import hashlib
+import json
+import os
+from datetime import date, datetime
+
+from flask import Blueprint, current_app, render_template, request, url_for
+from flask_login import login_required, current_user
+from sqlalchemy.orm import selectinload
+
+from planner.assets import asset_url
+from planner.conditional import build_fingerprint
+from planner.models import Trip
+
+bp = Blueprint('offline', __name__)
+
+# Скільки найближчих поїздок зберігається на пристрої
+OFFLINE_TRIPS_LIMIT = 10
+
+# Ресурси, без яких не відкриється офлайн-сторінка (шлях у static/)
+PRECACHE_ASSETS = (
+    'vendor/bootstrap-5.3.0/bootstrap.min.css',
+    'vendor/bootstrap-5.3.0/bootstrap.bundle.min.js',
+    'vendor/bootstrap-icons-1.11.1/bootstrap-icons.css',
+    'vendor/bootstrap-icons-1.11.1/fonts/bootstrap-icons.woff2',
+    'vendor/poppins-5.0.8/poppins.css',
+    'css/style.css',
+    'js/main.js',
+    'js/offline-db.js',
+    'js/offline.js',
+    'images/icon-192x192.png',
+)
+# manifest.json не проходить через збірку (браузер шукає його за сталим URL)
+PRECACHE_STATIC = ('manifest.json',)
+
+
+def service_worker_config():
+    built = current_app.extensions['assets']['files']
+    offline_url = url_for('offline.offline_page')
+    precache = [offline_url]
+    for path in PRECACHE_ASSETS:
+        # Шрифти іконок є лише після збірки; сторонні CDN кешуються під час роботи
+        if path.endswith('.woff2') and path not in built:
+            continue
+        url = asset_url(path)
+        if url.startswith('/'):
+            precache.append(url)
+    precache.extend(url_for('static', filename=path) for path in PRECACHE_STATIC)
+
+    return {
+        'version': build_fingerprint(current_app),
+        'precache': precache,
+        'offlineUrl': offline_url,
+        'offlineDb': asset_url('js/offline-db.js'),
+        'tripsUrl': url_for('offline.offline_trips'),
+        'logoutUrl': url_for('auth.logout'),
+    }
+
+
+def service_worker_script():
+    """Вихідний static/js/sw.js з конфігом збірки на початку
+
+    Версія й список precache змінюються з кожним деплоєм, тому браузер
+    бачить новий service worker і оновлює кеші.
+    """
+    with open(os.path.join(current_app.static_folder, 'js', 'sw.js'), encoding='utf-8') as f:
+        source = f.read()
+
+    config = json.dumps(service_worker_config(), ensure_ascii=False)
+    return f"self.__SW_CONFIG__ = {config};\n{source}"
+
+
+@bp.route('/sw.js')
+def service_worker():
+    script = service_worker_script()
+
+    response = current_app.response_class(script, mimetype='application/javascript')
+    response.headers['Service-Worker-Allowed'] = '/'
+    # Браузер має перевіряти service worker при кожному завантаженні
+    response.headers['Cache-Control'] = 'no-cache'
+    response.set_etag(hashlib.sha1(script.encode('utf-8')).hexdigest())
+    return response.make_conditional(request)
+
+
+# Сторінка, яку service worker показує без мережі
+@bp.route('/offline')
+def offline_page():
+    return render_template('offline.html')
+
+
+def _day(value):
+    return value.strftime('%Y-%m-%d') if value else None
+
+
+def _moment(value):
+    return value.strftime('%Y-%m-%dT%H:%M') if value else None
+
+
+def offline_trip(trip):
+    """Поїздка з маршрутом, бронюваннями та квитками для IndexedDB"""
+    return {
+        'id': trip.id,
+        'title': trip.title,
+        'destination': trip.destination,
+        'start_date': _day(trip.start_date),
+        'end_date': _day(trip.end_date),
+        'budget': trip.budget,
+        'currency': trip.currency or 'UAH',
+        'version': trip.version,
+        'destinations': [{
+            'city': d.city,
+            'country': d.country,
+            'arrival_date': _day(d.arrival_date),
+            'departure_date': _day(d.departure_date),
+        } for d in sorted(trip.destinations, key=lambda d: d.order or 0)],
+        'activities': [{
+            'id': a.id,
+            'title': a.title,
+            'description': a.description,
+            'date': _day(a.date),
+            'time': a.time,
+            'location': a.location,
+            'category': a.category,
+            'cost': a.cost,
+            'completed': a.completed,
+        } for a in sorted(trip.activities, key=lambda a: (a.date, a.time or ''))],
+        'accommodations': [{
+            'id': a.id,
+            'name': a.name,
+            'address': a.address,
+            'check_in': _moment(a.check_in),
+            'check_out': _moment(a.check_out),
+            'booking_reference': a.booking_reference,
+            'booking_status': a.booking_status,
+            'phone': a.phone,
+            'notes': a.notes,
+        } for a in sorted(trip.accommodations, key=lambda a: a.check_in)],
+        'transports': [{
+            'id': t.id,
+            'type': t.type,
+            'from_location': t.from_location,
+            'to_location': t.to_location,
+            'departure_date': _moment(t.departure_date),
+            'arrival_date': _moment(t.arrival_date),
+            'carrier': t.carrier,
+            'ticket_number': t.ticket_number,
+            'seat_number': t.seat_number,
+            'booking_reference': t.booking_reference,
+            'notes': t.notes,
+        } for t in sorted(trip.transports, key=lambda t: t.departure_date)],
+    }
+
+
+# Найближчі поїздки для офлайн-копії (service worker синхронізує з If-None-Match)
+@bp.route('/api/offline/trips')
+@login_required
+def offline_trips():
+    today = date.today()
+    etag = hashlib.sha1(f"{current_user.id}|{current_user.data_version}|{today}".encode('utf-8')).hexdigest()
+
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        trips = Trip.query.filter(
+            Trip.user_id == current_user.id,
+            Trip.end_date >= datetime.combine(today, datetime.min.time())
+        ).options(
+            selectinload(Trip.activities),
+            selectinload(Trip.accommodations),
+            selectinload(Trip.transports),
+            selectinload(Trip.destinations),
+        ).order_by(Trip.start_date).limit(OFFLINE_TRIPS_LIMIT).all()
+
+        response = current_app.response_class(json.dumps({
+            'user': current_user.id,
+            'synced_at': _moment(datetime.now()),
+            'trips': [offline_trip(trip) for trip in trips],
+        }, ensure_ascii=False), mimetype='application/json')
+
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
@@ -0,0 +1,215 @@
+"""Список речей"""
+from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask_login import login_required, current_user
+
+from planner.conditional import conditional_trip_page
+from planner.extensions import db
+from planner.models import PackingItem, Trip, touch_trip
+
+
+bp = Blueprint('packing', __name__)
+
+
+def packing_progress(trip_id):
+    """Зібрано/усього по поїздці та по категоріях — одним запитом"""
+    rows = db.session.query(
+        PackingItem.category,
+        db.func.count(PackingItem.id),
+        db.func.sum(db.case((PackingItem.is_packed, 1), else_=0)),
+    ).filter(PackingItem.trip_id == trip_id).group_by(PackingItem.category).all()
+
+    categories = {category: {'done': int(packed or 0), 'total': total} for category, total, packed in rows}
+    done = sum(counts['done'] for counts in categories.values())
+    total = sum(counts['total'] for counts in categories.values())
+
+    return {
+        'done': done,
+        'total': total,
+        'percent': round(done / total * 100) if total else 0,
+        'categories': categories,
+    }
+
+
+def mark_category(trip, category, packed=True):
+    """Позначає всі речі категорії одним UPDATE; повертає кількість змінених"""
+    changed = db.session.execute(
+        db.update(PackingItem).where(
+            PackingItem.trip_id == trip.id,
+            PackingItem.category == category,
+            PackingItem.is_packed.isnot(packed),
+        ).values(is_packed=packed).execution_options(synchronize_session=False)
+    ).rowcount
+
+    if changed:
+        touch_trip(trip.id)
+    db.session.commit()
+    return changed
+
+
+# Packing List - перегляд
+@bp.route('/trip/<int:trip_id>/packing')
+@login_required
+@conditional_trip_page
+def packing_list(trip_id):
+    trip = Trip.query.get_or_404(trip_id)
+
+    if trip.user_id != current_user.id:
+        flash('У вас немає доступу до цієї поїздки', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    # Групуємо речі по категоріях
+    items_by_category = {
+        'clothes': [],
+        'toiletries': [],
+        'electronics': [],
+        'documents': [],
+        'other': []
+    }
+
+    for item in trip.packing_items:
+        if item.category in items_by_category:
+            items_by_category[item.category].append(item)
+
+    # Статистика
+    total_items = len(trip.packing_items)
+    packed_items = len([item for item in trip.packing_items if item.is_packed])
+    progress = (packed_items / total_items * 100) if total_items > 0 else 0
+
+    return render_template('packing_list.html',
+                           trip=trip,
+                           items_by_category=items_by_category,
+                           total_items=total_items,
+                           packed_items=packed_items,
+                           packing_progress=progress)
+
+
+# Додавання речі
+@bp.route('/trip/<int:trip_id>/packing/add', methods=['POST'])
+@login_required
+def add_packing_item(trip_id):
+    trip = Trip.query.get_or_404(trip_id)
+
+    if trip.user_id != current_user.id:
+        flash('У вас немає доступу до цієї поїздки', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    name = request.form.get('name', '').strip()
+    category = request.form.get('category', 'other')
+    quantity = int(request.form.get('quantity', 1))
+
+    if not name:
+        flash('Введіть назву речі', 'danger')
+        return redirect(url_for('packing.packing_list', trip_id=trip.id))
+
+    new_item = PackingItem(
+        name=name,
+        category=category,
+        quantity=quantity,
+        trip_id=trip.id
+    )
+
+    db.session.add(new_item)
+    db.session.commit()
+
+    flash('Річ додано до списку!', 'success')
+    return redirect(url_for('packing.packing_list', trip_id=trip.id))
+
+
+# Позначити як зібрану
+@bp.route('/trip/<int:trip_id>/packing/<int:item_id>/toggle', methods=['POST'])
+@login_required
+def toggle_packing_item(trip_id, item_id):
+    trip = Trip.query.get_or_404(trip_id)
+    item = PackingItem.query.get_or_404(item_id)
+
+    if trip.user_id != current_user.id or item.trip_id != trip.id:
+        flash('У вас немає доступу', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    item.is_packed = not item.is_packed
+    db.session.commit()
+
+    return redirect(url_for('packing.packing_list', trip_id=trip.id))
+
+
+# Позначити як зібрану без перезавантаження сторінки
+@bp.route('/api/trip/<int:trip_id>/packing/<int:item_id>/toggle', methods=['POST'])
+@login_required
+def toggle_packing_item_json(trip_id, item_id):
+    trip = Trip.query.get_or_404(trip_id)
+    item = PackingItem.query.get_or_404(item_id)
+
+    if trip.user_id != current_user.id or item.trip_id != trip.id:
+        return {'success': False, 'error': 'Access denied'}, 403
+
+    done = not item.is_packed
+    item.is_packed = done
+    db.session.commit()
+
+    return {'success': True, 'id': item_id, 'done': done, 'progress': packing_progress(trip.id)}
+
+
+# Позначити всю категорію як зібрану
+@bp.route('/trip/<int:trip_id>/packing/category/<category>/pack', methods=['POST'])
+@login_required
+def pack_category(trip_id, category):
+    trip = Trip.query.get_or_404(trip_id)
+
+    if trip.user_id != current_user.id:
+        flash('У вас немає доступу', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    mark_category(trip, category, request.form.get('packed', '1') == '1')
+
+    return redirect(url_for('packing.packing_list', trip_id=trip.id))
+
+
+@bp.route('/api/trip/<int:trip_id>/packing/category/<category>/pack', methods=['POST'])
+@login_required
+def pack_category_json(trip_id, category):
+    trip = Trip.query.get_or_404(trip_id)
+
+    if trip.user_id != current_user.id:
+        return {'success': False, 'error': 'Access denied'}, 403
+
+    packed = request.form.get('packed', '1') == '1'
+    changed = mark_category(trip, category, packed)
+
+    return {'success': True, 'category': category, 'done': packed, 'changed': changed,
+            'progress': packing_progress(trip.id)}
+
+
+# Видалення речі
+@bp.route('/trip/<int:trip_id>/packing/<int:item_id>/delete', methods=['POST'])
+@login_required
+def delete_packing_item(trip_id, item_id):
+    trip = Trip.query.get_or_404(trip_id)
+    item = PackingItem.query.get_or_404(item_id)
+
+    if trip.user_id != current_user.id or item.trip_id != trip.id:
+        flash('У вас немає доступу', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    db.session.delete(item)
+    db.session.commit()
+
+    flash('Річ видалено зі списку', 'info')
+    return redirect(url_for('packing.packing_list', trip_id=trip.id))
+
+
+# Очистити список зібраних речей
+@bp.route('/trip/<int:trip_id>/packing/clear-packed', methods=['POST'])
+@login_required
+def clear_packed_items(trip_id):
+    trip = Trip.query.get_or_404(trip_id)
+
+    if trip.user_id != current_user.id:
+        flash('У вас немає доступу', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    PackingItem.query.filter_by(trip_id=trip.id, is_packed=True).delete()
+    touch_trip(trip.id)
+    db.session.commit()
+
+    flash('Зібрані речі видалено зі списку', 'info')
+    return redirect(url_for('packing.packing_list', trip_id=trip.id))
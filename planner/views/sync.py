@@ -0,0 +1,44 @@
+"""API дельта-синхронізації для офлайн і мобільних клієнтів"""
+from flask import Blueprint, request
+from flask_login import login_required, current_user
+
+from planner.sync import (PUSH_LIMIT, SNAPSHOT_TRIPS, SYNC_BATCH, current_cursor, pull_changes, push_mutations,
+                          snapshot)
+
+bp = Blueprint('sync', __name__)
+
+
+# Зміни після курсора; без курсора або з after — сторінка повного знімка
+@bp.route('/api/sync')
+@login_required
+def sync_pull():
+    cursor = request.args.get('cursor', '').strip()
+    after = request.args.get('after', '').strip()
+
+    try:
+        if not cursor or after:
+            limit = min(max(int(request.args.get('limit', SNAPSHOT_TRIPS)), 1), SNAPSHOT_TRIPS)
+            return snapshot(current_user.id, int(after or 0), int(cursor) if cursor else None, limit)
+
+        cursor = int(cursor)
+        limit = min(max(int(request.args.get('limit', SYNC_BATCH)), 1), SYNC_BATCH)
+    except ValueError:
+        return {'success': False, 'error': 'Некоректний курсор'}, 400
+
+    return pull_changes(current_user.id, cursor, limit)
+
+
+# Черга офлайн-змін клієнта
+@bp.route('/api/sync', methods=['POST'])
+@login_required
+def sync_push():
+    data = request.get_json(silent=True) or {}
+    mutations = data.get('mutations')
+
+    if not isinstance(mutations, list):
+        return {'success': False, 'error': 'Очікується список mutations'}, 400
+    if len(mutations) > PUSH_LIMIT:
+        return {'success': False, 'error': f'Не більше {PUSH_LIMIT} змін за один запит'}, 400
+
+    results = push_mutations(current_user.id, mutations)
+    return {'success': True, 'results': results, 'cursor': current_cursor(current_user.id)}
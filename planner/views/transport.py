@@ -0,0 +1,115 @@
+"""Транспорт поїздки"""
+from datetime import datetime
+
+from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask_login import login_required, current_user
+
+from planner.conditional import conditional_trip_page
+from planner.extensions import db
+from planner.models import Transport, Trip
+
+
+bp = Blueprint('transport', __name__)
+
+
+# Список транспорту
+@bp.route('/trip/<int:trip_id>/transport')
+@login_required
+@conditional_trip_page
+def transport_list(trip_id):
+    trip = Trip.query.get_or_404(trip_id)
+
+    if trip.user_id != current_user.id:
+        flash('У вас немає доступу', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    transports = Transport.query.filter_by(trip_id=trip_id).order_by(Transport.departure_date).all()
+
+    return render_template('transport_list.html',
+                           trip=trip,
+                           transports=transports)
+
+
+# Додати транспорт
+@bp.route('/trip/<int:trip_id>/transport/new', methods=['GET', 'POST'])
+@login_required
+def new_transport(trip_id):
+    trip = Trip.query.get_or_404(trip_id)
+
+    if trip.user_id != current_user.id:
+        flash('У вас немає доступу', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    if request.method == 'POST':
+        new_transport = Transport(
+            trip_id=trip_id,
+            type=request.form.get('type'),
+            from_location=request.form.get('from_location'),
+            to_location=request.form.get('to_location'),
+            departure_date=datetime.strptime(request.form.get('departure_date'), '%Y-%m-%dT%H:%M'),
+            arrival_date=datetime.strptime(request.form.get('arrival_date'), '%Y-%m-%dT%H:%M') if request.form.get(
+                'arrival_date') else None,
+            carrier=request.form.get('carrier'),
+            ticket_number=request.form.get('ticket_number'),
+            seat_number=request.form.get('seat_number'),
+            cost=float(request.form.get('cost', 0)),
+            booking_reference=request.form.get('booking_reference'),
+            notes=request.form.get('notes')
+        )
+
+        db.session.add(new_transport)
+        db.session.commit()
+
+        flash('Транспорт додано!', 'success')
+        return redirect(url_for('transport.transport_list', trip_id=trip_id))
+
+    return render_template('transport_form.html', trip=trip)
+
+
+# Редагувати транспорт
+@bp.route('/trip/<int:trip_id>/transport/<int:transport_id>/edit', methods=['GET', 'POST'])
+@login_required
+def edit_transport(trip_id, transport_id):
+    transport = Transport.query.get_or_404(transport_id)
+
+    if transport.trip.user_id != current_user.id:
+        flash('У вас немає доступу', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    if request.method == 'POST':
+        transport.type = request.form.get('type')
+        transport.from_location = request.form.get('from_location')
+        transport.to_location = request.form.get('to_location')
+        transport.departure_date = datetime.strptime(request.form.get('departure_date'), '%Y-%m-%dT%H:%M')
+        transport.arrival_date = datetime.strptime(request.form.get('arrival_date'),
+                                                   '%Y-%m-%dT%H:%M') if request.form.get('arrival_date') else None
+        transport.carrier = request.form.get('carrier')
+        transport.ticket_number = request.form.get('ticket_number')
+        transport.seat_number = request.form.get('seat_number')
+        transport.cost = float(request.form.get('cost', 0))
+        transport.booking_reference = request.form.get('booking_reference')
+        transport.notes = request.form.get('notes')
+
+        db.session.commit()
+
+        flash('Транспорт оновлено!', 'success')
+        return redirect(url_for('transport.transport_list', trip_id=trip_id))
+
+    return render_template('transport_form.html', trip=transport.trip, transport=transport)
+
+
+# Видалити транспорт
+@bp.route('/trip/<int:trip_id>/transport/<int:transport_id>/delete', methods=['POST'])
+@login_required
+def delete_transport(trip_id, transport_id):
+    transport = Transport.query.get_or_404(transport_id)
+
+    if transport.trip.user_id != current_user.id:
+        flash('У вас немає доступу', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    db.session.delete(transport)
+    db.session.commit()
+
+    flash('Транспорт видалено', 'success')
+    return redirect(url_for('transport.transport_list', trip_id=trip_id))
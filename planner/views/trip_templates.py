@@ -0,0 +1,195 @@
+"""Шаблони поїздок"""
+from datetime import datetime
+
+from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask_login import login_required, current_user
+
+from planner.currency import CURRENCY_SYMBOLS
+from planner.extensions import db
+from planner.fragments import lazy_context
+from planner.models import PackingItem, TemplateActivity, TemplatePackingItem, TemplateRating, Trip, TripTemplate
+from planner.trip_templates import (
+    gallery_item, gallery_page, instantiate_template, popular_destinations, rate_template, store_template_items,
+    template_activity, top_list_version, top_templates,
+)
+
+
+bp = Blueprint('trip_templates', __name__)
+
+
+# Зберегти поїздку як шаблон
+@bp.route('/trip/<int:trip_id>/save-as-template', methods=['GET', 'POST'])
+@login_required
+def save_as_template(trip_id):
+    trip = Trip.query.get_or_404(trip_id)
+
+    if trip.user_id != current_user.id:
+        flash('У вас немає доступу до цієї поїздки', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    if request.method == 'POST':
+        template_name = request.form.get('template_name', '').strip()
+        description = request.form.get('description')
+        is_public = request.form.get('is_public') == 'on'
+
+        if not template_name:
+            flash('Введіть назву шаблону', 'danger')
+            return render_template('save_as_template.html', trip=trip)
+
+        # Збираємо активності та packing list
+        activities_data = [template_activity(activity, trip.start_date) for activity in trip.activities]
+        packing_data = [
+            {'name': item.name, 'category': item.category, 'quantity': item.quantity}
+            for item in PackingItem.query.filter_by(trip_id=trip.id).all()
+        ]
+
+        # Створюємо шаблон
+        duration = (trip.end_date - trip.start_date).days + 1
+
+        template = TripTemplate(
+            name=template_name,
+            description=description,
+            destination_type=trip.destination,
+            duration_days=duration,
+            budget_estimate=trip.budget,
+            currency=trip.currency,
+            is_public=is_public,
+            user_id=current_user.id,
+            source_trip_id=trip.id,
+        )
+
+        db.session.add(template)
+        store_template_items(template, activities_data, packing_data)
+        db.session.commit()
+
+        flash(f'Шаблон "{template_name}" збережено!', 'success')
+        return redirect(url_for('trip_templates.templates_list'))
+
+    return render_template('save_as_template.html', trip=trip)
+
+
+# Список шаблонів
+@bp.route('/templates')
+@login_required
+def templates_list():
+    # Мої шаблони
+    my_templates = TripTemplate.query.filter_by(user_id=current_user.id).order_by(TripTemplate.created_at.desc()).all()
+
+    # Найпопулярніші публічні шаблони рахуються лише на промаху кешу фрагмента
+    return render_template('templates_list.html',
+                           my_templates=my_templates,
+                           top=lazy_context(lambda: {'templates': top_templates()}),
+                           top_version=top_list_version())
+
+
+def gallery_filters():
+    """Фільтри галереї з query string"""
+    def days(name):
+        value = request.args.get(name, type=int)
+        return value if value and value > 0 else None
+
+    return {
+        'destination': request.args.get('destination', '').strip() or None,
+        'min_days': days('min_days'),
+        'max_days': days('max_days'),
+        'search': request.args.get('q', '').strip()[:100] or None,
+    }
+
+
+# Галерея публічних шаблонів
+@bp.route('/templates/gallery')
+@login_required
+def templates_gallery():
+    filters = gallery_filters()
+    templates, next_cursor = gallery_page(after=request.args.get('after'), **filters)
+
+    return render_template('templates_gallery.html',
+                           templates=templates,
+                           next_cursor=next_cursor,
+                           filters=filters,
+                           destinations=lazy_context(lambda: {'items': popular_destinations()}),
+                           top_version=top_list_version())
+
+
+@bp.route('/api/templates/gallery')
+@login_required
+def templates_gallery_json():
+    templates, next_cursor = gallery_page(after=request.args.get('after'), **gallery_filters())
+
+    return {'templates': [gallery_item(template) for template in templates], 'next': next_cursor}
+
+
+# Оцінити шаблон
+@bp.route('/templates/<int:template_id>/rate', methods=['POST'])
+@login_required
+def rate_template_view(template_id):
+    template = TripTemplate.query.get_or_404(template_id)
+
+    if not template.is_public or template.user_id == current_user.id:
+        flash('Оцінювати можна лише публічні шаблони інших користувачів', 'danger')
+        return redirect(url_for('trip_templates.templates_list'))
+
+    rating = request.form.get('rating', type=int)
+    if rating not in range(1, 6):
+        flash('Оцінка має бути від 1 до 5', 'danger')
+    else:
+        rate_template(template, current_user.id, rating)
+        flash('Дякуємо за оцінку!', 'success')
+
+    return redirect(request.referrer or url_for('trip_templates.templates_gallery'))
+
+
+# Створити поїздку з шаблону
+@bp.route('/templates/<int:template_id>/use', methods=['GET', 'POST'])
+@login_required
+def use_template(template_id):
+    template = TripTemplate.query.get_or_404(template_id)
+
+    # Перевірка доступу
+    if not template.is_public and template.user_id != current_user.id:
+        flash('У вас немає доступу до цього шаблону', 'danger')
+        return redirect(url_for('trip_templates.templates_list'))
+
+    if request.method == 'POST':
+        title = request.form.get('title', '').strip()
+        destination = request.form.get('destination', '').strip()
+
+        if not title or not destination:
+            flash('Назва та напрямок є обов\'язковими полями', 'danger')
+            return redirect(url_for('trip_templates.use_template', template_id=template.id))
+
+        try:
+            start_date = datetime.strptime(request.form.get('start_date', ''), '%Y-%m-%d')
+            budget = float(request.form.get('budget') or 0)
+        except ValueError:
+            flash('Невірний формат дати або бюджету', 'danger')
+            return redirect(url_for('trip_templates.use_template', template_id=template.id))
+
+        new_trip = instantiate_template(template, current_user.id, title, destination, start_date, budget)
+
+        flash(f'Поїздку "{title}" створено з шаблону!', 'success')
+        return redirect(url_for('trips.view_trip', trip_id=new_trip.id))
+
+    return render_template('use_template.html',
+                           template=template,
+                           currency_symbols=CURRENCY_SYMBOLS)
+
+
+# Видалити шаблон
+@bp.route('/templates/<int:template_id>/delete', methods=['POST'])
+@login_required
+def delete_template(template_id):
+    template = TripTemplate.query.get_or_404(template_id)
+
+    if template.user_id != current_user.id:
+        flash('У вас немає доступу до цього шаблону', 'danger')
+        return redirect(url_for('trip_templates.templates_list'))
+
+    # Дочірні записи — масовими DELETE, а не по одному через каскад сесії
+    for model in (TemplateActivity, TemplatePackingItem, TemplateRating):
+        db.session.execute(db.delete(model).where(model.template_id == template.id))
+    db.session.delete(template)
+    db.session.commit()
+
+    flash('Шаблон видалено', 'info')
+    return redirect(url_for('trip_templates.templates_list'))
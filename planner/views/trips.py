@@ -0,0 +1,675 @@
+"""Поїздки: створення, перегляд, редагування, активності та міста"""
+from datetime import datetime, timedelta
+
+from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask_login import login_required, current_user
+
+from planner.achievements import check_achievements
+from planner.conditional import conditional_trip_page
+from planner.currency import CURRENCY_RATES, CURRENCY_SYMBOLS
+from planner.extensions import db
+from planner.models import Accommodation, Activity, Transport, Trip, TripDestination, next_activity_position, touch_trip
+from planner.weather import get_weather, get_weather_forecast, parse_city_country, weather_hour
+
+
+bp = Blueprint('trips', __name__)
+
+
+# Найбільше записів в одному перевпорядкуванні
+REORDER_LIMIT = 500
+
+
+def apply_order(column, ids, *conditions, start=0):
+    """Записує новий порядок одним UPDATE ... CASE (номери з start)
+
+    Оновлюються лише рядки, що відповідають conditions (поїздка, день);
+    якщо серед ids є чужі чи зайві, зміни відкочуються і повертається False.
+    """
+    table = column.class_
+    statement = db.update(table).where(table.id.in_(ids), *conditions).values(
+        {column: db.case({item_id: index for index, item_id in enumerate(ids, start)}, value=table.id)}
+    ).execution_options(synchronize_session=False)
+
+    if db.session.execute(statement).rowcount != len(ids):
+        db.session.rollback()
+        return False
+    return True
+
+
+def parse_order(ids):
+    """Список id з JSON; None, якщо він некоректний"""
+    if not isinstance(ids, list) or not ids or len(ids) > REORDER_LIMIT:
+        return None
+    try:
+        ids = [int(item_id) for item_id in ids]
+    except (TypeError, ValueError):
+        return None
+    return ids if len(set(ids)) == len(ids) else None
+
+
+# API для зміни порядку активностей
+@bp.route('/api/reorder-activities', methods=['POST'])
+@login_required
+def reorder_activities():
+    data = request.get_json(silent=True) or {}
+    trip = Trip.query.get_or_404(data.get('trip_id'))
+
+    if trip.user_id != current_user.id:
+        return {'success': False, 'error': 'Access denied'}, 403
+
+    activity_ids = parse_order(data.get('activity_ids'))
+    if activity_ids is None:
+        return {'success': False, 'error': 'Некоректний список активностей'}, 400
+
+    conditions = [Activity.trip_id == trip.id]
+    if data.get('day_date'):
+        try:
+            day_start = datetime.strptime(data['day_date'], '%Y-%m-%d')
+        except (TypeError, ValueError):
+            return {'success': False, 'error': 'Некоректна дата'}, 400
+        conditions += [Activity.date >= day_start, Activity.date < day_start + timedelta(days=1)]
+
+    # З 1: позиція 0 означає "день не впорядковували вручну" (next_activity_position)
+    if not apply_order(Activity.position, activity_ids, *conditions, start=1):
+        return {'success': False, 'error': 'Активності не належать цьому дню поїздки'}, 400
+
+    touch_trip(trip.id)
+    db.session.commit()
+
+    return {'success': True}
+
+
+# Створення поїздки
+@bp.route('/trip/new', methods=['GET', 'POST'])
+@login_required
+def new_trip():
+    if request.method == 'POST':
+        title = request.form.get('title', '').strip()
+        destination = request.form.get('destination', '').strip()
+        start_date_str = request.form.get('start_date')
+        end_date_str = request.form.get('end_date')
+        budget_str = request.form.get('budget', '0')
+        currency = request.form.get('currency', 'UAH')
+
+        # Серверна валідація
+        if not title or not destination:
+            flash('Назва та напрямок є обов\'язковими полями', 'danger')
+            return render_template('trip.html')
+
+        try:
+            start_date = datetime.strptime(start_date_str, '%Y-%m-%d')
+            end_date = datetime.strptime(end_date_str, '%Y-%m-%d')
+
+            # Перевірка логічності дат
+            if end_date < start_date:
+                flash('Дата закінчення не може бути раніше дати початку', 'danger')
+                return render_template('trip.html')
+
+            budget = float(budget_str)
+            if budget < 0:
+                flash('Бюджет не може бути від\'ємним', 'danger')
+                return render_template('trip.html')
+
+        except ValueError:
+            flash('Невірний формат дати або бюджету', 'danger')
+            return render_template('trip.html')
+
+        new_trip = Trip(
+            title=title,
+            destination=destination,
+            start_date=start_date,
+            end_date=end_date,
+            budget=budget,
+            currency=currency,
+            user_id=current_user.id
+        )
+
+        db.session.add(new_trip)
+        db.session.commit()
+
+        db.session.add(new_trip)
+        db.session.commit()
+
+        # Перевірка досягнень
+        new_badges = check_achievements(current_user.id)
+
+        flash('Поїздку створено!', 'success')
+
+        # Повідомлення про нові досягнення
+        for badge in new_badges:
+            flash(f"🏆 Нове досягнення: {badge['icon']} {badge['name']}!", 'info')
+
+        return redirect(url_for('main.dashboard'))
+
+        flash('Поїздку створено!', 'success')
+        return redirect(url_for('main.dashboard'))
+
+    return render_template('new_trip.html',
+                           currencies=CURRENCY_RATES.keys(),
+                           currency_symbols=CURRENCY_SYMBOLS)
+
+    return render_template('trip.html')
+
+
+@bp.route('/trip/<int:trip_id>')
+@login_required
+@conditional_trip_page(extra=weather_hour)
+def view_trip(trip_id):
+    trip = Trip.query.get_or_404(trip_id)
+
+    if trip.user_id != current_user.id:
+        flash('У вас немає доступу до цієї поїздки', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    # Групуємо активності по днях
+    from collections import defaultdict
+    activities_by_day = defaultdict(list)
+
+    for activity in trip.activities:
+        activity_date = activity.date.date() if hasattr(activity.date, 'date') else activity.date
+        activities_by_day[activity_date].append(activity)
+
+    # Сортуємо дати
+    activities_by_day = dict(sorted(activities_by_day.items()))
+
+    # Отримуємо погоду
+    city, country = parse_city_country(trip.destination)
+    weather = get_weather(city, country)
+    weather_forecast = get_weather_forecast(city, country, days=7)
+
+    return render_template('trip_view.html',
+                           trip=trip,
+                           activities_by_day=activities_by_day,
+                           currency_rates=CURRENCY_RATES,
+                           currency_symbols=CURRENCY_SYMBOLS,
+                           weather=weather,
+                           weather_forecast=weather_forecast)
+
+
+# ==================== НАПРЯМКИ (МІСТА) ====================
+
+# Додати місто до поїздки
+@bp.route('/trip/<int:trip_id>/destination/add', methods=['POST'])
+@login_required
+def add_destination(trip_id):
+    trip = Trip.query.get_or_404(trip_id)
+
+    if trip.user_id != current_user.id:
+        return {'success': False, 'error': 'Access denied'}, 403
+
+    data = request.get_json()
+
+    # Визначаємо порядок (останнє + 1)
+    last_destination = TripDestination.query.filter_by(trip_id=trip_id).order_by(TripDestination.order.desc()).first()
+    order = (last_destination.order + 1) if last_destination else 0
+
+    new_destination = TripDestination(
+        trip_id=trip_id,
+        city=data.get('city'),
+        country=data.get('country'),
+        arrival_date=datetime.strptime(data.get('arrival_date'), '%Y-%m-%d').date() if data.get(
+            'arrival_date') else None,
+        departure_date=datetime.strptime(data.get('departure_date'), '%Y-%m-%d').date() if data.get(
+            'departure_date') else None,
+        order=order,
+        notes=data.get('notes', '')
+    )
+
+    db.session.add(new_destination)
+    db.session.commit()
+
+    return {
+        'success': True,
+        'destination': {
+            'id': new_destination.id,
+            'city': new_destination.city,
+            'country': new_destination.country,
+            'arrival_date': new_destination.arrival_date.strftime('%d.%m.%Y') if new_destination.arrival_date else None,
+            'departure_date': new_destination.departure_date.strftime(
+                '%d.%m.%Y') if new_destination.departure_date else None,
+            'order': new_destination.order
+        }
+    }
+
+
+# Редагувати місто
+@bp.route('/trip/<int:trip_id>/destination/<int:destination_id>/edit', methods=['POST'])
+@login_required
+def edit_destination(trip_id, destination_id):
+    destination = TripDestination.query.get_or_404(destination_id)
+
+    if destination.trip.user_id != current_user.id:
+        return {'success': False, 'error': 'Access denied'}, 403
+
+    data = request.get_json()
+
+    destination.city = data.get('city')
+    destination.country = data.get('country')
+    destination.arrival_date = datetime.strptime(data.get('arrival_date'), '%Y-%m-%d').date() if data.get(
+        'arrival_date') else None
+    destination.departure_date = datetime.strptime(data.get('departure_date'), '%Y-%m-%d').date() if data.get(
+        'departure_date') else None
+    destination.notes = data.get('notes', '')
+
+    db.session.commit()
+
+    return {'success': True}
+
+
+# Видалити місто
+@bp.route('/trip/<int:trip_id>/destination/<int:destination_id>/delete', methods=['POST'])
+@login_required
+def delete_destination(trip_id, destination_id):
+    destination = TripDestination.query.get_or_404(destination_id)
+
+    if destination.trip.user_id != current_user.id:
+        return {'success': False, 'error': 'Access denied'}, 403
+
+    db.session.delete(destination)
+    db.session.commit()
+
+    return {'success': True}
+
+
+# Змінити порядок міст
+@bp.route('/trip/<int:trip_id>/destinations/reorder', methods=['POST'])
+@login_required
+def reorder_destinations(trip_id):
+    trip = Trip.query.get_or_404(trip_id)
+
+    if trip.user_id != current_user.id:
+        return {'success': False, 'error': 'Access denied'}, 403
+
+    destination_ids = parse_order((request.get_json(silent=True) or {}).get('destination_ids'))
+    if destination_ids is None:
+        return {'success': False, 'error': 'Некоректний список міст'}, 400
+
+    if not apply_order(TripDestination.order, destination_ids, TripDestination.trip_id == trip.id):
+        return {'success': False, 'error': 'Міста не належать цій поїздці'}, 400
+
+    touch_trip(trip.id)
+    db.session.commit()
+
+    return {'success': True}
+
+
+# Редагування поїздки
+@bp.route('/trip/<int:trip_id>/edit', methods=['GET', 'POST'])
+@login_required
+def edit_trip(trip_id):
+    trip = Trip.query.get_or_404(trip_id)
+
+    # Перевірка доступу
+    if trip.user_id != current_user.id:
+        flash('У вас немає доступу до цієї поїздки', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    if request.method == 'POST':
+        title = request.form.get('title', '').strip()
+        destination = request.form.get('destination', '').strip()
+        start_date_str = request.form.get('start_date')
+        end_date_str = request.form.get('end_date')
+        budget_str = request.form.get('budget', '0')
+
+        # Валідація
+        if not title or not destination:
+            flash('Назва та напрямок є обов\'язковими', 'danger')
+            return render_template('trip_edit.html', trip=trip)
+
+        try:
+            start_date = datetime.strptime(start_date_str, '%Y-%m-%d')
+            end_date = datetime.strptime(end_date_str, '%Y-%m-%d')
+
+            if end_date < start_date:
+                flash('Дата закінчення не може бути раніше дати початку', 'danger')
+                return render_template('trip_edit.html', trip=trip)
+
+            budget = float(budget_str)
+            if budget < 0:
+                flash('Бюджет не може бути від\'ємним', 'danger')
+                return render_template('trip_edit.html', trip=trip)
+
+            # Оновлення даних
+            trip.title = title
+            trip.destination = destination
+            trip.start_date = start_date
+            trip.end_date = end_date
+            trip.budget = budget
+
+            db.session.commit()
+            flash('Поїздку оновлено!', 'success')
+            return redirect(url_for('trips.view_trip', trip_id=trip.id))
+
+        except ValueError:
+            flash('Невірний формат дати або бюджету', 'danger')
+            return render_template('trip_edit.html', trip=trip)
+
+    return render_template('trip_edit.html', trip=trip)
+
+
+# Видалення поїздки
+@bp.route('/trip/<int:trip_id>/delete', methods=['POST'])
+@login_required
+def delete_trip(trip_id):
+    trip = Trip.query.get_or_404(trip_id)
+
+    # Перевірка доступу
+    if trip.user_id != current_user.id:
+        flash('У вас немає доступу до цієї поїздки', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    db.session.delete(trip)
+    db.session.commit()
+
+    flash('Поїздку видалено', 'info')
+    return redirect(url_for('main.dashboard'))
+
+
+# Додавання активності
+@bp.route('/trip/<int:trip_id>/activity/new', methods=['GET', 'POST'])
+@login_required
+def new_activity(trip_id):
+    trip = Trip.query.get_or_404(trip_id)
+
+    if trip.user_id != current_user.id:
+        flash('У вас немає доступу до цієї поїздки', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    if request.method == 'POST':
+        title = request.form.get('title', '').strip()
+        description = request.form.get('description', '').strip()
+        date_str = request.form.get('date')
+        time = request.form.get('time', '').strip()
+        location = request.form.get('location', '').strip()
+        cost_str = request.form.get('cost', '0')
+        category = request.form.get('category', 'general')
+
+        if not title or not date_str:
+            flash('Назва та дата є обов\'язковими', 'danger')
+            return render_template('activity_form.html', trip=trip)
+
+        try:
+            date = datetime.strptime(date_str, '%Y-%m-%d')
+
+            # Перевірка, чи дата в межах поїздки
+            if date.date() < trip.start_date.date() or date.date() > trip.end_date.date():
+                flash('Дата активності повинна бути в межах дат поїздки', 'danger')
+                return render_template('activity_form.html', trip=trip)
+
+            cost = float(cost_str)
+
+            new_activity = Activity(
+                title=title,
+                description=description,
+                date=date,
+                time=time,
+                location=location,
+                cost=cost,
+                category=category,
+                trip_id=trip.id
+            )
+
+            db.session.add(new_activity)
+            db.session.commit()
+
+            flash('Активність додано!', 'success')
+            return redirect(url_for('trips.view_trip', trip_id=trip.id))
+
+        except ValueError:
+            flash('Невірний формат даних', 'danger')
+            return render_template('activity_form.html', trip=trip)
+
+    return render_template('activity_form.html', trip=trip)
+
+
+# Редагування активності
+@bp.route('/trip/<int:trip_id>/activity/<int:activity_id>/edit', methods=['GET', 'POST'])
+@login_required
+def edit_activity(trip_id, activity_id):
+    trip = Trip.query.get_or_404(trip_id)
+    activity = Activity.query.get_or_404(activity_id)
+
+    if trip.user_id != current_user.id or activity.trip_id != trip.id:
+        flash('У вас немає доступу', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    if request.method == 'POST':
+        title = request.form.get('title', '').strip()
+        description = request.form.get('description', '').strip()
+        date_str = request.form.get('date')
+        time = request.form.get('time', '').strip()
+        location = request.form.get('location', '').strip()
+        cost_str = request.form.get('cost', '0')
+        category = request.form.get('category', 'general')
+
+        if not title or not date_str:
+            flash('Назва та дата є обов\'язковими', 'danger')
+            return render_template('activity_form.html', trip=trip, activity=activity)
+
+        try:
+            date = datetime.strptime(date_str, '%Y-%m-%d')
+
+            if date.date() < trip.start_date.date() or date.date() > trip.end_date.date():
+                flash('Дата активності повинна бути в межах дат поїздки', 'danger')
+                return render_template('activity_form.html', trip=trip, activity=activity)
+
+            cost = float(cost_str)
+
+            # Перенесена на інший день активність стає в кінець того дня
+            if date.date() != activity.date.date():
+                activity.position = next_activity_position(db.session.connection(), trip.id, date)
+
+            activity.title = title
+            activity.description = description
+            activity.date = date
+            activity.time = time
+            activity.location = location
+            activity.cost = cost
+            activity.category = category
+
+            db.session.commit()
+
+            flash('Активність оновлено!', 'success')
+            return redirect(url_for('trips.view_trip', trip_id=trip.id))
+
+        except ValueError:
+            flash('Невірний формат даних', 'danger')
+            return render_template('activity_form.html', trip=trip, activity=activity)
+
+    return render_template('activity_form.html', trip=trip, activity=activity)
+
+
+# Видалення активності
+@bp.route('/trip/<int:trip_id>/activity/<int:activity_id>/delete', methods=['POST'])
+@login_required
+def delete_activity(trip_id, activity_id):
+    trip = Trip.query.get_or_404(trip_id)
+    activity = Activity.query.get_or_404(activity_id)
+
+    if trip.user_id != current_user.id or activity.trip_id != trip.id:
+        flash('У вас немає доступу', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    db.session.delete(activity)
+    db.session.commit()
+
+    flash('Активність видалено', 'info')
+    return redirect(url_for('trips.view_trip', trip_id=trip.id))
+
+
+# Позначити активність як виконану
+@bp.route('/trip/<int:trip_id>/activity/<int:activity_id>/toggle', methods=['POST'])
+@login_required
+def toggle_activity(trip_id, activity_id):
+    trip = Trip.query.get_or_404(trip_id)
+    activity = Activity.query.get_or_404(activity_id)
+
+    if trip.user_id != current_user.id or activity.trip_id != trip.id:
+        flash('У вас немає доступу', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    activity.completed = not activity.completed
+    db.session.commit()
+
+    return redirect(url_for('trips.view_trip', trip_id=trip.id))
+
+
+# Позначити активність без перезавантаження сторінки
+@bp.route('/api/trip/<int:trip_id>/activity/<int:activity_id>/toggle', methods=['POST'])
+@login_required
+def toggle_activity_json(trip_id, activity_id):
+    trip = Trip.query.get_or_404(trip_id)
+    activity = Activity.query.get_or_404(activity_id)
+
+    if trip.user_id != current_user.id or activity.trip_id != trip.id:
+        return {'success': False, 'error': 'Access denied'}, 403
+
+    done = not activity.completed
+    activity.completed = done
+    db.session.commit()
+
+    total, completed = db.session.query(
+        db.func.count(Activity.id),
+        db.func.sum(db.case((Activity.completed, 1), else_=0)),
+    ).filter(Activity.trip_id == trip.id).one()
+    completed = int(completed or 0)
+
+    return {'success': True, 'id': activity_id, 'done': done,
+            'progress': {'done': completed, 'total': total,
+                         'percent': round(completed / total * 100) if total else 0}}
+
+
+# Статистика поїздки
+@bp.route('/trip/<int:trip_id>/statistics')
+@login_required
+@conditional_trip_page
+def trip_statistics(trip_id):
+    trip = Trip.query.get_or_404(trip_id)
+
+    if trip.user_id != current_user.id:
+        flash('У вас немає доступу до цієї поїздки', 'danger')
+        return redirect(url_for('main.dashboard'))
+
+    # Витрати з активностей
+    activities = Activity.query.filter_by(trip_id=trip.id).all()
+    total_activities_cost = sum(activity.cost for activity in activities)
+
+    # Витрати на готелі
+    accommodations = Accommodation.query.filter_by(trip_id=trip.id).all()
+    total_accommodation_cost = sum(acc.total_price for acc in accommodations)
+
+    # Витрати на транспорт
+    transports = Transport.query.filter_by(trip_id=trip.id).all()
+    total_transport_cost = sum(transport.cost for transport in transports)
+
+    # Загальні витрати
+    total_spent = total_activities_cost + total_accommodation_cost + total_transport_cost
+    remaining_budget = trip.budget - total_spent
+    budget_percentage = (total_spent / trip.budget * 100) if trip.budget > 0 else 0
+
+    # Витрати по категоріях активностей
+    category_costs = {}
+    for activity in activities:
+        if activity.category in category_costs:
+            category_costs[activity.category] += activity.cost
+        else:
+            category_costs[activity.category] = activity.cost
+
+    # Додаємо готелі як окрему категорію
+    if total_accommodation_cost > 0:
+        category_costs['accommodation_hotels'] = total_accommodation_cost
+
+    # Додаємо транспорт як окрему категорію
+    if total_transport_cost > 0:
+        category_costs['transport_main'] = total_transport_cost
+
+    # Відсоток виконаних активностей
+    completed_activities = len([a for a in activities if a.completed])
+    completion_rate = (completed_activities / len(activities) * 100) if activities else 0
+
+    # Назви категорій українською
+    category_names = {
+        'transport': '🚗 Транспорт (активності)',
+        'transport_main': '✈️ Транспорт',
+        'food': '🍽️ Їжа',
+        'activity': '🎡 Розваги',
+        'accommodation': '🏨 Додаткове проживання',
+        'shopping': '🛍️ Покупки',
+        'general': '🎯 Загальне',
+        'accommodation_hotels': '🏨 Готелі'
+    }
+
+    transport_types = {
+        'plane': '✈️ Літак',
+        'train': '🚆 Поїзд',
+        'bus': '🚌 Автобус',
+        'car': '🚗 Автомобіль',
+        'ferry': '⛴️ Пором',
+        'taxi': '🚕 Таксі',
+        'metro': '🚇 Метро'
+    }
+
+    # Підготовка даних для діаграми
+    category_data = []
+    for category, cost in category_costs.items():
+        percentage = (cost / total_spent * 100) if total_spent > 0 else 0
+        category_data.append({
+            'name': category_names.get(category, category),
+            'cost': cost,
+            'percentage': percentage
+        })
+
+    # Сортуємо за вартістю
+    category_data.sort(key=lambda x: x['cost'], reverse=True)
+
+    # Детальний список витрат (активності + готелі)
+    expense_list = []
+
+    # Додаємо активності
+    for activity in activities:
+        expense_list.append({
+            'type': 'activity',
+            'date': activity.date,
+            'title': activity.title,
+            'category': category_names.get(activity.category, activity.category),
+            'cost': activity.cost
+        })
+
+    # Додаємо готелі
+    for acc in accommodations:
+        nights = (acc.check_out - acc.check_in).days
+        expense_list.append({
+            'type': 'accommodation',
+            'date': acc.check_in,
+            'title': f"{acc.name} ({nights} ночей)",
+            'category': '🏨 Готелі',
+            'cost': acc.total_price
+        })
+    # Додаємо транспорт
+    for transport in transports:
+        transport_type_name = transport_types.get(transport.type, transport.type)
+        expense_list.append({
+            'type': 'transport',
+            'date': transport.departure_date,
+            'title': f"{transport.from_location} → {transport.to_location}",
+            'category': '✈️ Транспорт',
+            'transport_type': transport_type_name,  # Окремо тип
+            'cost': transport.cost
+        })
+
+    # Сортуємо за датою
+    expense_list.sort(key=lambda x: x['date'])
+
+    return render_template('trip_statistics.html',
+                           trip=trip,
+                           total_spent=total_spent,
+                           total_activities_cost=total_activities_cost,
+                           total_accommodation_cost=total_accommodation_cost,
+                           remaining_budget=remaining_budget,
+                           budget_percentage=budget_percentage,
+                           category_data=category_data,
+                           completion_rate=completion_rate,
+                           expense_list=expense_list,
+                           activities_count=len(activities),
+                           completed_count=completed_activities,
+                           accommodations_count=len(accommodations))
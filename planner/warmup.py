@@ -0,0 +1,87 @@
+"""Прогрів застосунку перед обслуговуванням запитів
+
+З gunicorn --preload прогрів виконується один раз у master-процесі до fork:
+скомпільовані шаблони, налаштовані mapper-и SQLAlchemy, шрифти ReportLab та
+курси валют спільно використовуються воркерами (copy-on-write). Без
+--preload кожен воркер прогрівається сам після завантаження застосунку
+(див. gunicorn.conf.py).
+"""
+import gc
+import os
+import time
+
+from sqlalchemy.orm import configure_mappers
+
+from planner.currency import get_live_exchange_rates
+from planner.extensions import db
+from planner.metrics import flush_metrics, registry
+from planner.templating import compile_templates
+
+
+def precompile_templates(app):
+    """Завантажує всі шаблони в кеш Jinja; повертає кількість шаблонів"""
+    count, errors = compile_templates(app)
+
+    for location, error in errors:
+        print(f"WARMUP: шаблон {location} не компілюється: {error}")
+
+    return count
+
+
+def preload_pdf(app):
+    from planner.views.export import preload_pdf_toolkit
+
+    preload_pdf_toolkit(os.path.join(app.static_folder, 'fonts'))
+
+
+def prime_rates(app):
+    return bool(get_live_exchange_rates())
+
+
+WARMUP_STEPS = (
+    ('templates', precompile_templates),
+    ('mappers', lambda app: configure_mappers()),
+    ('pdf', preload_pdf),
+    ('rates', prime_rates),
+)
+
+
+def warmup(app):
+    """Виконує всі кроки прогріву; повертає {крок: (мс, результат)}"""
+    report = {}
+
+    with app.app_context():
+        for name, step in WARMUP_STEPS:
+            started = time.perf_counter()
+            try:
+                result = step(app)
+            except Exception as e:
+                print(f"WARMUP: крок {name} не вдався: {e}")
+                result = None
+            report[name] = (round((time.perf_counter() - started) * 1000, 1), result)
+
+        # Метрики прогріву (виклик ПриватБанку) переносимо до fork, інакше кожен воркер додасть їх ще раз
+        flush_metrics(force=True)
+
+        # З'єднання з БД не можна ділити між процесами — воркери відкриють власні
+        db.engine.dispose()
+
+    return report
+
+
+def freeze_for_fork():
+    """Переносить об'єкти master-процесу в постійне покоління GC,
+    щоб збирач сміття у воркерах не торкався їх сторінок пам'яті"""
+    gc.collect()
+    gc.freeze()
+
+
+def after_fork(app):
+    """Викликається у воркері після fork: скидає успадковані з'єднання та метрики master"""
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+    registry.reset()
+    store = app.extensions.get('metrics')
+    if store is not None:
+        store.forget_connections()
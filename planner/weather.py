@@ -0,0 +1,121 @@
+"""Погода з OpenWeatherMap"""
+from datetime import datetime
+
+from planner.config import OPENWEATHER_API_KEY, WEATHER_ENABLED
+from planner.instrumentation import external_call
+
+
+def weather_hour():
+    """Частина ключа умовного GET для сторінок з погодою: вона оновлюється щогодини"""
+    if not WEATHER_ENABLED or not OPENWEATHER_API_KEY:
+        return ''
+    return datetime.now().strftime('%Y%m%d%H')
+
+
+def get_weather(city, country_code=''):
+    """Отримує погоду для міста"""
+    if not WEATHER_ENABLED or not OPENWEATHER_API_KEY:
+        return None
+
+    import requests
+
+    try:
+        # Формуємо запит
+        location = f"{city},{country_code}" if country_code else city
+        url = f"http://api.openweathermap.org/data/2.5/weather"
+        params = {
+            'q': location,
+            'appid': OPENWEATHER_API_KEY,
+            'units': 'metric',
+            'lang': 'uk'
+        }
+
+        with external_call('weather') as call:
+            response = requests.get(url, params=params, timeout=5)
+            call.ok = response.ok
+
+        if response.status_code == 200:
+            data = response.json()
+
+            return {
+                'temp': round(data['main']['temp']),
+                'feels_like': round(data['main']['feels_like']),
+                'description': data['weather'][0]['description'],
+                'icon': data['weather'][0]['icon'],
+                'humidity': data['main']['humidity'],
+                'wind_speed': round(data['wind']['speed'] * 3.6, 1),  # м/с в км/год
+                'pressure': data['main']['pressure']
+            }
+
+        return None
+
+    except Exception as e:
+        print(f"Помилка отримання погоди: {e}")
+        return None
+
+
+def get_weather_forecast(city, country_code='', days=5):
+    """Отримує прогноз погоди на кілька днів"""
+    if not WEATHER_ENABLED or not OPENWEATHER_API_KEY:
+        return None
+
+    import requests
+
+    try:
+        location = f"{city},{country_code}" if country_code else city
+        url = f"http://api.openweathermap.org/data/2.5/forecast"
+        params = {
+            'q': location,
+            'appid': OPENWEATHER_API_KEY,
+            'units': 'metric',
+            'lang': 'uk'
+        }
+
+        with external_call('weather') as call:
+            response = requests.get(url, params=params, timeout=5)
+            call.ok = response.ok
+
+        if response.status_code == 200:
+            data = response.json()
+
+            # Групуємо по днях (беремо полуденні показники)
+            daily_forecast = []
+            current_date = None
+
+            for item in data['list']:
+                dt = datetime.fromtimestamp(item['dt'])
+                date_str = dt.strftime('%Y-%m-%d')
+
+                # Беремо один запис на день (близько 12:00)
+                if date_str != current_date and dt.hour >= 11 and dt.hour <= 14:
+                    current_date = date_str
+                    daily_forecast.append({
+                        'date': dt,
+                        'temp': round(item['main']['temp']),
+                        'temp_min': round(item['main']['temp_min']),
+                        'temp_max': round(item['main']['temp_max']),
+                        'description': item['weather'][0]['description'],
+                        'icon': item['weather'][0]['icon']
+                    })
+
+                    if len(daily_forecast) >= days:
+                        break
+
+            return daily_forecast
+
+        return None
+
+    except Exception as e:
+        print(f"Помилка отримання прогнозу: {e}")
+        return None
+
+
+def parse_city_country(destination):
+    """Парсить місто та країну з рядка напрямку"""
+    # Очікуємо формат: "Київ, Україна" або просто "Париж"
+    parts = [p.strip() for p in destination.split(',')]
+
+    if len(parts) >= 2:
+        return parts[0], parts[1]  # місто, країна
+    else:
+        return parts[0], ''  # тільки місто
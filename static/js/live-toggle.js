@@ -0,0 +1,85 @@
+// ==================== ПЕРЕМИКАЧІ БЕЗ ПЕРЕЗАВАНТАЖЕННЯ ====================
+// Форма з data-json-action надсилається через fetch на JSON-варіант маршруту,
+// після чого оновлюються лише змінені рядки та лічильники прогресу.
+// Без JS (або якщо запит не вдався) форма працює як звичайно: POST + редірект.
+//
+// Розмітка:
+//   [data-toggle-item][data-done-class]     рядок; клас додається, коли пункт виконано
+//   [data-on-class][data-off-class]         іконка всередині рядка
+//   [data-on-text][data-off-text]           текст кнопки всередині рядка
+//   [data-toggle-strike="класи"]            текст, який закреслюється
+//   form[data-toggle-all]                   форма змінює всі рядки свого [data-toggle-group]
+//   [data-progress-count|percent|bar]       лічильники прогресу сторінки
+//   [data-progress-complete]                показується лише при 100%
+//   [data-progress-any]                     показується, коли виконано хоча б один пункт
+
+function setToggleState(item, done) {
+    item.classList.toggle(item.dataset.doneClass, done);
+
+    item.querySelectorAll('[data-on-class]').forEach(function(icon) {
+        icon.className = done ? icon.dataset.onClass : icon.dataset.offClass;
+    });
+    item.querySelectorAll('[data-on-text]').forEach(function(node) {
+        node.textContent = done ? node.dataset.onText : node.dataset.offText;
+    });
+    item.querySelectorAll('[data-toggle-strike]').forEach(function(node) {
+        node.dataset.toggleStrike.split(' ').forEach(function(cls) {
+            node.classList.toggle(cls, done);
+        });
+    });
+}
+
+function setProgress(progress) {
+    if (!progress) return;
+
+    document.querySelectorAll('[data-progress-count]').forEach(function(node) {
+        node.textContent = progress.done + '/' + progress.total;
+    });
+    document.querySelectorAll('[data-progress-percent]').forEach(function(node) {
+        node.textContent = progress.percent + '%';
+    });
+    document.querySelectorAll('[data-progress-bar]').forEach(function(node) {
+        node.style.width = progress.percent + '%';
+    });
+    document.querySelectorAll('[data-progress-complete]').forEach(function(node) {
+        node.classList.toggle('d-none', progress.total === 0 || progress.percent < 100);
+    });
+    document.querySelectorAll('[data-progress-any]').forEach(function(node) {
+        node.classList.toggle('d-none', progress.done === 0);
+    });
+}
+
+document.addEventListener('submit', function(event) {
+    const form = event.target;
+    if (!form.dataset || !form.dataset.jsonAction || form.dataset.sending) return;
+
+    event.preventDefault();
+    form.dataset.sending = '1';
+
+    fetch(form.dataset.jsonAction, {
+        method: 'POST',
+        headers: {'Accept': 'application/json'},
+        credentials: 'same-origin',
+        body: new FormData(form)
+    })
+    .then(function(response) {
+        if (!response.ok || response.redirected) throw new Error('HTTP ' + response.status);
+        return response.json();
+    })
+    .then(function(data) {
+        const items = form.hasAttribute('data-toggle-all')
+            ? form.closest('[data-toggle-group]').querySelectorAll('[data-toggle-item]')
+            : [form.closest('[data-toggle-item]')];
+
+        items.forEach(function(item) {
+            if (item) setToggleState(item, data.done);
+        });
+        setProgress(data.progress);
+        delete form.dataset.sending;
+    })
+    .catch(function(error) {
+        console.error('Помилка:', error);
+        // Звичайне надсилання форми: сторінка перезавантажиться з актуальним станом
+        form.submit();
+    });
+});
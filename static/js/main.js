@@ -234,4 +234,14 @@ async function send() {
         addMessage("⚠️ Помилка: " + err.message, "bot");
         console.error(err);
     }
-}
\ No newline at end of file
+}
+
+// ==================== SERVICE WORKER ====================
+
+if ('serviceWorker' in navigator) {
+    window.addEventListener('load', function() {
+        navigator.serviceWorker.register('/sw.js').catch(function(error) {
+            console.log('Service Worker не зареєстровано:', error);
+        });
+    });
+}
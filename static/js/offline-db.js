@@ -0,0 +1,84 @@
+// ==================== ОФЛАЙН-КОПІЯ ПОЇЗДОК (IndexedDB) ====================
+// Спільний для service worker (записує) та офлайн-сторінки (читає)
+
+(function(scope) {
+    const DB_NAME = 'travel-planner';
+    const DB_VERSION = 1;
+    const TRIPS = 'trips';
+    const META = 'meta';
+
+    function open() {
+        return new Promise(function(resolve, reject) {
+            const request = indexedDB.open(DB_NAME, DB_VERSION);
+
+            request.onupgradeneeded = function() {
+                const db = request.result;
+                if (!db.objectStoreNames.contains(TRIPS)) {
+                    db.createObjectStore(TRIPS, { keyPath: 'id' });
+                }
+                if (!db.objectStoreNames.contains(META)) {
+                    db.createObjectStore(META);
+                }
+            };
+            request.onsuccess = function() { resolve(request.result); };
+            request.onerror = function() { reject(request.error); };
+        });
+    }
+
+    // Виконує work(transaction) і повертає результат останнього запиту після commit
+    async function run(stores, mode, work) {
+        const db = await open();
+
+        return new Promise(function(resolve, reject) {
+            const transaction = db.transaction(stores, mode);
+            const request = work(transaction);
+
+            transaction.oncomplete = function() {
+                db.close();
+                resolve(request ? request.result : undefined);
+            };
+            transaction.onerror = transaction.onabort = function() {
+                db.close();
+                reject(transaction.error);
+            };
+        });
+    }
+
+    // Повністю замінює збережені поїздки: видалені на сервері зникають і тут
+    function replaceTrips(trips, meta) {
+        return run([TRIPS, META], 'readwrite', function(transaction) {
+            const store = transaction.objectStore(TRIPS);
+            store.clear();
+            trips.forEach(function(trip) { store.put(trip); });
+            return transaction.objectStore(META).put(meta, 'sync');
+        });
+    }
+
+    function getTrips() {
+        return run([TRIPS], 'readonly', function(transaction) {
+            return transaction.objectStore(TRIPS).getAll();
+        });
+    }
+
+    function getTrip(id) {
+        return run([TRIPS], 'readonly', function(transaction) {
+            return transaction.objectStore(TRIPS).get(id);
+        });
+    }
+
+    function getMeta() {
+        return run([META], 'readonly', function(transaction) {
+            return transaction.objectStore(META).get('sync');
+        });
+    }
+
+    // При виході з акаунта дані поїздок не повинні залишатися на пристрої
+    function clear() {
+        return run([TRIPS, META], 'readwrite', function(transaction) {
+            transaction.objectStore(TRIPS).clear();
+            return transaction.objectStore(META).clear();
+        });
+    }
+
+    scope.OfflineTrips = { replaceTrips, getTrips, getTrip, getMeta, clear };
+})(self);
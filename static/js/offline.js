@@ -0,0 +1,165 @@
+// ==================== ОФЛАЙН-СТОРІНКА ====================
+// Показує поїздки з IndexedDB: список або одну поїздку, якщо відкрито /trip/<id>
+
+const TRANSPORT_ICONS = {
+    plane: '✈️', train: '🚆', bus: '🚌', car: '🚗', ferry: '⛴️', taxi: '🚕', metro: '🚇'
+};
+
+function el(tag, className, text) {
+    const node = document.createElement(tag);
+    if (className) node.className = className;
+    if (text !== undefined && text !== null) node.textContent = text;
+    return node;
+}
+
+function formatDate(value) {
+    if (!value) return '—';
+    const [year, month, day] = value.slice(0, 10).split('-');
+    return `${day}.${month}.${year}`;
+}
+
+function formatMoment(value) {
+    if (!value) return '—';
+    return `${formatDate(value)} ${value.slice(11, 16)}`;
+}
+
+function section(title, icon) {
+    const card = el('div', 'card shadow-sm mb-4');
+    const header = el('div', 'card-header');
+    const heading = el('h5', 'mb-0');
+    heading.append(el('i', `bi ${icon}`), ' ' + title);
+    header.append(heading);
+    const body = el('div', 'card-body');
+    card.append(header, body);
+    return { card, body };
+}
+
+function renderTripList(trips, container) {
+    if (!trips.length) {
+        container.append(el('p', 'text-muted text-center py-5',
+            'Збережених поїздок немає. Відкрийте застосунок з інтернетом, щоб вони з\'явилися тут.'));
+        return;
+    }
+
+    container.append(el('h2', 'mb-4', 'Найближчі поїздки'));
+    const row = el('div', 'row');
+
+    trips.sort((a, b) => a.start_date.localeCompare(b.start_date)).forEach(trip => {
+        const col = el('div', 'col-md-6 col-lg-4 mb-4');
+        const card = el('div', 'card trip-card h-100');
+        const body = el('div', 'card-body');
+
+        body.append(
+            el('h5', 'card-title', trip.title),
+            el('p', 'trip-info mb-2', `📍 ${trip.destination}`),
+            el('p', 'trip-info mb-3', `📅 ${formatDate(trip.start_date)} – ${formatDate(trip.end_date)}`)
+        );
+
+        const link = el('a', 'btn btn-primary btn-sm', 'Відкрити поїздку');
+        link.href = `/trip/${trip.id}`;
+        body.append(link);
+
+        card.append(body);
+        col.append(card);
+        row.append(col);
+    });
+
+    container.append(row);
+}
+
+function renderTrip(trip, container) {
+    const back = el('a', 'btn btn-link px-0 mb-3', '← Усі збережені поїздки');
+    back.href = '/offline';
+    container.append(back,
+        el('h2', 'mb-1', trip.title),
+        el('p', 'text-muted mb-4', `📍 ${trip.destination} · ${formatDate(trip.start_date)} – ${formatDate(trip.end_date)}`));
+
+    // Квитки
+    if (trip.transports.length) {
+        const { card, body } = section('Квитки', 'bi-ticket-perforated');
+        trip.transports.forEach(t => {
+            const item = el('div', 'border-bottom pb-2 mb-2');
+            item.append(
+                el('div', 'fw-bold', `${TRANSPORT_ICONS[t.type] || '🚀'} ${t.from_location} → ${t.to_location}`),
+                el('div', 'small', `Відправлення: ${formatMoment(t.departure_date)}` +
+                    (t.arrival_date ? ` · Прибуття: ${formatMoment(t.arrival_date)}` : '')),
+                el('div', 'small text-muted', [
+                    t.carrier,
+                    t.ticket_number && `Квиток: ${t.ticket_number}`,
+                    t.seat_number && `Місце: ${t.seat_number}`,
+                    t.booking_reference && `Бронювання: ${t.booking_reference}`
+                ].filter(Boolean).join(' · '))
+            );
+            if (t.notes) item.append(el('div', 'small', t.notes));
+            body.append(item);
+        });
+        container.append(card);
+    }
+
+    // Житло
+    if (trip.accommodations.length) {
+        const { card, body } = section('Житло', 'bi-building');
+        trip.accommodations.forEach(a => {
+            const item = el('div', 'border-bottom pb-2 mb-2');
+            item.append(
+                el('div', 'fw-bold', a.name),
+                el('div', 'small', `${formatMoment(a.check_in)} – ${formatMoment(a.check_out)}`),
+                el('div', 'small text-muted', [
+                    a.address,
+                    a.phone && `☎ ${a.phone}`,
+                    a.booking_reference && `Бронювання: ${a.booking_reference}`
+                ].filter(Boolean).join(' · '))
+            );
+            if (a.notes) item.append(el('div', 'small', a.notes));
+            body.append(item);
+        });
+        container.append(card);
+    }
+
+    // Маршрут по днях
+    const { card, body } = section('Маршрут', 'bi-calendar-week');
+    if (!trip.activities.length) {
+        body.append(el('p', 'text-muted mb-0', 'Активностей ще немає'));
+    }
+
+    let currentDay = null;
+    trip.activities.forEach(a => {
+        if (a.date !== currentDay) {
+            currentDay = a.date;
+            body.append(el('h6', 'mt-3 text-primary', formatDate(a.date)));
+        }
+        const item = el('div', 'd-flex gap-3 mb-2');
+        item.append(el('span', 'text-muted', a.time || '—'));
+        const details = el('div');
+        details.append(el('div', a.completed ? 'text-decoration-line-through' : 'fw-bold', a.title));
+        if (a.location) details.append(el('div', 'small text-muted', `📍 ${a.location}`));
+        item.append(details);
+        body.append(item);
+    });
+    container.append(card);
+}
+
+document.addEventListener('DOMContentLoaded', async function() {
+    const container = document.getElementById('offlineContent');
+
+    try {
+        const [trips, meta] = await Promise.all([OfflineTrips.getTrips(), OfflineTrips.getMeta()]);
+        container.replaceChildren();
+
+        if (meta && meta.syncedAt) {
+            document.getElementById('offlineSyncedAt').textContent = `(оновлено ${formatMoment(meta.syncedAt)})`;
+        }
+
+        const match = location.pathname.match(/^\/trip\/(\d+)/);
+        const trip = match && trips.find(t => t.id === Number(match[1]));
+
+        if (trip) {
+            renderTrip(trip, container);
+        } else {
+            renderTripList(trips, container);
+        }
+    } catch (error) {
+        container.replaceChildren(el('p', 'text-danger text-center py-5', 'Не вдалося прочитати збережені поїздки'));
+        console.error(error);
+    }
+});
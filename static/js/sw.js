@@ -1,51 +1,179 @@
-const CACHE_NAME = 'travel-planner-v1';
-const urlsToCache = [
-  '/',
-  '/static/css/style.css',
-  '/static/js/main.js',
-  '/static/manifest.json'
-];
-
-// Встановлення Service Worker
+// Service Worker Travel Planner
+// /sw.js додає перед цим кодом self.__SW_CONFIG__: версію збірки, список precache та адреси
+
+const CONFIG = self.__SW_CONFIG__ || {
+  version: 'dev',
+  precache: ['/offline'],
+  offlineUrl: '/offline',
+  offlineDb: '/static/js/offline-db.js',
+  tripsUrl: '/api/offline/trips',
+  logoutUrl: '/logout'
+};
+
+importScripts(CONFIG.offlineDb);
+
+const PRECACHE = `tp-precache-${CONFIG.version}`;
+const PAGES = `tp-pages-${CONFIG.version}`;
+const ASSETS = `tp-assets-${CONFIG.version}`;
+const CURRENT_CACHES = [PRECACHE, PAGES, ASSETS];
+
+// Скільки чекати мережу, перш ніж показати збережену сторінку
+const NETWORK_TIMEOUT_MS = 4000;
+// Як часто (не частіше) оновлювати офлайн-копію поїздок
+const SYNC_INTERVAL_MS = 60 * 1000;
+
+// Встановлення: ресурси поточної збірки
 self.addEventListener('install', event => {
   event.waitUntil(
-    caches.open(CACHE_NAME)
-      .then(cache => {
-        console.log('Кеш відкрито');
-        return cache.addAll(urlsToCache);
-      })
+    caches.open(PRECACHE)
+      .then(cache => cache.addAll(CONFIG.precache))
+      .then(() => self.skipWaiting())
   );
 });
 
-// Активація Service Worker
+// Активація: видаляємо кеші попередніх збірок
 self.addEventListener('activate', event => {
   event.waitUntil(
-    caches.keys().then(cacheNames => {
-      return Promise.all(
-        cacheNames.map(cacheName => {
-          if (cacheName !== CACHE_NAME) {
-            console.log('Видалення старого кешу:', cacheName);
-            return caches.delete(cacheName);
-          }
-        })
-      );
-    })
+    caches.keys()
+      .then(names => Promise.all(
+        names.filter(name => !CURRENT_CACHES.includes(name)).map(name => caches.delete(name))
+      ))
+      .then(() => self.clients.claim())
+      .then(() => syncTrips(true).catch(() => {}))
   );
 });
 
-// Перехоплення запитів
+self.addEventListener('message', event => {
+  if (event.data && event.data.type === 'sync-trips') {
+    event.waitUntil(syncTrips(true).catch(() => {}));
+  }
+});
+
 self.addEventListener('fetch', event => {
-  event.respondWith(
-    caches.match(event.request)
-      .then(response => {
-        // Повертаємо з кешу або робимо запит
-        return response || fetch(event.request);
-      })
-      .catch(() => {
-        // Якщо офлайн, показуємо базову сторінку
-        if (event.request.destination === 'document') {
-          return caches.match('/');
-        }
-      })
-  );
-});
\ No newline at end of file
+  const request = event.request;
+  if (request.method !== 'GET') {
+    return;
+  }
+
+  const url = new URL(request.url);
+
+  if (url.origin === self.location.origin && url.pathname === CONFIG.logoutUrl) {
+    event.respondWith(forgetUser().then(() => fetch(request)));
+    return;
+  }
+
+  if (request.mode === 'navigate') {
+    event.respondWith(networkFirst(request));
+    event.waitUntil(syncTrips(false).catch(() => {}));
+    return;
+  }
+
+  const isStatic = url.origin === self.location.origin
+    ? url.pathname.startsWith('/assets/') || url.pathname.startsWith('/static/')
+    : ['style', 'script', 'font'].includes(request.destination);
+
+  if (isStatic) {
+    event.respondWith(staleWhileRevalidate(event, url));
+  }
+  // API та інші запити йдуть у мережу без кешу
+});
+
+// HTML: спершу мережа, без неї — збережена копія сторінки або офлайн-сторінка
+async function networkFirst(request) {
+  const cache = await caches.open(PAGES);
+
+  const network = fetch(request).then(response => {
+    // Редірект на вхід чи помилку не зберігаємо
+    if (response.ok && !response.redirected && response.type === 'basic') {
+      cache.put(request, response.clone());
+    }
+    return response;
+  });
+
+  try {
+    return await withTimeout(network, NETWORK_TIMEOUT_MS);
+  } catch (error) {
+    const cached = await cache.match(request);
+    if (cached) {
+      return cached;
+    }
+
+    try {
+      return await network;
+    } catch (networkError) {
+      return (await caches.match(CONFIG.offlineUrl)) || Response.error();
+    }
+  }
+}
+
+// Статика: одразу з кешу, оновлення у фоні; файли з хешем у назві не змінюються
+async function staleWhileRevalidate(event, url) {
+  const cache = await caches.open(ASSETS);
+  const cached = (await caches.match(event.request, { cacheName: PRECACHE })) || (await cache.match(event.request));
+
+  if (cached && url.pathname.startsWith('/assets/')) {
+    return cached;
+  }
+
+  const update = fetch(event.request).then(response => {
+    if (response.ok || response.type === 'opaque') {
+      cache.put(event.request, response.clone());
+    }
+    return response;
+  });
+
+  if (cached) {
+    event.waitUntil(update.catch(() => {}));
+    return cached;
+  }
+  return update;
+}
+
+function withTimeout(promise, ms) {
+  return new Promise((resolve, reject) => {
+    const timer = setTimeout(() => reject(new Error('timeout')), ms);
+    promise.then(
+      value => { clearTimeout(timer); resolve(value); },
+      error => { clearTimeout(timer); reject(error); }
+    );
+  });
+}
+
+// ==================== ОФЛАЙН-КОПІЯ ПОЇЗДОК ====================
+
+let lastSync = 0;
+
+async function syncTrips(force) {
+  if (!force && Date.now() - lastSync < SYNC_INTERVAL_MS) {
+    return;
+  }
+  lastSync = Date.now();
+
+  const meta = await OfflineTrips.getMeta();
+  const headers = meta && meta.etag ? { 'If-None-Match': meta.etag } : {};
+
+  const response = await fetch(CONFIG.tripsUrl, { credentials: 'same-origin', headers });
+  // Редірект на вхід: користувач не увійшов — синхронізуємо одразу після входу
+  if (response.redirected) {
+    lastSync = 0;
+    return;
+  }
+  // 304 — поїздки не змінились
+  if (response.status === 304 || !response.ok) {
+    return;
+  }
+
+  const data = await response.json();
+  await OfflineTrips.replaceTrips(data.trips, {
+    etag: response.headers.get('ETag'),
+    user: data.user,
+    syncedAt: data.synced_at
+  });
+}
+
+// Вихід з акаунта: прибираємо збережені сторінки та поїздки
+async function forgetUser() {
+  lastSync = 0;
+  await caches.delete(PAGES);
+  await OfflineTrips.clear();
+}
@@ -0,0 +1,32 @@
+import pytest
+
+from assistant.cache import normalize_prompt
+
+
+@pytest.mark.parametrize('first, second', [
+    ('Plan 11 days in Lviv', 'Plan 1 days in Lviv'),
+    ('Budget 1000 EUR', 'Budget 10 EUR'),
+    ('Trip for 2 days', 'Trip for 22 days'),
+    ('Where to ski in January', 'Where to sky in January'),
+    ('Hotels near the bay', 'Hotels near the baj'),
+    ('東京', '北京'),
+])
+def test_different_prompts_get_different_keys(first, second):
+    assert normalize_prompt(first) != normalize_prompt(second)
+
+
+@pytest.mark.parametrize('first, second', [
+    ('Kiev', 'Київ'),
+    ('Odessa', 'Одеса'),
+    ('Zaporizhia', 'Запоріжжя'),
+    ('Kharkov', 'Харків'),
+    ('Kraków', 'Krakow'),
+    ('Gdańsk', 'Gdansk'),
+    ('Що подивитись у Львові за 2 дні?', 'що подивитись у Lvovi за 2 дні'),
+])
+def test_place_spellings_share_a_key(first, second):
+    assert normalize_prompt(first) == normalize_prompt(second)
+
+
+def test_unkeyable_prompt_is_empty():
+    assert normalize_prompt('?!') == ''